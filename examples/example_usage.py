@@ -29,39 +29,35 @@ def example_index_with_local_embeddings():
         overlap=100,  # Overlap between chunks
     )
 
-    # 3. Traverse and chunk
-    all_chunks = []
-    for file_path in traversal.traverse():
-        chunks = chunker.chunk_file(file_path)
-        all_chunks.extend(chunks)
-
-    print(f"Created {len(all_chunks)} chunks from codebase")
-
-    # 4. Create embedding config for local provider (default)
+    # 3. Create embedding config for local provider (default)
     embedding_config = EmbeddingConfig(
         provider="local",
         model="all-MiniLM-L6-v2",  # Good balance of speed and quality
+        batch_size=64,  # Texts per model forward pass
     )
-
-    # 5. Generate embeddings
     embeddings_gen = EmbeddingsFactory.create(embedding_config)
-    chunk_texts = [chunk.content for chunk in all_chunks]
-    embeddings = embeddings_gen.generate_embeddings(chunk_texts)
 
-    print(f"Generated {len(embeddings)} embeddings")
-
-    # 6. Store in vector database (respects CTXAI_HOME)
+    # 4. Set up vector database (respects CTXAI_HOME)
     indexes_dir = get_indexes_dir(codebase_path)
     storage_path = indexes_dir / "my-index"
     vector_store = VectorStore(
         storage_path=storage_path,
         collection_name="my-index",
     )
-    vector_store.add_chunks(all_chunks, embeddings)
 
-    print("✓ Indexing complete!")
+    # 5. Stream chunks through embedding into storage, one batch at a time,
+    #    so memory stays bounded by the batch size rather than the codebase size
+    #    (files are parsed in parallel worker processes)
+    file_paths = list(traversal.traverse())
+    chunks_count = 0
+    for batch in chunker.batch_iter_chunks(file_paths, embedding_config.batch_size):
+        embeddings = embeddings_gen.generate_embeddings([chunk.content for chunk in batch])
+        vector_store.add_chunks(batch, embeddings, start_index=chunks_count)
+        chunks_count += len(batch)
+
+    print(f"✓ Indexed {chunks_count} chunks!")
 
-    # 7. Get stats
+    # 6. Get stats
     stats = vector_store.get_stats()
     print("\nIndex stats:")
     print(f"  Total chunks: {stats['total_chunks']}")
@@ -28,26 +28,54 @@ For more information, visit: https://github.com/vs4vijay/ctxai
 __version__ = "0.0.1"
 __author__ = "vs4vijay"
 
-from .chunking import CodeChunk, CodeChunker
-from .config import Config, ConfigManager, EmbeddingConfig, IndexConfig
-from .embeddings import (
-    BaseEmbeddingProvider,
-    EmbeddingsFactory,
-    HuggingFaceEmbeddingProvider,
-    LocalEmbeddingProvider,
-    OpenAIEmbeddingProvider,
-)
-from .size_validator import ProjectSizeLimitError, ProjectSizeValidator, ProjectStats
-from .traversal import CodeTraversal
-from .utils import (
-    ensure_ctxai_home,
-    get_config_path,
-    get_ctxai_home,
-    get_ctxai_home_info,
-    get_indexes_dir,
-    is_using_global_home,
-)
-from .vector_store import VectorStore
+# Public names are imported on first access (PEP 562) so that `import ctxai`
+# and light CLI commands don't pay for chromadb, tree-sitter or torch
+_LAZY_IMPORTS = {
+    "ChunkCache": ".chunk_cache",
+    "CodeChunk": ".chunking",
+    "CodeChunker": ".chunking",
+    "Config": ".config",
+    "ConfigManager": ".config",
+    "EmbeddingConfig": ".config",
+    "IndexConfig": ".config",
+    "CachedEmbeddingProvider": ".embedding_cache",
+    "EmbeddingCache": ".embedding_cache",
+    "BaseEmbeddingProvider": ".embeddings",
+    "EmbeddingsFactory": ".embeddings",
+    "HuggingFaceEmbeddingProvider": ".embeddings",
+    "LocalEmbeddingProvider": ".embeddings",
+    "OpenAIEmbeddingProvider": ".embeddings",
+    "IndexManifest": ".index_manifest",
+    "ProjectSizeLimitError": ".size_validator",
+    "ProjectSizeValidator": ".size_validator",
+    "ProjectStats": ".size_validator",
+    "CodeTraversal": ".traversal",
+    "ensure_ctxai_home": ".utils",
+    "get_cache_dir": ".utils",
+    "get_config_path": ".utils",
+    "get_ctxai_home": ".utils",
+    "get_ctxai_home_info": ".utils",
+    "get_indexes_dir": ".utils",
+    "is_using_global_home": ".utils",
+    "VectorStore": ".vector_store",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "CodeChunker",
@@ -61,12 +89,17 @@ __all__ = [
     "LocalEmbeddingProvider",
     "OpenAIEmbeddingProvider",
     "HuggingFaceEmbeddingProvider",
+    "EmbeddingCache",
+    "CachedEmbeddingProvider",
+    "ChunkCache",
+    "IndexManifest",
     "ProjectSizeValidator",
     "ProjectStats",
     "ProjectSizeLimitError",
     "CodeTraversal",
     "get_ctxai_home",
     "get_indexes_dir",
+    "get_cache_dir",
     "get_config_path",
     "ensure_ctxai_home",
     "is_using_global_home",
@@ -90,6 +90,18 @@ def query(
         "--no-content",
         help="Don't show code content, only metadata",
     ),
+    language: str | None = typer.Option(
+        None,
+        "--language",
+        "-l",
+        help="Only search chunks in this language (e.g., 'python')",
+    ),
+    chunk_type: str | None = typer.Option(
+        None,
+        "--type",
+        "-t",
+        help="Only search chunks of this type (e.g., 'function_definition')",
+    ),
 ):
     """
     Query an indexed codebase using natural language.
@@ -104,6 +116,8 @@ def query(
         query=query_text,
         n_results=n_results,
         show_content=not no_content,
+        language=language,
+        chunk_type=chunk_type,
     )
 
 
@@ -119,6 +133,12 @@ def server(
         dir_okay=True,
         resolve_path=True,
     ),
+    mode: str = typer.Option(
+        "mcp",
+        "--mode",
+        "-m",
+        help="Server mode: 'mcp' for the MCP server, 'embed' to keep the embedding model loaded for fast queries",
+    ),
 ):
     """
     Start the MCP (Model Context Protocol) server for AI agents.
@@ -142,10 +162,19 @@ def server(
         }
       }
     }
+
+    With --mode embed, starts an embedding daemon instead: it keeps the embedding
+    model loaded and `ctxai query` uses it automatically, skipping model loading.
     """
-    from .commands.server_command import start_mcp_server
+    from .commands.server_command import start_embed_daemon, start_mcp_server
 
-    start_mcp_server(project_path=project_path)
+    if mode == "embed":
+        start_embed_daemon(project_path=project_path)
+    elif mode == "mcp":
+        start_mcp_server(project_path=project_path)
+    else:
+        typer.echo(f"Unknown server mode: {mode}. Use 'mcp' or 'embed'.", err=True)
+        raise typer.Exit(code=1)
 
 
 @app.command()
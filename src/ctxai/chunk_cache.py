@@ -0,0 +1,137 @@
+"""
+Persistent chunk cache module.
+Stores the chunks extracted from each file keyed by content hash so unchanged files are not re-parsed.
+"""
+
+import json
+import sqlite3
+import zlib
+from pathlib import Path
+
+from .chunking import CodeChunk
+from .utils import batched, content_hash
+
+# Stay well below SQLite's host parameter limit (999 on older builds)
+_SQLITE_MAX_PARAMS = 500
+
+# Buffered writes are committed in batches of this many files
+_FLUSH_EVERY = 500
+
+
+class ChunkCache:
+    """Per-file chunk store backed by SQLite."""
+
+    def __init__(self, cache_path: Path):
+        """
+        Initialize the chunk cache.
+
+        Args:
+            cache_path: Path to the SQLite database file
+        """
+        self.cache_path = cache_path
+        self._pending: list[tuple[str, str, bytes]] = []
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(str(cache_path), check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        # One row per path: writing a new hash replaces the stale entry
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS chunks (path TEXT PRIMARY KEY, hash TEXT NOT NULL, data BLOB NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(source: bytes, max_chunk_size: int, overlap: int) -> str:
+        """
+        Build the cache key for a file's contents.
+
+        Args:
+            source: Raw file contents
+            max_chunk_size: Chunker setting that affects the produced chunks
+            overlap: Chunker setting that affects the produced chunks
+
+        Returns:
+            Hex digest identifying the contents under these chunker settings
+        """
+        return content_hash(f"{max_chunk_size}:{overlap}\0".encode() + source)
+
+    def get_many(self, keys: dict[Path, str]) -> dict[Path, list[CodeChunk]]:
+        """
+        Look up cached chunks for files whose contents are unchanged.
+
+        Args:
+            keys: Dictionary mapping file paths to their current cache keys
+
+        Returns:
+            Dictionary mapping file paths with a matching entry to their chunks
+        """
+        self.flush()
+
+        by_path = {str(file_path): file_path for file_path in keys}
+        found = {}
+        for batch in batched(list(by_path), _SQLITE_MAX_PARAMS):
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT path, hash, data FROM chunks WHERE path IN ({placeholders})",  # nosec B608
+                batch,
+            )
+            for path, key, data in rows:
+                file_path = by_path[path]
+                if key == keys[file_path]:
+                    found[file_path] = self._decode(file_path, data)
+        return found
+
+    def put(self, file_path: Path, key: str, chunks: list[CodeChunk]) -> None:
+        """
+        Buffer the chunks of a file for storage.
+
+        Args:
+            file_path: Path of the chunked file
+            key: Cache key of the file contents (see make_key)
+            chunks: Chunks extracted from the file
+        """
+        self._pending.append((str(file_path), key, self._encode(chunks)))
+        if len(self._pending) >= _FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered entries to the database."""
+        if not self._pending:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO chunks (path, hash, data) VALUES (?, ?, ?)",
+                self._pending,
+            )
+        self._pending = []
+
+    def close(self) -> None:
+        """Flush buffered entries and close the underlying database connection."""
+        self.flush()
+        self.connection.close()
+
+    @staticmethod
+    def _encode(chunks: list[CodeChunk]) -> bytes:
+        """Serialize chunks without their file path, which is the row key."""
+        rows = [
+            [chunk.content, chunk.start_line, chunk.end_line, chunk.chunk_type, chunk.language, chunk.metadata]
+            for chunk in chunks
+        ]
+        return zlib.compress(json.dumps(rows).encode(), 1)
+
+    @staticmethod
+    def _decode(file_path: Path, data: bytes) -> list[CodeChunk]:
+        """Deserialize chunks stored by _encode."""
+        return [
+            CodeChunk(
+                content=content,
+                file_path=file_path,
+                start_line=start_line,
+                end_line=end_line,
+                chunk_type=chunk_type,
+                language=language,
+                metadata=metadata,
+            )
+            for content, start_line, end_line, chunk_type, language, metadata in json.loads(zlib.decompress(data))
+        ]
@@ -3,14 +3,45 @@ Code chunking module using tree-sitter for intelligent code splitting.
 Preserves semantic meaning by respecting code structure.
 """
 
+import mmap
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from dataclasses import dataclass
+from functools import partial
+from itertools import compress
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from tree_sitter_language_pack import get_parser
 
+from .utils import batched, submit_ahead
 
-@dataclass
+if TYPE_CHECKING:
+    from .chunk_cache import ChunkCache
+
+# Below this many files, worker start-up costs more than parallel parsing saves
+_MIN_FILES_FOR_PROCESS_POOL = 64
+_MAX_CHUNKSIZE = 16
+
+# Tasks (groups of chunksize files) queued per worker; bounds parsed chunks held in memory
+_TASKS_PER_WORKER = 2
+
+# Threads reading and hashing files for chunk cache keys (the work is I/O-bound)
+_CACHE_KEY_THREADS = 16
+
+# Bytes handed to tree-sitter per read callback
+_PARSE_READ_SIZE = 64 * 1024
+
+# Smaller files are read into memory; mapping them costs more than copying
+_MIN_MMAP_BYTES = 16 * 1024
+
+
+@dataclass(slots=True)
 class CodeChunk:
     """Represents a chunk of code with metadata."""
 
@@ -65,66 +96,96 @@ class CodeChunker:
         ".rst": "rst",
     }
 
-    # Node types that represent meaningful code units
+    # Node types that represent meaningful code units (sets for O(1) membership tests)
     CHUNK_NODE_TYPES = {
-        "python": [
-            "function_definition",
-            "class_definition",
-            "decorated_definition",
-            "import_statement",
-            "import_from_statement",
-        ],
-        "javascript": [
-            "function_declaration",
-            "function_expression",
-            "arrow_function",
-            "class_declaration",
-            "method_definition",
-            "import_statement",
-            "export_statement",
-        ],
-        "typescript": [
-            "function_declaration",
-            "function_expression",
-            "arrow_function",
-            "class_declaration",
-            "method_definition",
-            "interface_declaration",
-            "type_alias_declaration",
-            "import_statement",
-            "export_statement",
-        ],
+        "python": frozenset(
+            {
+                "function_definition",
+                "class_definition",
+                "decorated_definition",
+                "import_statement",
+                "import_from_statement",
+            }
+        ),
+        "javascript": frozenset(
+            {
+                "function_declaration",
+                "function_expression",
+                "arrow_function",
+                "class_declaration",
+                "method_definition",
+                "import_statement",
+                "export_statement",
+            }
+        ),
+        "typescript": frozenset(
+            {
+                "function_declaration",
+                "function_expression",
+                "arrow_function",
+                "class_declaration",
+                "method_definition",
+                "interface_declaration",
+                "type_alias_declaration",
+                "import_statement",
+                "export_statement",
+            }
+        ),
     }
 
-    def __init__(self, max_chunk_size: int = 1000, overlap: int = 100):
+    def __init__(
+        self,
+        max_chunk_size: int = 1000,
+        overlap: int = 100,
+        parse_timeout_ms: int = 250,
+        max_parse_bytes: int = 2 * 1024 * 1024,
+    ):
         """
         Initialize the code chunker.
 
         Args:
             max_chunk_size: Maximum number of characters per chunk
             overlap: Number of characters to overlap between chunks
+            parse_timeout_ms: Files whose parse takes longer are text-chunked instead (0 disables the limit)
+            max_parse_bytes: Larger files are text-chunked without being parsed
         """
         self.max_chunk_size = max_chunk_size
         self.overlap = overlap
-        self.parsers: dict[str, any] = {}
+        self.parse_timeout_ms = parse_timeout_ms
+        self.max_parse_bytes = max_parse_bytes
+        # Parsers are not safe to share between threads, so each thread gets its own
+        self._tls = threading.local()
 
     def _get_language(self, file_path: Path) -> str | None:
         """Detect language from file extension."""
         return self.LANGUAGE_MAP.get(file_path.suffix.lower())
 
     def _get_parser(self, language: str):
-        """Get or create a tree-sitter parser for the given language."""
-        if language not in self.parsers:
+        """Get or create this thread's tree-sitter parser for the given language."""
+        parser = getattr(self._tls, language, None)
+        if parser is None:
             try:
-                self.parsers[language] = get_parser(language)
+                parser = get_parser(language)
             except Exception as e:
                 print(f"Warning: Could not get parser for {language}: {e}")
-                return None
-        return self.parsers.get(language)
+                # Remember the failure so the grammar lookup is not retried for every file
+                parser = False
+            setattr(self._tls, language, parser)
+        return parser or None
+
+    def warmup(self, languages: Iterable[str | None]) -> None:
+        """
+        Load the parsers for the given languages on the calling thread.
+
+        Pays the grammar loading cost once up front instead of on the first
+        file of each language. Languages without structural chunking are skipped.
 
-    def _extract_node_text(self, node, source_code: bytes) -> str:
-        """Extract text from a tree-sitter node."""
-        return source_code[node.start_byte : node.end_byte].decode("utf-8", errors="ignore")
+        Args:
+            languages: Language names, e.g. from LANGUAGE_MAP
+        """
+        for language in set(languages):
+            if language in self.CHUNK_NODE_TYPES:
+                self._get_parser(language)
 
     def _get_node_metadata(self, node, source_code: bytes, language: str) -> dict[str, str]:
         """Extract metadata from a node based on its type."""
@@ -132,18 +193,20 @@ class CodeChunker:
 
         # Extract function/class names
         if language == "python":
-            if node.type in ["function_definition", "class_definition"]:
+            if node.type in ("function_definition", "class_definition"):
                 for child in node.children:
                     if child.type == "identifier":
-                        name = self._extract_node_text(child, source_code)
-                        metadata["name"] = name
+                        metadata["name"] = source_code[child.start_byte : child.end_byte].decode(
+                            "utf-8", errors="ignore"
+                        )
                         break
-        elif language in ["javascript", "typescript"]:
+        elif language in ("javascript", "typescript"):
             if "declaration" in node.type or "definition" in node.type:
                 for child in node.children:
                     if child.type == "identifier":
-                        name = self._extract_node_text(child, source_code)
-                        metadata["name"] = name
+                        metadata["name"] = source_code[child.start_byte : child.end_byte].decode(
+                            "utf-8", errors="ignore"
+                        )
                         break
 
         return metadata
@@ -163,24 +226,32 @@ class CodeChunker:
             # Fall back to simple text chunking for unknown file types
             return self._chunk_text_file(file_path)
 
+        # Without chunk node types a parse would yield no chunks, so skip it
+        if language not in self.CHUNK_NODE_TYPES:
+            return self._chunk_text_file(file_path, language)
+
         parser = self._get_parser(language)
         if not parser:
             return self._chunk_text_file(file_path)
 
         try:
-            with open(file_path, "rb") as f:
-                source_code = f.read()
-
-            tree = parser.parse(source_code)
-            chunks = []
-
-            # Get relevant node types for this language
-            chunk_node_types = self.CHUNK_NODE_TYPES.get(language, [])
-
-            # Traverse the tree and extract chunks
-            chunks.extend(
-                self._extract_chunks_from_tree(tree.root_node, source_code, file_path, language, chunk_node_types)
-            )
+            with _read_source(file_path) as source_code:
+                # Huge (often generated or minified) files are slow to parse and rarely worth it
+                if len(source_code) > self.max_parse_bytes:
+                    return self._chunk_text_file(file_path, language)
+
+                tree = self._parse(parser, source_code)
+                if tree is None:
+                    print(f"Warning: Parsing {file_path} took over {self.parse_timeout_ms} ms, using text chunking")
+                    return self._chunk_text_file(file_path, language)
+
+                # Get relevant node types for this language
+                chunk_node_types = self.CHUNK_NODE_TYPES.get(language, frozenset())
+
+                # Traverse the tree and extract chunks (their text is copied out of the source)
+                chunks = self._extract_chunks_from_tree(
+                    tree.root_node, source_code, file_path, language, chunk_node_types
+                )
 
             # If no chunks were extracted (e.g., simple script), chunk the whole file
             if not chunks:
@@ -192,45 +263,273 @@ class CodeChunker:
             print(f"Warning: Error parsing {file_path}: {e}")
             return self._chunk_text_file(file_path)
 
+    def _parse(self, parser, source_code: "bytes | mmap.mmap"):
+        """
+        Parse source code, giving up once parse_timeout_ms has elapsed.
+
+        Returns:
+            The syntax tree, or None if the parse timed out
+        """
+        if not self.parse_timeout_ms and isinstance(source_code, bytes):
+            return parser.parse(source_code)
+
+        # Memory maps are also read in slices so the tree never holds a buffer
+        # export that would stop the map from closing
+        def read(byte_offset, _point):
+            return source_code[byte_offset : byte_offset + _PARSE_READ_SIZE]
+
+        if not self.parse_timeout_ms:
+            return parser.parse(read)
+
+        deadline = time.monotonic() + self.parse_timeout_ms / 1000
+
+        # The progress callback, which cancels the parse, only fires when input comes from a read callback
+        return parser.parse(read, progress_callback=lambda _state: time.monotonic() > deadline)
+
+    def chunk_files(
+        self,
+        file_paths: list[Path],
+        max_workers: int | None = None,
+        chunksize: int | None = None,
+        cache: "ChunkCache | None" = None,
+    ) -> Iterator[tuple[Path, list[CodeChunk], str | None]]:
+        """
+        Chunk many files, parsing them in parallel worker processes.
+
+        Tree-sitter parsing is CPU-bound and holds the GIL, so files that need
+        it are spread over a process pool. Plain-text files are chunked
+        in-process while the workers parse. Small inputs skip the pool.
+
+        Args:
+            file_paths: Files to chunk
+            max_workers: Number of worker processes (defaults to the CPU count)
+            chunksize: Number of files sent to a worker at a time (defaults to
+                about four tasks per worker, at most 16 files)
+            cache: Optional chunk cache; files whose contents are unchanged
+                since they were cached are not parsed again
+
+        Yields:
+            (file_path, chunks, error) tuples in the order of file_paths;
+            error is None on success
+        """
+        keys = {}
+        cached = {}
+        if cache is not None:
+            parse_paths = [file_path for file_path in file_paths if self._needs_parsing(file_path)]
+            # Keep several reads in flight instead of reading one file at a time
+            with ThreadPoolExecutor(max_workers=_CACHE_KEY_THREADS, thread_name_prefix="ctxai-read") as readers:
+                for file_path, key in zip(parse_paths, readers.map(partial(self._cache_key, cache), parse_paths)):
+                    if key is not None:
+                        keys[file_path] = key
+            cached = cache.get_many(keys)
+
+        results = self._chunk_files_uncached([p for p in file_paths if p not in cached], max_workers, chunksize)
+        try:
+            for file_path in file_paths:
+                if file_path in cached:
+                    yield file_path, cached[file_path], None
+                    continue
+
+                _, chunks, error = next(results)
+                # Text-only results may come from a missing parser; don't pin them
+                if file_path in keys and error is None and any(chunk.chunk_type != "text" for chunk in chunks):
+                    cache.put(file_path, keys[file_path], chunks)
+                yield file_path, chunks, error
+        finally:
+            if cache is not None:
+                cache.flush()
+
+    def iter_chunks(self, file_paths: list[Path], **kwargs) -> Iterator[CodeChunk]:
+        """
+        Stream the chunks of many files one at a time.
+
+        Args:
+            file_paths: Files to chunk
+            **kwargs: Passed on to chunk_files (max_workers, chunksize, cache)
+
+        Yields:
+            CodeChunk objects in file order; files that fail are skipped with a warning
+        """
+        for file_path, chunks, error in self.chunk_files(file_paths, **kwargs):
+            if error:
+                print(f"Warning: Error chunking {file_path}: {error}")
+            yield from chunks
+
+    def batch_iter_chunks(self, file_paths: list[Path], batch_size: int = 128, **kwargs) -> Iterator[list[CodeChunk]]:
+        """
+        Stream chunks in fixed-size batches that span file boundaries.
+
+        Embedding providers are fastest with full batches, so batches are
+        filled across files instead of holding one file's chunks each.
+
+        Args:
+            file_paths: Files to chunk
+            batch_size: Number of chunks per batch (the last batch may be smaller)
+            **kwargs: Passed on to chunk_files (max_workers, chunksize, cache)
+
+        Yields:
+            Lists of up to batch_size CodeChunk objects
+        """
+        yield from batched(self.iter_chunks(file_paths, **kwargs), batch_size)
+
+    def _chunk_files_uncached(
+        self,
+        file_paths: list[Path],
+        max_workers: int | None,
+        chunksize: int | None,
+    ) -> Iterator[tuple[Path, list[CodeChunk], str | None]]:
+        """Chunk files, spreading tree-sitter parsing over a process pool (see chunk_files)."""
+        max_workers = max_workers or os.cpu_count() or 1
+        # Detect each file's language once; the flags route results back in input order
+        needs_parsing = [self._needs_parsing(file_path) for file_path in file_paths]
+        parse_paths = list(compress(file_paths, needs_parsing))
+        if max_workers <= 1 or len(parse_paths) < _MIN_FILES_FOR_PROCESS_POOL:
+            for file_path in file_paths:
+                yield (file_path, *_chunk_file_safely(self, file_path))
+            return
+
+        if chunksize is None:
+            # Several tasks per worker balance uneven files; small tasks keep results streaming
+            chunksize = max(1, min(_MAX_CHUNKSIZE, len(parse_paths) // (max_workers * 4)))
+
+        # spawn avoids forking a parent that already runs database/writer threads
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                self.max_chunk_size,
+                self.overlap,
+                self.parse_timeout_ms,
+                self.max_parse_bytes,
+                {self._get_language(p) for p in parse_paths},
+            ),
+        ) as executor:
+            # Executor.map would queue every file at once, and finished results would pile up
+            # while the slower consumer embeds them. Only a few groups of files are kept in
+            # flight; closing the stream cancels the queued ones before the pool shuts down.
+            tasks = submit_ahead(
+                executor,
+                _chunk_files_in_worker,
+                batched(parse_paths, chunksize),
+                max_pending=max_workers * _TASKS_PER_WORKER,
+            )
+            with closing(tasks):
+                parsed = (result for _, future in tasks for result in future.result())
+                for file_path, parse in zip(file_paths, needs_parsing):
+                    if parse:
+                        yield (file_path, *next(parsed))
+                    else:
+                        yield (file_path, *_chunk_file_safely(self, file_path))
+
+    def _cache_key(self, cache: "ChunkCache", file_path: Path) -> str | None:
+        """Chunk cache key of a file's current contents, or None if it can't be read."""
+        try:
+            return cache.make_key(file_path.read_bytes(), self.max_chunk_size, self.overlap)
+        except OSError:
+            return None
+
+    def _needs_parsing(self, file_path: Path) -> bool:
+        """Whether chunking this file involves a tree-sitter parse."""
+        return self._get_language(file_path) in self.CHUNK_NODE_TYPES
+
     def _extract_chunks_from_tree(
         self,
         node,
         source_code: bytes,
         file_path: Path,
         language: str,
-        chunk_node_types: list[str],
+        chunk_node_types: frozenset[str],
     ) -> list[CodeChunk]:
-        """Recursively extract chunks from a tree-sitter tree."""
+        """
+        Extract chunks from a tree-sitter tree in document order.
+
+        Walks the tree iteratively with a TreeCursor and does not descend
+        into nodes that became chunks.
+        """
         chunks = []
+        cursor = node.walk()
+
+        while True:
+            current = cursor.node
+            if current.type in chunk_node_types:
+                chunks.extend(self._node_to_chunks(current, source_code, file_path, language))
+            elif cursor.goto_first_child():
+                continue
+
+            # Move on to the next sibling, climbing back up as subtrees are exhausted
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return chunks
+
+    def _node_to_chunks(self, node, source_code: bytes, file_path: Path, language: str) -> list[CodeChunk]:
+        """Create the chunk for a chunk boundary node, splitting it if it is too large."""
+        # Nodes are decoded only when they become chunks; the walk itself stays on bytes
+        content = source_code[node.start_byte : node.end_byte].decode("utf-8", errors="ignore")
+        metadata = self._get_node_metadata(node, source_code, language)
+
+        # Split large nodes if needed
+        if len(content) > self.max_chunk_size:
+            return self._split_large_chunk(content, file_path, node.start_point[0], node.type, language, metadata)
+
+        return [
+            CodeChunk(
+                content=content,
+                file_path=file_path,
+                start_line=node.start_point[0] + 1,
+                end_line=node.end_point[0] + 1,
+                chunk_type=node.type,
+                language=language,
+                metadata=metadata,
+            )
+        ]
+
+    def _split_spans(self, content: str) -> list[tuple[int, int, int, int]]:
+        """
+        Compute size-bounded, overlapping chunk boundaries on line breaks.
 
-        # Check if this node is a chunk boundary
-        if node.type in chunk_node_types:
-            content = self._extract_node_text(node, source_code)
-            metadata = self._get_node_metadata(node, source_code, language)
+        Jumps straight to each cut with str.find and counts lines with
+        str.count, so text is never split into per-line strings.
 
-            # Split large nodes if needed
-            if len(content) > self.max_chunk_size:
-                sub_chunks = self._split_large_chunk(
-                    content, file_path, node.start_point[0], node.type, language, metadata
-                )
-                chunks.extend(sub_chunks)
+        Args:
+            content: Text to split
+
+        Returns:
+            List of (start offset, end offset, start line, end line) tuples;
+            offsets are end-exclusive and lines are 1-based
+        """
+        spans = []
+        length = len(content)
+        start = 0
+        start_line = 1
+        # A chunk ends at the first line break where it reaches max_chunk_size
+        search_from = max(self.max_chunk_size - 1, 0)
+
+        while search_from <= length:
+            end = content.find("\n", search_from)
+            if end == -1:
+                end = length
+            spans.append((start, end, start_line, start_line + content.count("\n", start, end)))
+
+            # Carry trailing whole lines that fit in the overlap into the next chunk
+            overlap_from = max(start, end - self.overlap)
+            if overlap_from == 0:
+                next_start = 0
             else:
-                chunk = CodeChunk(
-                    content=content,
-                    file_path=file_path,
-                    start_line=node.start_point[0] + 1,
-                    end_line=node.end_point[0] + 1,
-                    chunk_type=node.type,
-                    language=language,
-                    metadata=metadata,
-                )
-                chunks.append(chunk)
-        else:
-            # Recurse into children
-            for child in node.children:
-                chunks.extend(self._extract_chunks_from_tree(child, source_code, file_path, language, chunk_node_types))
+                newline = content.find("\n", overlap_from - 1, end)
+                next_start = newline + 1 if newline != -1 else end + 1
+
+            start_line += content.count("\n", start, next_start)
+            start = next_start
+            if end == length:
+                break
+            search_from = max(end + 1, start + self.max_chunk_size - 1)
 
-        return chunks
+        # Add remaining lines as final chunk
+        if start <= length:
+            spans.append((start, length, start_line, start_line + content.count("\n", start, length)))
+
+        return spans
 
     def _split_large_chunk(
         self,
@@ -242,59 +541,18 @@ class CodeChunker:
         metadata: dict[str, str],
     ) -> list[CodeChunk]:
         """Split a large chunk into smaller overlapping chunks."""
-        chunks = []
-        lines = content.split("\n")
-        current_chunk_lines = []
-        current_size = 0
-        current_start_line = start_line
-
-        for i, line in enumerate(lines):
-            current_chunk_lines.append(line)
-            current_size += len(line) + 1  # +1 for newline
-
-            if current_size >= self.max_chunk_size:
-                chunk_content = "\n".join(current_chunk_lines)
-                chunks.append(
-                    CodeChunk(
-                        content=chunk_content,
-                        file_path=file_path,
-                        start_line=current_start_line + 1,
-                        end_line=current_start_line + len(current_chunk_lines),
-                        chunk_type=chunk_type,
-                        language=language,
-                        metadata=metadata,
-                    )
-                )
-
-                # Calculate overlap
-                overlap_lines = []
-                overlap_size = 0
-                for line in reversed(current_chunk_lines):
-                    if overlap_size + len(line) > self.overlap:
-                        break
-                    overlap_lines.insert(0, line)
-                    overlap_size += len(line) + 1
-
-                current_chunk_lines = overlap_lines
-                current_start_line = current_start_line + len(current_chunk_lines) - len(overlap_lines)
-                current_size = overlap_size
-
-        # Add remaining lines as final chunk
-        if current_chunk_lines:
-            chunk_content = "\n".join(current_chunk_lines)
-            chunks.append(
-                CodeChunk(
-                    content=chunk_content,
-                    file_path=file_path,
-                    start_line=current_start_line + 1,
-                    end_line=current_start_line + len(current_chunk_lines),
-                    chunk_type=chunk_type,
-                    language=language,
-                    metadata=metadata,
-                )
+        return [
+            CodeChunk(
+                content=content[start:end],
+                file_path=file_path,
+                start_line=start_line + first_line,
+                end_line=start_line + last_line,
+                chunk_type=chunk_type,
+                language=language,
+                metadata=metadata,
             )
-
-        return chunks
+            for start, end, first_line, last_line in self._split_spans(content)
+        ]
 
     def _chunk_text_file(self, file_path: Path, language: str | None = None) -> list[CodeChunk]:
         """
@@ -311,60 +569,61 @@ class CodeChunker:
             with open(file_path, encoding="utf-8", errors="ignore") as f:
                 content = f.read()
 
-            chunks = []
-            lines = content.split("\n")
-            current_chunk_lines = []
-            current_size = 0
-            start_line = 0
-
-            for i, line in enumerate(lines):
-                current_chunk_lines.append(line)
-                current_size += len(line) + 1
-
-                if current_size >= self.max_chunk_size:
-                    chunk_content = "\n".join(current_chunk_lines)
-                    chunks.append(
-                        CodeChunk(
-                            content=chunk_content,
-                            file_path=file_path,
-                            start_line=start_line + 1,
-                            end_line=start_line + len(current_chunk_lines),
-                            chunk_type="text",
-                            language=language or "unknown",
-                            metadata={},
-                        )
-                    )
-
-                    # Handle overlap
-                    overlap_lines = []
-                    overlap_size = 0
-                    for line in reversed(current_chunk_lines):
-                        if overlap_size + len(line) > self.overlap:
-                            break
-                        overlap_lines.insert(0, line)
-                        overlap_size += len(line) + 1
-
-                    current_chunk_lines = overlap_lines
-                    start_line = i - len(overlap_lines) + 1
-                    current_size = overlap_size
-
-            # Add remaining lines
-            if current_chunk_lines:
-                chunk_content = "\n".join(current_chunk_lines)
-                chunks.append(
-                    CodeChunk(
-                        content=chunk_content,
-                        file_path=file_path,
-                        start_line=start_line + 1,
-                        end_line=start_line + len(current_chunk_lines),
-                        chunk_type="text",
-                        language=language or "unknown",
-                        metadata={},
-                    )
+            chunks = [
+                CodeChunk(
+                    content=content[start:end],
+                    file_path=file_path,
+                    start_line=first_line,
+                    end_line=last_line,
+                    chunk_type="text",
+                    language=language or "unknown",
+                    metadata={},
                 )
+                for start, end, first_line, last_line in self._split_spans(content)
+            ]
 
             return chunks
 
         except Exception as e:
             print(f"Warning: Could not chunk text file {file_path}: {e}")
             return []
+
+
+@contextmanager
+def _read_source(file_path: Path) -> Iterator["bytes | mmap.mmap"]:
+    """Open a file's raw contents, memory-mapping large files instead of copying them."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _MIN_MMAP_BYTES:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+# Per-process chunker for chunk_files; tree-sitter parsers cannot be pickled
+_worker_chunker: CodeChunker | None = None
+
+
+def _init_worker(max_chunk_size: int, overlap: int, parse_timeout_ms: int, max_parse_bytes: int, languages: set[str]):
+    """Create the chunker used by a worker process and load the parsers it will need."""
+    global _worker_chunker
+    _worker_chunker = CodeChunker(
+        max_chunk_size=max_chunk_size,
+        overlap=overlap,
+        parse_timeout_ms=parse_timeout_ms,
+        max_parse_bytes=max_parse_bytes,
+    )
+    _worker_chunker.warmup(languages)
+
+
+def _chunk_file_safely(chunker: CodeChunker, file_path: Path) -> tuple[list[CodeChunk], str | None]:
+    """Chunk one file, returning errors instead of raising so callers can report them."""
+    try:
+        return chunker.chunk_file(file_path), None
+    except Exception as e:
+        return [], str(e)
+
+
+def _chunk_files_in_worker(file_paths: list[Path]) -> list[tuple[list[CodeChunk], str | None]]:
+    """Chunk a group of files in a worker process."""
+    return [_chunk_file_safely(_worker_chunker, file_path) for file_path in file_paths]
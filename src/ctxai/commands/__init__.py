@@ -1,17 +1,37 @@
 """Commands package."""
 
-from .config_command import (
-    edit_config,
-    get_config,
-    list_config,
-    set_config,
-    show_config_file,
-    unset_config,
-)
-from .dashboard_command import start_dashboard
-from .index_command import index_codebase
-from .query_command import query_codebase
-from .server_command import start_mcp_server
+# Command modules are imported on first access (PEP 562) so that importing one
+# command doesn't load the dependencies of all the others
+_LAZY_IMPORTS = {
+    "edit_config": ".config_command",
+    "get_config": ".config_command",
+    "list_config": ".config_command",
+    "set_config": ".config_command",
+    "show_config_file": ".config_command",
+    "unset_config": ".config_command",
+    "start_dashboard": ".dashboard_command",
+    "index_codebase": ".index_command",
+    "query_codebase": ".query_command",
+    "start_embed_daemon": ".server_command",
+    "start_mcp_server": ".server_command",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "list_config",
@@ -24,4 +44,5 @@ __all__ = [
     "index_codebase",
     "query_codebase",
     "start_mcp_server",
+    "start_embed_daemon",
 ]
@@ -4,31 +4,155 @@ Manages configuration settings similar to git config.
 """
 
 import json
+import sys
+from collections.abc import Callable
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
-from ..config import ConfigManager
-from ..utils import get_ctxai_home, is_using_global_home
+from ..config import INDEX_TYPES, STORAGE_DTYPES, VECTOR_DTYPES, ConfigManager
+from ..utils import is_using_global_home
 
 console = Console()
 
 
+# Placeholders shown for unset values in the table (default: "not set")
+_UNSET_LABELS = {"index.status": "unknown", "embedding.model": "default"}
+
+
+def _to_bool(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def _int_or_none(value: str) -> int | None:
+    return None if value.lower() == "none" else int(value)
+
+
+def _str_or_none(value: str) -> str | None:
+    return None if value.lower() == "none" else value
+
+
+def _one_of(choices: tuple[str, ...]) -> Callable[[str], str]:
+    def coerce(value: str) -> str:
+        if value not in choices:
+            raise ValueError(f"'{value}'. Available: {', '.join(choices)}")
+        return value
+
+    return coerce
+
+
+# Settable keys and the conversion applied to their command-line value
+_COERCERS: dict[str, Callable[[str], Any]] = {
+    "embedding.provider": str,
+    "embedding.model": _str_or_none,
+    "embedding.api_key": _str_or_none,
+    "embedding.batch_size": int,
+    "embedding.max_batch_chars": int,
+    "embedding.max_concurrent_requests": int,
+    "embedding.max_tokens": _int_or_none,
+    "embedding.cache": _to_bool,
+    "embedding.storage_dtype": _one_of(STORAGE_DTYPES),
+    "indexing.max_files": int,
+    "indexing.max_total_size_mb": int,
+    "indexing.max_file_size_mb": int,
+    "indexing.chunk_size": int,
+    "indexing.chunk_overlap": int,
+    "indexing.chunk_workers": int,
+    "indexing.chunk_cache": _to_bool,
+    "indexing.hnsw_m": int,
+    "indexing.hnsw_ef_construction": int,
+    "indexing.hnsw_ef_search": int,
+    "indexing.index_type": _one_of(INDEX_TYPES),
+    "indexing.ivf_nprobe": int,
+    "indexing.vector_dtype": _one_of(VECTOR_DTYPES),
+    "index.name": str,
+}
+
+
+def _flatten_config(config) -> list[tuple[str, str | None]]:
+    """
+    Flatten a configuration into display rows.
+
+    Args:
+        config: Loaded Config
+
+    Returns:
+        List of (key, value) pairs in display order; value is None when unset
+    """
+    rows = []
+
+    # Index metadata
+    if config.index_name:
+        rows.append(("index.name", config.index_name))
+        rows.append(("index.status", config.index_status or None))
+        if config.index_files_count is not None:
+            rows.append(("index.files_count", str(config.index_files_count)))
+        if config.index_size_mb is not None:
+            rows.append(("index.size_mb", f"{config.index_size_mb:.2f}"))
+        if config.index_chunks_count is not None:
+            rows.append(("index.chunks_count", str(config.index_chunks_count)))
+        if config.index_last_updated:
+            rows.append(("index.last_updated", config.index_last_updated))
+    else:
+        rows.append(("index.name", None))
+
+    # Embedding settings
+    embedding = config.embedding
+    rows.append(("embedding.provider", embedding.provider))
+    rows.append(("embedding.model", str(embedding.model) if embedding.model else None))
+    rows.append(("embedding.api_key", "***" if embedding.api_key else None))
+    rows.append(("embedding.batch_size", str(embedding.batch_size)))
+    rows.append(("embedding.max_batch_chars", str(embedding.max_batch_chars)))
+    rows.append(("embedding.max_concurrent_requests", str(embedding.max_concurrent_requests)))
+    rows.append(("embedding.max_tokens", str(embedding.max_tokens) if embedding.max_tokens else None))
+    rows.append(("embedding.cache", str(embedding.cache).lower()))
+    rows.append(("embedding.storage_dtype", embedding.storage_dtype))
+
+    # Indexing settings
+    indexing = config.indexing
+    rows.append(("indexing.max_files", str(indexing.max_files)))
+    rows.append(("indexing.max_total_size_mb", str(indexing.max_total_size_mb)))
+    rows.append(("indexing.max_file_size_mb", str(indexing.max_file_size_mb)))
+    rows.append(("indexing.chunk_size", str(indexing.chunk_size)))
+    rows.append(("indexing.chunk_overlap", str(indexing.chunk_overlap)))
+    rows.append(("indexing.chunk_workers", str(indexing.chunk_workers)))
+    rows.append(("indexing.chunk_cache", str(indexing.chunk_cache).lower()))
+    rows.append(("indexing.hnsw_m", str(indexing.hnsw_m)))
+    rows.append(("indexing.hnsw_ef_construction", str(indexing.hnsw_ef_construction)))
+    rows.append(("indexing.hnsw_ef_search", str(indexing.hnsw_ef_search)))
+    rows.append(("indexing.index_type", indexing.index_type))
+    rows.append(("indexing.ivf_nprobe", str(indexing.ivf_nprobe)))
+    rows.append(("indexing.vector_dtype", indexing.vector_dtype))
+
+    # Version
+    rows.append(("version", config.version))
+
+    return rows
+
+
 def list_config(project_path: Path | None = None):
     """
     List all configuration settings.
 
+    Prints a table on a terminal and plain key=value lines (unset values
+    empty) when output is piped, so scripts can parse it.
+
     Args:
         project_path: Optional project path (uses CTXAI_HOME if not provided)
     """
     config_manager = ConfigManager(project_path)
     config = config_manager.load()
+    rows = _flatten_config(config)
+
+    # Piped output skips Rich's table layout entirely
+    if not console.is_terminal:
+        sys.stdout.write("".join(f"{key}={value or ''}\n" for key, value in rows))
+        return
+
+    from rich.table import Table
 
     # Show where config is located
-    ctxai_home = get_ctxai_home(project_path)
     if is_using_global_home():
         console.print(f"[dim]Global config: {config_manager.config_path}[/dim]\n")
     else:
@@ -39,43 +163,8 @@ def list_config(project_path: Path | None = None):
     table.add_column("Key", style="green", no_wrap=True)
     table.add_column("Value", style="yellow")
 
-    # Add index metadata
-    if config.index_name:
-        table.add_row("index.name", config.index_name)
-        table.add_row("index.status", config.index_status or "[dim]unknown[/dim]")
-        if config.index_files_count is not None:
-            table.add_row("index.files_count", str(config.index_files_count))
-        if config.index_size_mb is not None:
-            table.add_row("index.size_mb", f"{config.index_size_mb:.2f}")
-        if config.index_chunks_count is not None:
-            table.add_row("index.chunks_count", str(config.index_chunks_count))
-        if config.index_last_updated:
-            table.add_row("index.last_updated", config.index_last_updated)
-    else:
-        table.add_row("index.name", "[dim]not set[/dim]")
-
-    # Add embedding settings
-    table.add_row("embedding.provider", config.embedding.provider)
-    table.add_row(
-        "embedding.model",
-        str(config.embedding.model) if config.embedding.model else "[dim]default[/dim]",
-    )
-    table.add_row("embedding.api_key", "***" if config.embedding.api_key else "[dim]not set[/dim]")
-    table.add_row("embedding.batch_size", str(config.embedding.batch_size))
-    table.add_row(
-        "embedding.max_tokens",
-        str(config.embedding.max_tokens) if config.embedding.max_tokens else "[dim]not set[/dim]",
-    )
-
-    # Add indexing settings
-    table.add_row("indexing.max_files", str(config.indexing.max_files))
-    table.add_row("indexing.max_total_size_mb", str(config.indexing.max_total_size_mb))
-    table.add_row("indexing.max_file_size_mb", str(config.indexing.max_file_size_mb))
-    table.add_row("indexing.chunk_size", str(config.indexing.chunk_size))
-    table.add_row("indexing.chunk_overlap", str(config.indexing.chunk_overlap))
-
-    # Add version
-    table.add_row("version", config.version)
+    for key, value in rows:
+        table.add_row(key, value if value is not None else f"[dim]{_UNSET_LABELS.get(key, 'not set')}[/dim]")
 
     console.print(table)
     console.print()
@@ -140,57 +229,31 @@ def set_config(key: str, value: str, project_path: Path | None = None):
 
     section, setting = parts
 
-    try:
-        # Navigate to the correct section
-        if section == "embedding":
-            if not hasattr(config.embedding, setting):
-                console.print(f"[red]✗[/red] Unknown embedding setting: '{setting}'\n")
-                console.print("[yellow]Available settings:[/yellow] provider, model, api_key, batch_size, max_tokens\n")
-                return
-
-            # Convert value to appropriate type
-            if setting == "batch_size":
-                value = int(value)
-            elif setting == "max_tokens":
-                value = int(value) if value.lower() != "none" else None
-            elif setting == "api_key" and value.lower() == "none":
-                value = None
-            elif setting == "model" and value.lower() == "none":
-                value = None
-
-            setattr(config.embedding, setting, value)
-
-        elif section == "indexing":
-            if not hasattr(config.indexing, setting):
-                console.print(f"[red]✗[/red] Unknown indexing setting: '{setting}'\n")
-                console.print(
-                    "[yellow]Available settings:[/yellow] "
-                    "max_files, max_total_size_mb, max_file_size_mb, chunk_size, chunk_overlap\n"
-                )
-                return
-
-            # All indexing settings are integers
-            value = int(value)
-            setattr(config.indexing, setting, value)
-
-        elif section == "version":
+    coerce = _COERCERS.get(key)
+    if coerce is None:
+        if section == "version":
             console.print("[red]✗[/red] Cannot modify version setting\n")
-            return
         elif section == "index":
-            # Allow setting index.name manually
-            if setting == "name":
-                config.index_name = value
-            else:
-                console.print(f"[red]✗[/red] Cannot modify index setting: '{setting}'\n")
-                console.print(
-                    "[yellow]Only 'index.name' can be set manually."
-                    "Other index metadata is set automatically during indexing.[/yellow]\n"
-                )
-                return
+            console.print(f"[red]✗[/red] Cannot modify index setting: '{setting}'\n")
+            console.print(
+                "[yellow]Only 'index.name' can be set manually."
+                "Other index metadata is set automatically during indexing.[/yellow]\n"
+            )
+        elif section in ("embedding", "indexing"):
+            available = [name.split(".", 1)[1] for name in _COERCERS if name.startswith(f"{section}.")]
+            console.print(f"[red]✗[/red] Unknown {section} setting: '{setting}'\n")
+            console.print(f"[yellow]Available settings:[/yellow] {', '.join(available)}\n")
         else:
             console.print(f"[red]✗[/red] Unknown configuration section: '{section}'\n")
             console.print("[yellow]Available sections:[/yellow] embedding, indexing, index\n")
-            return
+        return
+
+    try:
+        value = coerce(value)
+        if key == "index.name":
+            config.index_name = value
+        else:
+            setattr(getattr(config, section), setting, value)
 
         # Save the updated config
         config_manager.save(config)
@@ -201,7 +264,7 @@ def set_config(key: str, value: str, project_path: Path | None = None):
         console.print(f"[dim]Config saved to: {config_manager.config_path}[/dim]\n")
 
     except ValueError as e:
-        console.print(f"[red]✗[/red] Invalid value type: {e}\n")
+        console.print(f"[red]✗[/red] Invalid value for {key}: {e}\n")
     except Exception as e:
         console.print(f"[red]✗[/red] Error setting config: {e}\n")
 
@@ -280,6 +343,8 @@ def show_config_file(project_path: Path | None = None):
         with open(config_manager.config_path, encoding="utf-8") as f:
             content = f.read()
 
+        from rich.panel import Panel
+
         console.print(
             Panel(
                 content,
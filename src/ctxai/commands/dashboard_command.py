@@ -3,8 +3,13 @@ Dashboard command implementation.
 Web-based interface for managing indexes and querying codebase.
 """
 
+import asyncio
 import json
+import os
+import threading
+from collections.abc import Iterable
 from datetime import datetime
+from html import escape
 from pathlib import Path
 from typing import Optional
 
@@ -25,12 +30,14 @@ try:
         Input,
         Label,
         Link,
+        NotStr,
         Option,
         P,
         Pre,
+        Response,
         Script,
         Select,
-        Style,
+        StreamingResponse,
         Table,
         Tbody,
         Td,
@@ -40,21 +47,364 @@ try:
         Title,
         Tr,
         serve,
+        to_xml,
     )
+    from starlette.middleware.gzip import GZipMiddleware
 
     FASTHTML_AVAILABLE = True
 except ImportError:
     FASTHTML_AVAILABLE = False
 
+try:
+    from brotli_asgi import BrotliMiddleware
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 from rich.console import Console
 
-from ..config import ConfigManager
-from ..embeddings import EmbeddingsFactory
-from ..utils import get_ctxai_home, get_ctxai_home_info, get_indexes_dir
-from ..vector_store import VectorStore
+from ..config import Config, ConfigManager
+from ..embedding_batcher import EmbeddingBatcherPool
+from ..embedding_cache import CachedEmbeddingProvider
+from ..query_cache import QueryCache
+from ..utils import (
+    content_hash,
+    dir_size,
+    get_cache_dir,
+    get_config_path,
+    get_ctxai_home,
+    get_ctxai_home_info,
+    get_indexes_dir,
+)
+from ..vector_store import VectorStore, index_signature
 
 console = Console()
 
+_CSS = """
+    * { margin: 0; padding: 0; box-sizing: border-box; }
+    body { 
+        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
+        background: #0f172a;
+        color: #e2e8f0;
+        line-height: 1.6;
+    }
+    .container { 
+        max-width: 1200px; 
+        margin: 0 auto; 
+        padding: 2rem;
+    }
+    .header {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 2rem;
+        border-radius: 1rem;
+        margin-bottom: 2rem;
+        box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+    }
+    .header h1 { 
+        font-size: 2.5rem; 
+        margin-bottom: 0.5rem;
+        color: white;
+    }
+    .header p { 
+        color: rgba(255,255,255,0.9); 
+        font-size: 1.1rem;
+    }
+    .card {
+        background: #1e293b;
+        border-radius: 0.75rem;
+        padding: 1.5rem;
+        margin-bottom: 1.5rem;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.2);
+        border: 1px solid #334155;
+    }
+    .card h2 { 
+        margin-bottom: 1rem; 
+        color: #60a5fa;
+        font-size: 1.5rem;
+    }
+    .card h3 { 
+        margin: 1rem 0 0.5rem 0; 
+        color: #818cf8;
+    }
+    .info-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+        gap: 1rem;
+        margin-bottom: 1rem;
+    }
+    .info-item {
+        background: #0f172a;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border-left: 4px solid #60a5fa;
+    }
+    .info-item strong {
+        color: #94a3b8;
+        display: block;
+        margin-bottom: 0.25rem;
+        font-size: 0.9rem;
+    }
+    .info-item span {
+        color: #e2e8f0;
+        font-size: 1.1rem;
+    }
+    table {
+        width: 100%;
+        border-collapse: collapse;
+        background: #0f172a;
+        border-radius: 0.5rem;
+        overflow: hidden;
+    }
+    th {
+        background: #334155;
+        padding: 1rem;
+        text-align: left;
+        color: #94a3b8;
+        font-weight: 600;
+        text-transform: uppercase;
+        font-size: 0.85rem;
+        letter-spacing: 0.05em;
+    }
+    td {
+        padding: 1rem;
+        border-top: 1px solid #334155;
+    }
+    tr:hover {
+        background: #1e293b;
+    }
+    .form-group {
+        margin-bottom: 1rem;
+    }
+    label {
+        display: block;
+        margin-bottom: 0.5rem;
+        color: #94a3b8;
+        font-weight: 500;
+    }
+    input, select, textarea {
+        width: 100%;
+        padding: 0.75rem;
+        background: #0f172a;
+        border: 1px solid #334155;
+        border-radius: 0.5rem;
+        color: #e2e8f0;
+        font-size: 1rem;
+        transition: all 0.2s;
+    }
+    input:focus, select:focus, textarea:focus {
+        outline: none;
+        border-color: #60a5fa;
+        box-shadow: 0 0 0 3px rgba(96, 165, 250, 0.1);
+    }
+    textarea {
+        min-height: 100px;
+        font-family: monospace;
+    }
+    button, .btn {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 0.75rem 1.5rem;
+        border: none;
+        border-radius: 0.5rem;
+        cursor: pointer;
+        font-size: 1rem;
+        font-weight: 600;
+        transition: transform 0.2s, box-shadow 0.2s;
+        display: inline-block;
+        text-decoration: none;
+    }
+    button:hover, .btn:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 8px 20px rgba(102, 126, 234, 0.4);
+    }
+    .btn-secondary {
+        background: #334155;
+    }
+    .btn-secondary:hover {
+        background: #475569;
+        box-shadow: 0 8px 20px rgba(0,0,0,0.3);
+    }
+    .code-block {
+        background: #0f172a;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        overflow-x: auto;
+        border: 1px solid #334155;
+        margin: 0.5rem 0;
+    }
+    .code-block code {
+        color: #e2e8f0;
+        font-family: 'Courier New', monospace;
+        font-size: 0.9rem;
+    }
+    .badge {
+        display: inline-block;
+        padding: 0.25rem 0.75rem;
+        background: #334155;
+        border-radius: 1rem;
+        font-size: 0.85rem;
+        color: #94a3b8;
+    }
+    .badge-success {
+        background: #059669;
+        color: white;
+    }
+    .badge-info {
+        background: #0284c7;
+        color: white;
+    }
+    .nav {
+        display: flex;
+        gap: 1rem;
+        margin-bottom: 2rem;
+    }
+    .nav a {
+        color: #94a3b8;
+        text-decoration: none;
+        padding: 0.5rem 1rem;
+        border-radius: 0.5rem;
+        transition: all 0.2s;
+    }
+    .nav a:hover {
+        background: #1e293b;
+        color: #60a5fa;
+    }
+    .result-card {
+        background: #0f172a;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        margin-bottom: 1rem;
+        border-left: 4px solid #60a5fa;
+    }
+    .result-header {
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        margin-bottom: 0.5rem;
+    }
+    .result-title {
+        color: #60a5fa;
+        font-weight: 600;
+    }
+    .result-similarity {
+        background: #059669;
+        color: white;
+        padding: 0.25rem 0.75rem;
+        border-radius: 1rem;
+        font-size: 0.85rem;
+    }
+    .result-meta {
+        display: flex;
+        gap: 1rem;
+        margin-bottom: 0.5rem;
+        font-size: 0.9rem;
+        color: #94a3b8;
+    }
+"""
+
+# Placeholders marking where pages insert their title, body, and streamed rows or cards
+_TITLE_SLOT = "<!-- ctxai:title -->"
+_BODY_SLOT = "<!-- ctxai:body -->"
+_STREAM_SLOT = "<!-- ctxai:stream -->"
+
+# Versioned by content so the long-lived browser cache is busted when the styles change
+_CSS_URL = f"/static/app.css?v={content_hash(_CSS.encode())[:12]}"
+
+
+def _page_shell(styles) -> tuple[str, str, str]:
+    """
+    Render the document shell shared by every page.
+
+    Args:
+        styles: Stylesheet link placed in the head
+
+    Returns:
+        Markup before the title, between the title and the body, and after the body
+    """
+    shell = to_xml(
+        Html(Head(Title(NotStr(_TITLE_SLOT)), styles), Body(Div(NotStr(_BODY_SLOT), cls="container"))),
+        indent=False,
+    )
+    start, rest = shell.split(_TITLE_SLOT, 1)
+    middle, end = rest.split(_BODY_SLOT, 1)
+    return start, middle, end
+
+
+def _stream_page(html: str, items: Iterable) -> "StreamingResponse":
+    """
+    Send a page in chunks: the markup before its stream slot, each item, then the rest.
+
+    The first bytes reach the browser before the items are rendered, and only
+    one item is held as markup at a time.
+
+    Args:
+        html: Rendered page containing _STREAM_SLOT where the items belong
+        items: Components rendered in place of the slot, or already rendered
+            markup strings, one chunk each
+
+    Returns:
+        Streaming HTML response
+    """
+    before, after = html.split(_STREAM_SLOT, 1)
+
+    def chunks():
+        yield before
+        for item in items:
+            yield item if isinstance(item, str) else to_xml(item, indent=False)
+        yield after
+
+    # Ask reverse proxies not to buffer the response
+    return StreamingResponse(chunks(), media_type="text/html", headers={"X-Accel-Buffering": "no"})
+
+
+# Chunk table row; tag objects cost about 30x more per row to build and serialize
+_CHUNK_ROW = '<tr><td>{}</td><td title="{}">{}</td><td>{}</td><td>{}</td><td>{}-{}</td><td>{:,} chars</td></tr>'
+
+# Rows rendered per streamed chunk of the chunk table
+_CHUNK_ROWS_PER_WRITE = 50
+
+
+# Home page index table row
+_INDEX_ROW = (
+    '<tr><td><a href="/index/{name}">{name}</a></td><td>{chunks:,}</td><td>{size_mb:.2f} MB</td><td>{created}</td>'
+    '<td><a href="/index/{name}" class="btn btn-secondary" style="padding: 0.5rem 1rem;">View</a> '
+    '<a href="/query?index={name}" class="btn" style="padding: 0.5rem 1rem;">Query</a></td></tr>'
+)
+
+
+def _index_row(summary: dict) -> str:
+    """Render one home page index table row from an index summary."""
+    return _INDEX_ROW.format(
+        name=escape(summary["name"]),
+        chunks=summary["chunks"],
+        size_mb=summary["size_mb"],
+        created=escape(summary["created"]),
+    )
+
+
+def _chunk_row(number: int, metadata: dict) -> str:
+    """Render one chunk table row from chunk metadata."""
+    file_path = str(metadata.get("file_path", "Unknown"))
+    return _CHUNK_ROW.format(
+        number,
+        escape(file_path),
+        escape(os.path.basename(file_path)),
+        escape(str(metadata.get("language", "Unknown"))),
+        escape(str(metadata.get("chunk_type", "Unknown"))),
+        escape(str(metadata.get("start_line", 0))),
+        escape(str(metadata.get("end_line", 0))),
+        int(metadata["char_count"]),
+    )
+
+
+def _index_names(indexes_dir: Path) -> list[str]:
+    """Names of the index directories; os.scandir reports entry types without a stat per entry."""
+    if not indexes_dir.exists():
+        return []
+    with os.scandir(indexes_dir) as entries:
+        return [entry.name for entry in entries if entry.is_dir()]
+
 
 def start_dashboard(port: int = 3000, project_path: Path | None = None):
     """
@@ -75,292 +425,137 @@ def start_dashboard(port: int = 3000, project_path: Path | None = None):
     # Initialize FastHTML app
     app = FastHTML()
 
+    # Compress pages and the stylesheet; streamed pages are flushed chunk by chunk.
+    # Brotli falls back to gzip for clients that don't accept it.
+    if BROTLI_AVAILABLE:
+        app.add_middleware(BrotliMiddleware, minimum_size=1024)
+    else:
+        app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
     # Get CTXAI home info
     ctxai_home = get_ctxai_home(project_path)
     indexes_dir = get_indexes_dir(project_path)
-    home_info = get_ctxai_home_info(project_path)
-
-    # Styles
-    app_styles = Style("""
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { 
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: #0f172a;
-            color: #e2e8f0;
-            line-height: 1.6;
-        }
-        .container { 
-            max-width: 1200px; 
-            margin: 0 auto; 
-            padding: 2rem;
-        }
-        .header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 2rem;
-            border-radius: 1rem;
-            margin-bottom: 2rem;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-        }
-        .header h1 { 
-            font-size: 2.5rem; 
-            margin-bottom: 0.5rem;
-            color: white;
-        }
-        .header p { 
-            color: rgba(255,255,255,0.9); 
-            font-size: 1.1rem;
-        }
-        .card {
-            background: #1e293b;
-            border-radius: 0.75rem;
-            padding: 1.5rem;
-            margin-bottom: 1.5rem;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.2);
-            border: 1px solid #334155;
-        }
-        .card h2 { 
-            margin-bottom: 1rem; 
-            color: #60a5fa;
-            font-size: 1.5rem;
-        }
-        .card h3 { 
-            margin: 1rem 0 0.5rem 0; 
-            color: #818cf8;
-        }
-        .info-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 1rem;
-            margin-bottom: 1rem;
-        }
-        .info-item {
-            background: #0f172a;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            border-left: 4px solid #60a5fa;
-        }
-        .info-item strong {
-            color: #94a3b8;
-            display: block;
-            margin-bottom: 0.25rem;
-            font-size: 0.9rem;
-        }
-        .info-item span {
-            color: #e2e8f0;
-            font-size: 1.1rem;
-        }
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            background: #0f172a;
-            border-radius: 0.5rem;
-            overflow: hidden;
-        }
-        th {
-            background: #334155;
-            padding: 1rem;
-            text-align: left;
-            color: #94a3b8;
-            font-weight: 600;
-            text-transform: uppercase;
-            font-size: 0.85rem;
-            letter-spacing: 0.05em;
-        }
-        td {
-            padding: 1rem;
-            border-top: 1px solid #334155;
-        }
-        tr:hover {
-            background: #1e293b;
-        }
-        .form-group {
-            margin-bottom: 1rem;
-        }
-        label {
-            display: block;
-            margin-bottom: 0.5rem;
-            color: #94a3b8;
-            font-weight: 500;
-        }
-        input, select, textarea {
-            width: 100%;
-            padding: 0.75rem;
-            background: #0f172a;
-            border: 1px solid #334155;
-            border-radius: 0.5rem;
-            color: #e2e8f0;
-            font-size: 1rem;
-            transition: all 0.2s;
-        }
-        input:focus, select:focus, textarea:focus {
-            outline: none;
-            border-color: #60a5fa;
-            box-shadow: 0 0 0 3px rgba(96, 165, 250, 0.1);
-        }
-        textarea {
-            min-height: 100px;
-            font-family: monospace;
-        }
-        button, .btn {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 0.75rem 1.5rem;
-            border: none;
-            border-radius: 0.5rem;
-            cursor: pointer;
-            font-size: 1rem;
-            font-weight: 600;
-            transition: transform 0.2s, box-shadow 0.2s;
-            display: inline-block;
-            text-decoration: none;
-        }
-        button:hover, .btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 8px 20px rgba(102, 126, 234, 0.4);
-        }
-        .btn-secondary {
-            background: #334155;
-        }
-        .btn-secondary:hover {
-            background: #475569;
-            box-shadow: 0 8px 20px rgba(0,0,0,0.3);
-        }
-        .code-block {
-            background: #0f172a;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            overflow-x: auto;
-            border: 1px solid #334155;
-            margin: 0.5rem 0;
-        }
-        .code-block code {
-            color: #e2e8f0;
-            font-family: 'Courier New', monospace;
-            font-size: 0.9rem;
-        }
-        .badge {
-            display: inline-block;
-            padding: 0.25rem 0.75rem;
-            background: #334155;
-            border-radius: 1rem;
-            font-size: 0.85rem;
-            color: #94a3b8;
-        }
-        .badge-success {
-            background: #059669;
-            color: white;
-        }
-        .badge-info {
-            background: #0284c7;
-            color: white;
-        }
-        .nav {
-            display: flex;
-            gap: 1rem;
-            margin-bottom: 2rem;
-        }
-        .nav a {
-            color: #94a3b8;
-            text-decoration: none;
-            padding: 0.5rem 1rem;
-            border-radius: 0.5rem;
-            transition: all 0.2s;
-        }
-        .nav a:hover {
-            background: #1e293b;
-            color: #60a5fa;
-        }
-        .result-card {
-            background: #0f172a;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            margin-bottom: 1rem;
-            border-left: 4px solid #60a5fa;
-        }
-        .result-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 0.5rem;
-        }
-        .result-title {
-            color: #60a5fa;
-            font-weight: 600;
-        }
-        .result-similarity {
-            background: #059669;
-            color: white;
-            padding: 0.25rem 0.75rem;
-            border-radius: 1rem;
-            font-size: 0.85rem;
-        }
-        .result-meta {
-            display: flex;
-            gap: 1rem;
-            margin-bottom: 0.5rem;
-            font-size: 0.9rem;
-            color: #94a3b8;
-        }
-    """)
+    location_type = "Global (CTXAI_HOME)" if get_ctxai_home_info()["is_global"] else "Project"
+
+    # Providers stay loaded between queries; concurrent queries share one forward pass
+    batchers = EmbeddingBatcherPool(get_cache_dir(project_path) / "embeddings.db")
+
+    # Repeated and near-duplicate queries skip the embedding call and the search
+    query_cache = QueryCache(ttl_seconds=float(os.environ.get("CTXAI_QUERY_TTL", 300)))
+
+    # Parsed configuration, tagged with the config file's modification time and size
+    config_path = get_config_path(project_path)
+    loaded_configs: dict[Path, tuple[tuple[int, int] | None, Config]] = {}
+
+    def get_config() -> Config:
+        """Current configuration, reloaded only when the config file changes."""
+        try:
+            stat = config_path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+
+        cached = loaded_configs.get(config_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        config = ConfigManager(project_path).load()
+        loaded_configs[config_path] = (signature, config)
+        return config
+
+    # Open stores and home page summaries per index name, tagged with the index signature
+    vector_stores: dict[str, tuple[tuple[int, int], VectorStore]] = {}
+    index_summaries: dict[str, tuple[tuple[int, int], dict]] = {}
+
+    def get_vector_store(name: str) -> VectorStore:
+        """Reuse the open store for an index until its files or the indexing config change."""
+        index_path = indexes_dir / name
+        signature = index_signature(index_path)
+        index_config = get_config().indexing
+
+        cached = vector_stores.get(name)
+        if cached is not None and cached[0] == signature and cached[1].index_config == index_config:
+            return cached[1]
+
+        vector_store = VectorStore(storage_path=index_path, collection_name=name, index_config=index_config)
+        vector_stores[name] = (index_signature(index_path), vector_store)
+        query_cache.invalidate(name)
+        return vector_store
+
+    def get_index_summary(index_path: Path) -> dict:
+        """Home page row for an index, recomputed only when the index changes."""
+        name = index_path.name
+        signature = index_signature(index_path)
+        cached = index_summaries.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        total_chunks = get_vector_store(name).count()
+        index_stat = index_path.stat()
+        summary = {
+            "name": name,
+            "path": str(index_path),
+            "chunks": total_chunks,
+            "created": datetime.fromtimestamp(index_stat.st_ctime).strftime("%Y-%m-%d %H:%M:%S"),
+            "size_mb": dir_size(index_path) / (1024 * 1024),
+        }
+        # The table row is rendered here, so home page views only join cached markup
+        summary["row"] = _index_row(summary)
+        index_summaries[name] = (index_signature(index_path), summary)
+        return summary
+
+    # Stylesheet is served once and cached by the browser instead of inlined in every page
+    app_styles = Link(rel="stylesheet", href=_CSS_URL)
+
+    # Pages differ only in title and body, so the shared shell is rendered once
+    shell_start, shell_middle, shell_end = _page_shell(app_styles)
+
+    def render_page(title: str, *content) -> str:
+        """Page markup: the prerendered shell around the given title and body components."""
+        return f"{shell_start}{escape(title)}{shell_middle}{to_xml(*content, indent=False)}{shell_end}"
+
+    def page_response(title: str, *content) -> Response:
+        return Response(render_page(title, *content), media_type="text/html")
+
+    @app.get("/static/app.css")
+    def stylesheet():
+        """Dashboard stylesheet."""
+        return Response(_CSS, media_type="text/css", headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+    # Rendered once; to_xml returns markup that is inserted into pages without escaping
+    home_header = to_xml(
+        # Header
+        Div(
+            H1("🤖 CTXAI Dashboard"),
+            P("Semantic Code Search Engine"),
+            cls="header",
+        ),
+        # Navigation
+        Div(
+            A("Home", href="/"),
+            A("Query", href="/query"),
+            A("Settings", href="/settings"),
+            cls="nav",
+        ),
+        indent=False,
+    )
 
     @app.get("/")
     def home():
         """Home page showing all indexes."""
         # Get all indexes
         indexes = []
-        if indexes_dir.exists():
-            for index_path in indexes_dir.iterdir():
-                if index_path.is_dir():
-                    try:
-                        # Get vector store stats
-                        vector_store = VectorStore(storage_path=index_path, collection_name=index_path.name)
-                        stats = vector_store.get_stats()
-
-                        # Get creation time
-                        creation_time = datetime.fromtimestamp(index_path.stat().st_ctime).strftime("%Y-%m-%d %H:%M:%S")
-
-                        indexes.append(
-                            {
-                                "name": index_path.name,
-                                "path": str(index_path),
-                                "chunks": stats["total_chunks"],
-                                "created": creation_time,
-                                "size_mb": sum(f.stat().st_size for f in index_path.rglob("*") if f.is_file())
-                                / (1024 * 1024),
-                            }
-                        )
-                    except Exception as e:
-                        console.print(f"[yellow]Warning: Could not load index {index_path.name}: {e}[/yellow]")
+        for name in _index_names(indexes_dir):
+            try:
+                indexes.append(get_index_summary(indexes_dir / name))
+            except Exception as e:
+                console.print(f"[yellow]Warning: Could not load index {name}: {e}[/yellow]")
 
         # Build index table
         if indexes:
-            index_rows = [
-                Tr(
-                    Td(A(idx["name"], href=f"/index/{idx['name']}")),
-                    Td(f"{idx['chunks']:,}"),
-                    Td(f"{idx['size_mb']:.2f} MB"),
-                    Td(idx["created"]),
-                    Td(
-                        A(
-                            "View",
-                            href=f"/index/{idx['name']}",
-                            cls="btn btn-secondary",
-                            style="padding: 0.5rem 1rem;",
-                        ),
-                        " ",
-                        A(
-                            "Query",
-                            href=f"/query?index={idx['name']}",
-                            cls="btn",
-                            style="padding: 0.5rem 1rem;",
-                        ),
-                    ),
-                )
-                for idx in indexes
-            ]
             index_table = Table(
                 Thead(Tr(Th("Index Name"), Th("Chunks"), Th("Size"), Th("Created"), Th("Actions"))),
-                Tbody(*index_rows),
+                Tbody(NotStr("".join(idx["row"] for idx in indexes))),
             )
         else:
             index_table = P(
@@ -368,291 +563,319 @@ def start_dashboard(port: int = 3000, project_path: Path | None = None):
                 style="color: #94a3b8;",
             )
 
-        return Html(
-            Head(Title("CTXAI Dashboard"), app_styles),
-            Body(
+        return page_response(
+            "CTXAI Dashboard",
+            home_header,
+            # CTXAI Home Info
+            Div(
+                H2("📁 Configuration"),
                 Div(
-                    # Header
+                    Div(Div(P("Home Directory"), P(str(ctxai_home))), cls="info-item"),
                     Div(
-                        H1("🤖 CTXAI Dashboard"),
-                        P("Semantic Code Search Engine"),
-                        cls="header",
+                        Div(P("Location Type"), P(location_type)),
+                        cls="info-item",
                     ),
-                    # Navigation
-                    Div(
-                        A("Home", href="/"),
-                        A("Query", href="/query"),
-                        A("Settings", href="/settings"),
-                        cls="nav",
-                    ),
-                    # CTXAI Home Info
-                    Div(
-                        H2("📁 Configuration"),
-                        Div(
-                            Div(Div(P("Home Directory"), P(str(ctxai_home))), cls="info-item"),
-                            Div(
-                                Div(P("Location Type"), P(home_info["location_type"])),
-                                cls="info-item",
-                            ),
-                            Div(Div(P("Total Indexes"), P(str(len(indexes)))), cls="info-item"),
-                            cls="info-grid",
-                        ),
-                        cls="card",
-                    ),
-                    # Indexes
-                    Div(H2("📊 Indexes"), index_table, cls="card"),
-                    cls="container",
+                    Div(Div(P("Total Indexes"), P(str(len(indexes)))), cls="info-item"),
+                    cls="info-grid",
                 ),
+                cls="card",
             ),
+            # Indexes
+            Div(H2("📊 Indexes"), index_table, cls="card"),
         )
 
     @app.get("/index/{name}")
-    def view_index(name: str):
-        """View details of a specific index."""
+    def view_index(name: str, page: int = 0, size: int = 50):
+        """View details of a specific index, one page of chunks at a time."""
         index_path = indexes_dir / name
+        page = max(page, 0)
+        size = min(max(size, 1), 500)
 
         if not index_path.exists():
-            return Html(
-                Head(Title("Index Not Found - CTXAI"), app_styles),
-                Body(
-                    Div(
-                        Div(
-                            H1("❌ Index Not Found"),
-                            P(f"Index '{name}' does not exist."),
-                            cls="header",
-                        ),
-                        Div(A("← Back to Home", href="/", cls="btn")),
-                        cls="container",
-                    )
+            return page_response(
+                "Index Not Found - CTXAI",
+                Div(
+                    H1("❌ Index Not Found"),
+                    P(f"Index '{name}' does not exist."),
+                    cls="header",
                 ),
+                Div(A("← Back to Home", href="/", cls="btn")),
             )
 
         try:
-            # Get vector store stats
-            vector_store = VectorStore(storage_path=index_path, collection_name=name)
-            stats = vector_store.get_stats()
-
-            # Get all chunks (limited to first 100 for display)
-            # This is a simplified approach - in production you'd want pagination
-            results = vector_store.collection.get(limit=100)
-
-            chunk_rows = []
-            if results and results["ids"]:
-                for i, (chunk_id, metadata, content) in enumerate(
-                    zip(results["ids"], results["metadatas"], results["documents"])
-                ):
-                    file_path = Path(metadata.get("file_path", "Unknown"))
-                    chunk_rows.append(
-                        Tr(
-                            Td(str(i + 1)),
-                            Td(file_path.name, title=str(file_path)),
-                            Td(metadata.get("language", "Unknown")),
-                            Td(metadata.get("chunk_type", "Unknown")),
-                            Td(f"{metadata.get('start_line', 0)}-{metadata.get('end_line', 0)}"),
-                            Td(f"{len(content):,} chars"),
-                        )
-                    )
+            # Get the chunk count
+            vector_store = get_vector_store(name)
+            total_chunks = vector_store.count()
+
+            # Only metadata is fetched; chunk sizes are stored alongside it
+            chunks = vector_store.list_chunks(limit=size, offset=page * size)
+
+            def chunk_rows():
+                if not chunks:
+                    yield Tr(Td("No chunks found", colspan="6"))
+                    return
+                first = page * size + 1
+                for start in range(0, len(chunks), _CHUNK_ROWS_PER_WRITE):
+                    batch = chunks[start : start + _CHUNK_ROWS_PER_WRITE]
+                    yield "".join(_chunk_row(i, chunk["metadata"]) for i, chunk in enumerate(batch, first + start))
+
+            pager = []
+            if page > 0:
+                pager.append(
+                    A("← Previous", href=f"/index/{name}?page={page - 1}&size={size}", cls="btn btn-secondary")
+                )
+            if (page + 1) * size < total_chunks:
+                pager.append(A("Next →", href=f"/index/{name}?page={page + 1}&size={size}", cls="btn btn-secondary"))
 
+            # Rows are rendered and sent one at a time into the table body
             chunk_table = Table(
                 Thead(Tr(Th("#"), Th("File"), Th("Language"), Th("Type"), Th("Lines"), Th("Size"))),
-                Tbody(*chunk_rows) if chunk_rows else Tbody(Tr(Td("No chunks found", colspan="6"))),
+                Tbody(NotStr(_STREAM_SLOT)),
             )
 
         except Exception as e:
-            return Html(
-                Head(Title("Error - CTXAI"), app_styles),
-                Body(
-                    Div(
-                        Div(H1("❌ Error"), P(f"Error loading index: {e}"), cls="header"),
-                        Div(A("← Back to Home", href="/", cls="btn")),
-                        cls="container",
-                    )
-                ),
+            return page_response(
+                "Error - CTXAI",
+                Div(H1("❌ Error"), P(f"Error loading index: {e}"), cls="header"),
+                Div(A("← Back to Home", href="/", cls="btn")),
             )
 
-        return Html(
-            Head(Title(f"{name} - CTXAI Dashboard"), app_styles),
-            Body(
+        html_page = render_page(
+            f"{name} - CTXAI Dashboard",
+            Div(
+                H1(f"📊 Index: {name}"),
+                P(f"Total chunks: {total_chunks:,}"),
+                cls="header",
+            ),
+            Div(
+                A("← Back to Home", href="/", cls="btn"),
+                A("Query This Index", href=f"/query?index={name}", cls="btn"),
+            ),
+            Div(
+                H2("📈 Statistics"),
                 Div(
                     Div(
-                        H1(f"📊 Index: {name}"),
-                        P(f"Total chunks: {stats['total_chunks']:,}"),
-                        cls="header",
+                        Div(P("Total Chunks"), P(f"{total_chunks:,}")),
+                        cls="info-item",
                     ),
+                    Div(Div(P("Index Name"), P(name)), cls="info-item"),
+                    Div(Div(P("Storage Path"), P(str(index_path))), cls="info-item"),
+                    cls="info-grid",
+                ),
+                cls="card",
+            ),
+            Div(
+                H2(f"📄 Chunks (Page {page + 1})"),
+                chunk_table,
+                Div(*pager, cls="nav", style="margin-top: 1rem;"),
+                cls="card",
+            ),
+        )
+        return _stream_page(html_page, chunk_rows())
+
+    @app.get("/query")
+    def query_page(index: str | None = None):
+        """Query interface."""
+        # Get all indexes for dropdown
+        index_options = [Option(name, value=name, selected=name == index) for name in _index_names(indexes_dir)]
+
+        return page_response(
+            "Query - CTXAI Dashboard",
+            Div(H1("🔍 Query Codebase"), P("Search using natural language"), cls="header"),
+            Div(A("← Back to Home", href="/", cls="btn")),
+            Div(
+                H2("Search"),
+                Form(
                     Div(
-                        A("← Back to Home", href="/", cls="btn"),
-                        A("Query This Index", href=f"/query?index={name}", cls="btn"),
+                        Label("Index", **{"for": "index"}),
+                        Select(*index_options, id="index", name="index", required=True),
+                        cls="form-group",
                     ),
                     Div(
-                        H2("📈 Statistics"),
-                        Div(
-                            Div(
-                                Div(P("Total Chunks"), P(f"{stats['total_chunks']:,}")),
-                                cls="info-item",
-                            ),
-                            Div(Div(P("Index Name"), P(name)), cls="info-item"),
-                            Div(Div(P("Storage Path"), P(str(index_path))), cls="info-item"),
-                            cls="info-grid",
+                        Label("Query", **{"for": "query"}),
+                        Textarea(
+                            placeholder="e.g., Find authentication functions",
+                            id="query",
+                            name="query",
+                            required=True,
                         ),
-                        cls="card",
+                        cls="form-group",
                     ),
                     Div(
-                        H2("📄 Chunks (First 100)"),
-                        chunk_table,
-                        cls="card",
+                        Label("Number of Results", **{"for": "n_results"}),
+                        Input(
+                            type="number",
+                            id="n_results",
+                            name="n_results",
+                            value="5",
+                            min="1",
+                            max="20",
+                        ),
+                        cls="form-group",
                     ),
-                    cls="container",
+                    Button("🔍 Search", type="submit"),
+                    action="/query/search",
+                    method="post",
                 ),
+                cls="card",
             ),
-        )
-
-    @app.get("/query")
-    def query_page(index: str | None = None):
-        """Query interface."""
-        # Get all indexes for dropdown
-        index_options = []
-        if indexes_dir.exists():
-            for index_path in indexes_dir.iterdir():
-                if index_path.is_dir():
-                    selected = index_path.name == index if index else False
-                    index_options.append(Option(index_path.name, value=index_path.name, selected=selected))
-
-        return Html(
-            Head(Title("Query - CTXAI Dashboard"), app_styles),
-            Body(
-                Div(
-                    Div(H1("🔍 Query Codebase"), P("Search using natural language"), cls="header"),
-                    Div(A("← Back to Home", href="/", cls="btn")),
+            Div(
+                H2("Multi-Query Search"),
+                Form(
+                    Div(
+                        Label("Index", **{"for": "multi-index"}),
+                        Select(*index_options, id="multi-index", name="index", required=True),
+                        cls="form-group",
+                    ),
+                    Div(
+                        Label("Queries (one per line)", **{"for": "queries"}),
+                        Textarea(
+                            placeholder="e.g., Find authentication functions\nWhere are sessions stored?",
+                            id="queries",
+                            name="queries",
+                            required=True,
+                        ),
+                        cls="form-group",
+                    ),
                     Div(
-                        H2("Search"),
-                        Form(
-                            Div(
-                                Label("Index", **{"for": "index"}),
-                                Select(*index_options, id="index", name="index", required=True),
-                                cls="form-group",
-                            ),
-                            Div(
-                                Label("Query", **{"for": "query"}),
-                                Textarea(
-                                    placeholder="e.g., Find authentication functions",
-                                    id="query",
-                                    name="query",
-                                    required=True,
-                                ),
-                                cls="form-group",
-                            ),
-                            Div(
-                                Label("Number of Results", **{"for": "n_results"}),
-                                Input(
-                                    type="number",
-                                    id="n_results",
-                                    name="n_results",
-                                    value="5",
-                                    min="1",
-                                    max="20",
-                                ),
-                                cls="form-group",
-                            ),
-                            Button("🔍 Search", type="submit"),
-                            action="/query/search",
-                            method="post",
+                        Label("Results per Query", **{"for": "multi-n_results"}),
+                        Input(
+                            type="number",
+                            id="multi-n_results",
+                            name="n_results",
+                            value="5",
+                            min="1",
+                            max="20",
                         ),
-                        cls="card",
+                        cls="form-group",
                     ),
-                    cls="container",
+                    Button("🔍 Search All", type="submit"),
+                    action="/query/multi",
+                    method="post",
                 ),
+                cls="card",
             ),
         )
 
-    @app.post("/query/search")
-    def query_search(index: str, query: str, n_results: int = 5):
-        """Execute query and show results."""
-        try:
-            # Load configuration and create embedding provider
-            config_manager = ConfigManager(project_path)
-            config = config_manager.load()
-
-            # Initialize embedding provider
-            embeddings_generator = EmbeddingsFactory.create(config.embedding)
+    async def search_index(index: str, queries: list[str], n_results: int) -> list[list[dict]]:
+        """
+        Run queries against an index, reusing cached embeddings and results.
+
+        Queries missing from the cache are embedded concurrently, so the batcher
+        sends them to the provider as one batch.
+
+        Returns:
+            One result list per query, in query order
+        """
+        config = get_config()
+
+        if not (indexes_dir / index).exists():
+            raise ValueError(f"Index '{index}' not found")
+        # Opening an index, loading a model and searching block on disk or compute, so they
+        # run in worker threads and other requests are served meanwhile
+        vector_store = await asyncio.to_thread(get_vector_store, index)
+
+        model_key = (config.embedding.provider, config.embedding.model)
+        embeddings = {query: query_cache.get_embedding(model_key, query) for query in queries}
+        missing = [query for query, embedding in embeddings.items() if embedding is None]
+        if missing:
+            batcher = await asyncio.to_thread(batchers.get, config.embedding)
+            for query, embedding in zip(missing, await asyncio.gather(*(batcher.embed(query) for query in missing))):
+                embeddings[query] = embedding
+                query_cache.put_embedding(model_key, query, embedding)
+
+        all_results = [query_cache.get_results(index, embeddings[query], n_results) for query in queries]
+        uncached = [i for i, results in enumerate(all_results) if results is None]
+
+        def search_uncached() -> list[list[dict]]:
+            return [vector_store.search(query_embedding=embeddings[queries[i]], n_results=n_results) for i in uncached]
+
+        if uncached:
+            for i, results in zip(uncached, await asyncio.to_thread(search_uncached)):
+                all_results[i] = results
+                query_cache.put_results(index, embeddings[queries[i]], n_results, results)
+        return all_results
+
+    def query_error_page(error: Exception):
+        return page_response(
+            "Query Error - CTXAI Dashboard",
+            Div(H1("❌ Query Error"), P(f"Error executing query: {error}"), cls="header"),
+            Div(A("← Back to Query", href="/query", cls="btn")),
+        )
 
-            # Load vector store
-            index_path = indexes_dir / index
-            if not index_path.exists():
-                raise ValueError(f"Index '{index}' not found")
+    def result_cards(results: list[dict]):
+        for i, result in enumerate(results, 1):
+            metadata = result["metadata"]
+            content = result["content"]
+            distance = result["distance"]
+            similarity = max(0, 1 - distance)
 
-            vector_store = VectorStore(storage_path=index_path, collection_name=index)
+            file_path = metadata["file_path"]
 
-            # Generate query embedding and search
-            query_embedding = embeddings_generator.generate_embedding(query)
-            results = vector_store.search(query_embedding=query_embedding, n_results=n_results)
+            # Truncate content for display
+            display_content = content
+            if len(content) > 500:
+                display_content = content[:500] + "\n... (truncated)"
 
-            # Build result cards
-            result_cards = []
-            for i, result in enumerate(results, 1):
-                metadata = result["metadata"]
-                content = result["content"]
-                distance = result["distance"]
-                similarity = max(0, 1 - distance)
+            yield Div(
+                Div(
+                    Div(f"{i}. {os.path.basename(file_path)}", cls="result-title"),
+                    Div(f"{similarity:.0%}", cls="result-similarity"),
+                    cls="result-header",
+                ),
+                Div(
+                    P(f"📁 {file_path}"),
+                    P(f"📍 Lines {metadata['start_line']}-{metadata['end_line']}"),
+                    P(f"🏷️ {metadata['chunk_type']} ({metadata['language']})"),
+                    cls="result-meta",
+                ),
+                Div(Pre(Code(display_content)), cls="code-block"),
+                cls="result-card",
+            )
 
-                file_path = Path(metadata["file_path"])
+    def results_page(index: str, summary: str, items):
+        # Cards are rendered and sent one at a time after the page header
+        html_page = render_page(
+            "Query Results - CTXAI Dashboard",
+            Div(H1("🔍 Query Results"), P(summary), cls="header"),
+            Div(A("← New Query", href="/query", cls="btn")),
+            Div(H2(f"Results from '{index}'"), NotStr(_STREAM_SLOT), cls="card"),
+        )
+        return _stream_page(html_page, items)
 
-                # Truncate content for display
-                display_content = content
-                if len(content) > 500:
-                    display_content = content[:500] + "\n... (truncated)"
+    @app.post("/query/search")
+    async def query_search(index: str, query: str, n_results: int = 5):
+        """Execute query and show results."""
+        try:
+            (results,) = await search_index(index, [query], n_results)
+        except Exception as e:
+            return query_error_page(e)
 
-                result_cards.append(
-                    Div(
-                        Div(
-                            Div(f"{i}. {file_path.name}", cls="result-title"),
-                            Div(f"{similarity:.0%}", cls="result-similarity"),
-                            cls="result-header",
-                        ),
-                        Div(
-                            P(f"📁 {file_path}"),
-                            P(f"📍 Lines {metadata['start_line']}-{metadata['end_line']}"),
-                            P(f"🏷️ {metadata['chunk_type']} ({metadata['language']})"),
-                            cls="result-meta",
-                        ),
-                        Div(Pre(Code(display_content)), cls="code-block"),
-                        cls="result-card",
-                    )
-                )
+        return results_page(index, f"Found {len(results)} result(s) for: {query}", result_cards(results))
 
+    @app.post("/query/multi")
+    async def query_multi(index: str, queries: str, n_results: int = 5):
+        """Execute several queries (one per line) with a single embedding batch and show grouped results."""
+        query_list = list(dict.fromkeys(line.strip() for line in queries.splitlines() if line.strip()))
+        try:
+            if not query_list:
+                raise ValueError("No queries given")
+            all_results = await search_index(index, query_list, n_results)
         except Exception as e:
-            return Html(
-                Head(Title("Query Error - CTXAI Dashboard"), app_styles),
-                Body(
-                    Div(
-                        Div(H1("❌ Query Error"), P(f"Error executing query: {e}"), cls="header"),
-                        Div(A("← Back to Query", href="/query", cls="btn")),
-                        cls="container",
-                    )
-                ),
-            )
+            return query_error_page(e)
 
-        return Html(
-            Head(Title("Query Results - CTXAI Dashboard"), app_styles),
-            Body(
-                Div(
-                    Div(
-                        H1("🔍 Query Results"),
-                        P(f"Found {len(results)} result(s) for: {query}"),
-                        cls="header",
-                    ),
-                    Div(A("← New Query", href="/query", cls="btn")),
-                    Div(H2(f"Results from '{index}'"), *result_cards, cls="card"),
-                    cls="container",
-                ),
-            ),
-        )
+        def grouped_cards():
+            for query, results in zip(query_list, all_results):
+                yield H3(f"{query} ({len(results)})")
+                yield from result_cards(results)
+
+        return results_page(index, f"Ran {len(query_list)} queries", grouped_cards())
 
     @app.get("/settings")
     def settings_page():
         """Settings page."""
         try:
-            config_manager = ConfigManager(project_path)
-            config = config_manager.load()
+            config = get_config()
 
             config_json = json.dumps(
                 {
@@ -673,39 +896,56 @@ def start_dashboard(port: int = 3000, project_path: Path | None = None):
         except Exception as e:
             config_json = f"Error loading configuration: {e}"
 
-        return Html(
-            Head(Title("Settings - CTXAI Dashboard"), app_styles),
-            Body(
+        return page_response(
+            "Settings - CTXAI Dashboard",
+            Div(H1("⚙️ Settings"), P("Configuration and environment"), cls="header"),
+            Div(A("← Back to Home", href="/", cls="btn")),
+            Div(
+                H2("📁 CTXAI Home"),
                 Div(
-                    Div(H1("⚙️ Settings"), P("Configuration and environment"), cls="header"),
-                    Div(A("← Back to Home", href="/", cls="btn")),
+                    Div(Div(P("Home Directory"), P(str(ctxai_home))), cls="info-item"),
                     Div(
-                        H2("📁 CTXAI Home"),
-                        Div(
-                            Div(Div(P("Home Directory"), P(str(ctxai_home))), cls="info-item"),
-                            Div(
-                                Div(P("Location Type"), P(home_info["location_type"])),
-                                cls="info-item",
-                            ),
-                            Div(Div(P("Indexes Directory"), P(str(indexes_dir))), cls="info-item"),
-                            cls="info-grid",
-                        ),
-                        cls="card",
+                        Div(P("Location Type"), P(location_type)),
+                        cls="info-item",
                     ),
-                    Div(
-                        H2("🔧 Configuration"),
-                        P(
-                            "Current configuration from .ctxai/config.json",
-                            style="color: #94a3b8; margin-bottom: 1rem;",
-                        ),
-                        Div(Pre(Code(config_json)), cls="code-block"),
-                        cls="card",
-                    ),
-                    cls="container",
+                    Div(Div(P("Indexes Directory"), P(str(indexes_dir))), cls="info-item"),
+                    cls="info-grid",
+                ),
+                cls="card",
+            ),
+            Div(
+                H2("🔧 Configuration"),
+                P(
+                    "Current configuration from .ctxai/config.json",
+                    style="color: #94a3b8; margin-bottom: 1rem;",
                 ),
+                Div(Pre(Code(config_json)), cls="code-block"),
+                cls="card",
             ),
         )
 
+    def warm_up():
+        """Open every index and load the embedding model before the first request needs them."""
+        for name in _index_names(indexes_dir):
+            try:
+                get_index_summary(indexes_dir / name)
+            except Exception as e:
+                console.print(f"[yellow]Warning: Could not load index {name}: {e}[/yellow]")
+
+        try:
+            config = get_config()
+            provider = batchers.get(config.embedding).provider
+            # One forward pass initializes the model's lazy state; API providers would bill for it
+            if config.embedding.provider == "local":
+                if isinstance(provider, CachedEmbeddingProvider):
+                    provider = provider.provider
+                provider.generate_embeddings(["warmup"])
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not load embedding model: {e}[/yellow]")
+
+    # Warm up in the background so the server starts accepting requests right away
+    threading.Thread(target=warm_up, name="ctxai-dashboard-warmup", daemon=True).start()
+
     # Start server
     console.print("[green]✓ Dashboard started successfully![/green]")
     console.print(f"[cyan]Open in browser: http://localhost:{port}[/cyan]\n")
@@ -3,22 +3,65 @@ Index command implementation.
 Orchestrates the entire indexing pipeline: traversal, chunking, embedding, and storage.
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
 
-from ..chunking import CodeChunker
-from ..config import ConfigManager, EmbeddingConfig
-from ..embeddings import EmbeddingsFactory
+from ..chunk_cache import ChunkCache
+from ..chunking import CodeChunk, CodeChunker
+from ..config import ConfigManager, EmbeddingConfig, IndexConfig
+from ..embedding_cache import CachedEmbeddingProvider, EmbeddingCache
+from ..embeddings import EmbeddingsFactory, LocalEmbeddingProvider
+from ..index_manifest import IndexManifest
 from ..size_validator import ProjectSizeLimitError, ProjectSizeValidator
 from ..traversal import CodeTraversal
-from ..utils import get_ctxai_home, get_indexes_dir, is_using_global_home
+from ..utils import (
+    budget_batches,
+    get_cache_dir,
+    get_ctxai_home,
+    get_indexes_dir,
+    is_using_global_home,
+    length_sorted_batches,
+    prefetch,
+    submit_ahead,
+)
 from ..vector_store import VectorStore
 
 console = Console()
 
+# API providers bill per token and pad server-side, so batch order doesn't matter for them
+_PER_TOKEN_PROVIDERS = frozenset({"openai"})
+_REMOTE_PROVIDERS = _PER_TOKEN_PROVIDERS | {"huggingface"}
+
+# Chunks stored per vector store write; fewer, larger writes mean fewer transactions
+_STORE_BATCH_SIZE = 1000
+
+# Seconds between progress description updates in per-file loops
+_PROGRESS_UPDATE_INTERVAL = 0.1
+
+
+def _chunk_length(chunk: CodeChunk) -> int:
+    return len(chunk.content)
+
+
+def _index_settings(embedding_config: EmbeddingConfig, index_config: IndexConfig) -> dict:
+    """Settings that change stored chunks or vectors; the index is rebuilt when any of them changes."""
+    return {
+        "provider": embedding_config.provider,
+        "model": embedding_config.model,
+        "chunk_size": index_config.chunk_size,
+        "chunk_overlap": index_config.chunk_overlap,
+        # Fixed when the ChromaDB collection is created
+        "hnsw_m": index_config.hnsw_m,
+        "hnsw_ef_construction": index_config.hnsw_ef_construction,
+    }
+
 
 def index_codebase(
     path: Path,
@@ -90,6 +133,8 @@ def index_codebase(
             max_chunk_size=index_config.chunk_size,
             overlap=index_config.chunk_overlap,
         )
+        # Skip re-parsing files that are unchanged since the last run
+        chunk_cache = ChunkCache(get_cache_dir(path) / "chunks.db") if index_config.chunk_cache else None
 
         # Initialize embedding provider
         try:
@@ -113,10 +158,23 @@ def index_codebase(
                 )
             return
 
+        provider = embeddings_generator
+
+        # Serve unchanged chunks from the persistent embedding cache
+        if embedding_config.cache:
+            embedding_cache = EmbeddingCache(
+                get_cache_dir(path) / "embeddings.db", storage_dtype=embedding_config.storage_dtype
+            )
+            embeddings_generator = CachedEmbeddingProvider(embeddings_generator, embedding_cache)
+
         # Storage path in .ctxai directory (respects CTXAI_HOME)
         indexes_dir = get_indexes_dir(path)
         storage_path = indexes_dir / index_name
-        vector_store = VectorStore(storage_path=storage_path, collection_name=index_name)
+        vector_store = VectorStore(
+            storage_path=storage_path,
+            collection_name=index_name,
+            index_config=index_config,
+        )
 
         # Phase 1: Traverse and collect files
         console.print("[bold cyan]Phase 1: Traversing codebase[/bold cyan]")
@@ -128,9 +186,15 @@ def index_codebase(
             console=console,
         ) as progress:
             task = progress.add_task("Scanning files...", total=None)
-            for file_path in traversal.traverse():
+            last_update = 0.0
+            for file_path in traversal.traverse_parallel():
                 files_to_process.append(file_path)
-                progress.update(task, description=f"Found {len(files_to_process)} files...")
+                # The display refreshes at 10 Hz, so updating the task for every file only costs time
+                now = time.monotonic()
+                if now - last_update >= _PROGRESS_UPDATE_INTERVAL:
+                    last_update = now
+                    progress.update(task, description=f"Found {len(files_to_process)} files...")
+            progress.update(task, description=f"Found {len(files_to_process)} files...")
 
         console.print(f"[green]✓[/green] Found {len(files_to_process)} files to process\n")
 
@@ -168,79 +232,163 @@ def index_codebase(
             files_to_process = [f for f in files_to_process if f not in oversized_set]
             console.print(f"[yellow]⚠[/yellow] Skipped {len(oversized_set)} oversized file(s)\n")
 
-        # Phase 2: Chunk files
-        console.print("[bold cyan]Phase 2: Chunking code[/bold cyan]")
+        # Only new and modified files are indexed again; chunks of changed and removed files are dropped
+        settings = _index_settings(embedding_config, index_config)
+        manifest = IndexManifest.load(storage_path)
+        if manifest is None or manifest.settings != settings:
+            if vector_store.count():
+                console.print("[dim]Index settings changed or it has no manifest yet, rebuilding it[/dim]")
+            # Recreating the collection also applies the current distance metric and HNSW parameters
+            vector_store.clear()
+            manifest = IndexManifest(settings)
+        current_files = IndexManifest.stat_files(files_to_process)
+        changed, removed = manifest.diff(current_files)
+        vector_store.delete_files(changed + removed)
+        # Mark the dropped files right away, so a run that fails from here on re-indexes them next time,
+        # or deletes the chunks it already stored for them if they are gone by then
+        if changed or removed:
+            for file in changed + removed:
+                manifest.files[file] = IndexManifest.UNFINISHED
+            manifest.save(storage_path)
+        changed_set = set(changed)
+        files_to_index = [f for f in files_to_process if str(f) in changed_set]
+        console.print(
+            f"[green]✓[/green] {len(files_to_index)} new or changed, {len(removed)} removed, "
+            f"{len(files_to_process) - len(files_to_index)} unchanged file(s)\n"
+        )
 
-        all_chunks = []
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Chunking files...", total=len(files_to_process))
-
-            for file_path in files_to_process:
-                try:
-                    chunks = chunker.chunk_file(file_path)
-                    all_chunks.extend(chunks)
-                    progress.update(
-                        task,
-                        advance=1,
-                        description=f"Chunking files... ({len(all_chunks)} chunks so far)",
-                    )
-                except Exception as e:
-                    console.print(f"[red]✗[/red] Error chunking {file_path}: {e}")
-
-        console.print(f"[green]✓[/green] Created {len(all_chunks)} code chunks\n")
-
-        if not all_chunks:
-            console.print("[yellow]⚠[/yellow] No chunks created. Nothing to index.\n")
-            return
+        # Phase 2: Stream chunks through embedding into the vector store, one batch at a time
+        console.print("[bold cyan]Phase 2: Chunking, embedding and storing[/bold cyan]")
+
+        # Load each grammar once before the first file of that language is parsed
+        chunker.warmup(CodeChunker.LANGUAGE_MAP.get(f.suffix.lower()) for f in files_to_index)
+
+        # Files that failed to chunk, embed or store are recorded as unfinished, so the next run retries them
+        failed_files: set[str] = set()
+
+        def iter_chunks():
+            # Files are parsed in parallel worker processes; results arrive in order
+            for file_path, chunks, error in chunker.chunk_files(
+                files_to_index, max_workers=index_config.chunk_workers or None, cache=chunk_cache
+            ):
+                if error:
+                    console.print(f"[red]✗[/red] Error chunking {file_path}: {error}")
+                    failed_files.add(str(file_path))
+                yield from chunks
+                progress.update(chunking_task, advance=1)
+
+        # API round trips dominate remote embedding, so several requests are kept in flight
+        concurrency = 1
+        if embedding_config.provider in _REMOTE_PROVIDERS:
+            concurrency = max(1, embedding_config.max_concurrent_requests)
+
+        def embed(batch: list[CodeChunk]) -> np.ndarray:
+            # Boilerplate repeats across files; each distinct text is embedded once
+            # (length-sorted batching places identical chunks in the same batch)
+            positions: dict[str, int] = {}
+            rows = [positions.setdefault(chunk.content, len(positions)) for chunk in batch]
+            embeddings = embeddings_generator.generate_embeddings_array(list(positions))
+            return embeddings if len(positions) == len(batch) else embeddings[rows]
+
+        chunks_count = 0
+        with (
+            Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TaskProgressColumn(),
+                console=console,
+            ) as progress,
+            # Local models encode on every GPU when there are several
+            provider.multi_gpu() if files_to_index and isinstance(provider, LocalEmbeddingProvider) else nullcontext(),
+            ThreadPoolExecutor(max_workers=concurrency) as embedder,
+            ThreadPoolExecutor(max_workers=1) as writer,
+            # Chunking runs ahead in a background thread while a batch is embedded
+            closing(prefetch(iter_chunks(), max_items=embedding_config.batch_size * 4)) as chunk_stream,
+        ):
+            chunking_task = progress.add_task("Chunking files...", total=len(files_to_index))
+            embedding_task = progress.add_task("Embedding chunks...", total=None)
+
+            # Batches are capped by chunk count and total characters, so long chunks don't overflow requests
+            if embedding_config.provider in _PER_TOKEN_PROVIDERS:
+                batches = budget_batches(
+                    chunk_stream, embedding_config.batch_size, embedding_config.max_batch_chars, _chunk_length
+                )
+            else:
+                # Similar-length batches need less padding on local models
+                batches = length_sorted_batches(
+                    chunk_stream,
+                    embedding_config.batch_size,
+                    key=_chunk_length,
+                    max_length=embedding_config.max_batch_chars,
+                )
 
-        # Phase 3: Generate embeddings
-        console.print("[bold cyan]Phase 3: Generating embeddings[/bold cyan]")
+            # A single writer thread stores earlier batches while later ones are being embedded.
+            # Embedded batches are grouped into larger writes, since every write is a separate
+            # database transaction.
+            pending_write = None
+            unwritten_chunks: list[CodeChunk] = []
+            unwritten_embeddings: list[np.ndarray] = []
+            # Chunk IDs continue after the ones still stored from earlier runs
+            written_count = manifest.next_chunk_index
+
+            def wait_for_write():
+                if pending_write is not None:
+                    failed_files.update(str(chunk.file_path) for chunk in pending_write.result())
+
+            def write_unwritten():
+                nonlocal pending_write, written_count
+                wait_for_write()
+                # Reserve the IDs before they are written, so a run that fails midway never reuses them
+                # (ChromaDB keeps the existing chunk when an ID is added again)
+                manifest.next_chunk_index = written_count + len(unwritten_chunks)
+                manifest.save(storage_path)
+                pending_write = writer.submit(
+                    vector_store.add_chunks,
+                    unwritten_chunks.copy(),
+                    np.concatenate(unwritten_embeddings),
+                    batch_size=_STORE_BATCH_SIZE,
+                    start_index=written_count,
+                )
+                written_count += len(unwritten_chunks)
+                unwritten_chunks.clear()
+                unwritten_embeddings.clear()
 
-        chunk_texts = [chunk.content for chunk in all_chunks]
+            for batch, future in submit_ahead(embedder, embed, batches, max_pending=concurrency):
+                # Errors propagate, so the run is marked failed instead of leaving a partial index
+                batch_embeddings = future.result()
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Generating embeddings...", total=len(chunk_texts))
+                # Providers return zero vectors for batches they failed to embed
+                for row in np.flatnonzero(~batch_embeddings.any(axis=1)):
+                    failed_files.add(str(batch[row].file_path))
 
-            # Process in batches to show progress
-            batch_size = 100
-            all_embeddings = []
+                unwritten_chunks.extend(batch)
+                unwritten_embeddings.append(batch_embeddings)
+                if len(unwritten_chunks) >= _STORE_BATCH_SIZE:
+                    write_unwritten()
 
-            for i in range(0, len(chunk_texts), batch_size):
-                batch = chunk_texts[i : i + batch_size]
-                try:
-                    batch_embeddings = embeddings_generator.generate_embeddings(batch)
-                    all_embeddings.extend(batch_embeddings)
-                    progress.update(task, advance=len(batch))
-                except Exception as e:
-                    console.print(f"[red]✗[/red] Error generating embeddings: {e}")
-                    return
+                chunks_count += len(batch)
+                progress.update(embedding_task, description=f"Embedding chunks... ({chunks_count} so far)")
 
-        console.print(f"[green]✓[/green] Generated {len(all_embeddings)} embeddings\n")
+            if unwritten_chunks:
+                write_unwritten()
+            wait_for_write()
 
-        # Phase 4: Store in vector database
-        console.print("[bold cyan]Phase 4: Storing in vector database[/bold cyan]")
+        if not vector_store.count():
+            console.print("[yellow]⚠[/yellow] No chunks created. Nothing to index.\n")
+            return
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Storing embeddings...", total=None)
-            vector_store.add_chunks(all_chunks, all_embeddings)
+        manifest.files = {
+            file: IndexManifest.UNFINISHED if file in failed_files else stat for file, stat in current_files.items()
+        }
+        if failed_files:
+            console.print(f"[yellow]⚠[/yellow] {len(failed_files)} file(s) failed and will be retried on the next run")
+        manifest.save(storage_path)
 
-        console.print("[green]✓[/green] Stored embeddings in vector database\n")
+        console.print(f"[green]✓[/green] Embedded and stored {chunks_count} code chunks")
+        if isinstance(embeddings_generator, CachedEmbeddingProvider):
+            console.print(f"[dim]Reused {embeddings_generator.hits} cached embeddings[/dim]")
+        console.print()
 
         # Print summary
         vector_stats = vector_store.get_stats()
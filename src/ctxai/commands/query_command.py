@@ -3,6 +3,7 @@ Query command implementation.
 Search indexed codebase using natural language queries.
 """
 
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -12,12 +13,27 @@ from rich.syntax import Syntax
 from rich.table import Table
 
 from ..config import ConfigManager
+from ..embed_daemon import request_embeddings
+from ..embedding_cache import EmbeddingCache
 from ..embeddings import EmbeddingsFactory
-from ..utils import get_indexes_dir
+from ..utils import get_cache_dir, get_embed_socket_path, get_indexes_dir
 from ..vector_store import VectorStore
 
 console = Console()
 
+# Chunk languages mapped to the lexer used for syntax highlighting
+_LANGUAGE_MAP = {
+    "python": "python",
+    "javascript": "javascript",
+    "typescript": "typescript",
+    "java": "java",
+    "cpp": "cpp",
+    "c": "c",
+    "go": "go",
+    "rust": "rust",
+    "ruby": "ruby",
+}
+
 
 def query_codebase(
     index_name: str | None,
@@ -25,6 +41,8 @@ def query_codebase(
     project_path: Path | None = None,
     n_results: int = 5,
     show_content: bool = True,
+    language: str | None = None,
+    chunk_type: str | None = None,
 ):
     """
     Query an indexed codebase using natural language.
@@ -35,6 +53,8 @@ def query_codebase(
         project_path: Optional project path (uses CTXAI_HOME if not provided)
         n_results: Number of results to return
         show_content: Whether to show full code content
+        language: Only search chunks in this language
+        chunk_type: Only search chunks of this type
     """
     # Load configuration
     config_manager = ConfigManager(project_path)
@@ -55,12 +75,8 @@ def query_codebase(
     console.print(f"[dim]Query: {query}[/dim]\n")
 
     try:
-        # Create embedding provider
         console.print(f"[dim]Using embedding provider: {config.embedding.provider}[/dim]")
 
-        # Initialize embedding provider
-        embeddings_generator = EmbeddingsFactory.create(config.embedding)
-
         # Load vector store
         indexes_dir = get_indexes_dir(project_path)
         storage_path = indexes_dir / index_name
@@ -70,17 +86,47 @@ def query_codebase(
             console.print("[yellow]Tip:[/yellow] Run [cyan]ctxai index[/cyan] first to create an index\n")
             return
 
-        vector_store = VectorStore(storage_path=storage_path, collection_name=index_name)
+        vector_store = VectorStore(
+            storage_path=storage_path,
+            collection_name=index_name,
+            index_config=config.indexing,
+        )
 
         # Generate query embedding
         console.print("[cyan]Generating query embedding...[/cyan]")
-        query_embedding = embeddings_generator.generate_embedding(query)
+
+        # Repeated queries are served from the persistent embedding cache
+        embedding_cache = cache_key = query_embedding = None
+        if config.embedding.cache:
+            embedding_cache = EmbeddingCache(
+                get_cache_dir(project_path) / "embeddings.db", storage_dtype=config.embedding.storage_dtype
+            )
+            cache_key = EmbeddingCache.make_key(EmbeddingCache.namespace_for(config.embedding), query)
+            query_embedding = embedding_cache.get_many([cache_key]).get(cache_key)
+
+        if query_embedding is not None:
+            console.print("[dim]Using cached query embedding[/dim]")
+        else:
+            # Prefer a warm embedding daemon (ctxai server --mode embed) over loading the model
+            daemon_embeddings = request_embeddings(config.embedding, [query], get_embed_socket_path(project_path))
+            if daemon_embeddings is not None:
+                console.print("[dim]Using running embedding daemon[/dim]")
+                query_embedding = daemon_embeddings[0]
+            else:
+                embeddings_generator = EmbeddingsFactory.create(config.embedding)
+                query_embedding = embeddings_generator.generate_embedding(query)
+            if embedding_cache is not None and any(query_embedding):
+                embedding_cache.put_many({cache_key: query_embedding})
+
+        if embedding_cache is not None:
+            embedding_cache.close()
 
         # Search
         console.print("[cyan]Searching vector database...[/cyan]\n")
         results = vector_store.search(
             query_embedding=query_embedding,
             n_results=n_results,
+            filter_dict=VectorStore.build_filter(language=language, chunk_type=chunk_type),
         )
 
         if not results:
@@ -99,15 +145,15 @@ def query_codebase(
             similarity = max(0, 1 - distance)
 
             # Create header
-            file_path = Path(metadata["file_path"])
-            header = f"Result {i}: {file_path.name}"
+            file_path = metadata["file_path"]
+            header = f"Result {i}: {os.path.basename(file_path)}"
 
             # Create info table
             info_table = Table(show_header=False, box=None, padding=(0, 1))
             info_table.add_column("Key", style="cyan")
             info_table.add_column("Value", style="white")
 
-            info_table.add_row("📁 File", str(file_path))
+            info_table.add_row("📁 File", file_path)
             info_table.add_row("📍 Lines", f"{metadata['start_line']}-{metadata['end_line']}")
             info_table.add_row("🏷️  Type", metadata["chunk_type"])
             info_table.add_row("💻 Language", metadata["language"])
@@ -125,19 +171,7 @@ def query_codebase(
             if show_content:
                 # Try to detect language for syntax highlighting
                 language = metadata.get("language", "python")
-                language_map = {
-                    "python": "python",
-                    "javascript": "javascript",
-                    "typescript": "typescript",
-                    "java": "java",
-                    "cpp": "cpp",
-                    "c": "c",
-                    "go": "go",
-                    "rust": "rust",
-                    "ruby": "ruby",
-                }
-
-                syntax_lang = language_map.get(language, "text")
+                syntax_lang = _LANGUAGE_MAP.get(language, "text")
 
                 # Limit content length for display
                 display_content = content
@@ -149,7 +183,7 @@ def query_codebase(
                     syntax_lang,
                     theme="monokai",
                     line_numbers=True,
-                    start_line=int(metadata["start_line"]),
+                    start_line=metadata["start_line"],
                 )
                 console.print(syntax)
 
@@ -6,7 +6,12 @@ and AI agents through the Model Context Protocol.
 """
 
 import asyncio
+import contextlib
 import logging
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Any, Optional
 
@@ -20,9 +25,11 @@ except ImportError:
 from rich.console import Console
 
 from ..config import ConfigManager
-from ..embeddings import EmbeddingsFactory
-from ..utils import get_indexes_dir
-from ..vector_store import VectorStore
+from ..embed_daemon import UNIX_SOCKETS_AVAILABLE, serve_embeddings
+from ..embedding_batcher import EmbeddingBatcherPool
+from ..query_cache import QueryCache
+from ..utils import dir_size, get_cache_dir, get_embed_socket_path, get_indexes_dir
+from ..vector_store import VectorStore, VectorStorePool
 from .index_command import index_codebase as run_index
 
 # Setup logging to stderr (not stdout for STDIO servers)
@@ -36,6 +43,17 @@ logger = logging.getLogger(__name__)
 console = Console(stderr=True)  # Use stderr to avoid corrupting STDIO communication
 
 
+def _index_in_worker(*args):
+    """Run an index build in the indexing process, keeping its progress output off the MCP stdout channel."""
+    with contextlib.redirect_stdout(sys.stderr):
+        run_index(*args)
+
+
+def _create_index_executor() -> ProcessPoolExecutor:
+    """Single-process pool for index builds; spawn avoids forking the server's threads."""
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+
 def create_server(project_path: Path | None = None) -> "FastMCP":
     """
     Create and configure the MCP server using FastMCP.
@@ -52,6 +70,16 @@ def create_server(project_path: Path | None = None) -> "FastMCP":
     # Initialize FastMCP server
     mcp = FastMCP("ctxai")
 
+    # Providers stay loaded between queries; concurrent queries share one forward pass
+    batchers = EmbeddingBatcherPool(get_cache_dir(project_path) / "embeddings.db")
+    # Agents often repeat queries; these skip the batching window and the disk cache
+    query_cache = QueryCache()
+    # Opening a ChromaDB index is slow; stores stay open until their index changes
+    stores = VectorStorePool()
+    # Index builds are CPU-heavy Python; a separate process keeps them from holding the GIL
+    # while queries are served. The process starts on the first index_codebase call.
+    index_executor = _create_index_executor()
+
     @mcp.tool()
     async def list_indexes() -> str:
         """
@@ -67,33 +95,35 @@ def create_server(project_path: Path | None = None) -> "FastMCP":
             if not indexes_dir.exists():
                 return "No indexes found. Create one using the index_codebase tool."
 
+            def stat_index(index_path: Path) -> dict:
+                vector_store = stores.get(index_path)
+                return {"name": index_path.name, "chunks": vector_store.count(), "path": str(index_path)}
+
+            # Opening an index touches disk; indexes are opened concurrently in worker
+            # threads and the event loop stays free for other requests
+            index_paths = await asyncio.to_thread(
+                lambda: sorted(path for path in indexes_dir.iterdir() if path.is_dir())
+            )
+            stats = await asyncio.gather(
+                *(asyncio.to_thread(stat_index, index_path) for index_path in index_paths), return_exceptions=True
+            )
+
             indexes = []
-            for index_path in indexes_dir.iterdir():
-                if index_path.is_dir():
-                    try:
-                        vector_store = VectorStore(storage_path=index_path, collection_name=index_path.name)
-                        stats = vector_store.get_stats()
-
-                        indexes.append(
-                            {
-                                "name": index_path.name,
-                                "chunks": stats["total_chunks"],
-                                "path": str(index_path),
-                            }
-                        )
-                    except Exception as e:
-                        logger.warning(f"Could not load index {index_path.name}: {e}")
+            for index_path, stat in zip(index_paths, stats):
+                if isinstance(stat, Exception):
+                    logger.warning(f"Could not load index {index_path.name}: {stat}")
+                else:
+                    indexes.append(stat)
 
             if not indexes:
                 return "No valid indexes found."
 
-            result = "Available indexes:\n\n"
+            parts = ["Available indexes:\n\n"]
             for idx in indexes:
-                result += f"- **{idx['name']}**: {idx['chunks']:,} chunks\n"
-                result += f"  Path: {idx['path']}\n\n"
+                parts.append(f"- **{idx['name']}**: {idx['chunks']:,} chunks\n  Path: {idx['path']}\n\n")
 
             logger.info(f"Found {len(indexes)} indexes")
-            return result
+            return "".join(parts)
 
         except Exception as e:
             error_msg = f"Error listing indexes: {e}"
@@ -121,6 +151,7 @@ def create_server(project_path: Path | None = None) -> "FastMCP":
         Returns:
             Success message with index statistics
         """
+        nonlocal index_executor
         try:
             logger.info(f"Indexing codebase: path={path}, name={name}")
             path_obj = Path(path)
@@ -131,29 +162,35 @@ def create_server(project_path: Path | None = None) -> "FastMCP":
             if not path_obj.is_dir():
                 return f"Error: Path is not a directory: {path}"
 
-            # Run indexing in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                run_index,
-                path_obj,
-                name,
-                include_patterns,
-                exclude_patterns,
-                follow_gitignore,
-            )
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(
+                    index_executor,
+                    _index_in_worker,
+                    path_obj,
+                    name,
+                    include_patterns,
+                    exclude_patterns,
+                    follow_gitignore,
+                )
+            except BrokenProcessPool:
+                # The indexing process died (e.g. out of memory); start a fresh one next time
+                index_executor = _create_index_executor()
+                raise
 
             # Get stats after indexing
             indexes_dir = get_indexes_dir(project_path)
             index_path = indexes_dir / name
-            vector_store = VectorStore(storage_path=index_path, collection_name=name)
-            stats = vector_store.get_stats()
+            if not index_path.exists():
+                return f"Error: Indexing '{name}' did not create an index. See the server log for details."
+            vector_store = await asyncio.to_thread(stores.get, index_path)
+            total_chunks = vector_store.count()
 
             result = f"✓ Successfully indexed codebase '{name}'\n\n"
-            result += f"- Total chunks: {stats['total_chunks']:,}\n"
+            result += f"- Total chunks: {total_chunks:,}\n"
             result += f"- Location: {index_path}\n"
 
-            logger.info(f"Indexing complete: {stats['total_chunks']} chunks")
+            logger.info(f"Indexing complete: {total_chunks} chunks")
             return result
 
         except Exception as e:
@@ -162,7 +199,13 @@ def create_server(project_path: Path | None = None) -> "FastMCP":
             return error_msg
 
     @mcp.tool()
-    async def query_codebase(index_name: str, query: str, n_results: int = 5) -> str:
+    async def query_codebase(
+        index_name: str,
+        query: str,
+        n_results: int = 5,
+        language: str | None = None,
+        chunk_type: str | None = None,
+    ) -> str:
         """
         Query an indexed codebase using natural language. Returns relevant code chunks with metadata.
 
@@ -170,6 +213,8 @@ def create_server(project_path: Path | None = None) -> "FastMCP":
             index_name: Name of the index to query
             query: Natural language query to search the codebase
             n_results: Number of results to return (default: 5, max: 20)
+            language: Only search chunks in this language (e.g., 'python')
+            chunk_type: Only search chunks of this type (e.g., 'function_definition')
 
         Returns:
             Formatted results with code chunks, similarity scores, and metadata
@@ -184,9 +229,6 @@ def create_server(project_path: Path | None = None) -> "FastMCP":
             config_manager = ConfigManager(project_path)
             config = config_manager.load()
 
-            # Initialize embedding provider
-            embeddings_generator = EmbeddingsFactory.create(config.embedding)
-
             # Load vector store
             indexes_dir = get_indexes_dir(project_path)
             index_path = indexes_dir / index_name
@@ -194,48 +236,50 @@ def create_server(project_path: Path | None = None) -> "FastMCP":
             if not index_path.exists():
                 return f"Error: Index '{index_name}' not found. Use list_indexes to see available indexes."
 
-            vector_store = VectorStore(storage_path=index_path, collection_name=index_name)
+            # Opening the index, loading the model and searching block, so they run in worker threads
+            vector_store = await asyncio.to_thread(stores.get, index_path, config.indexing)
 
             # Generate query embedding
-            loop = asyncio.get_event_loop()
-            query_embedding = await loop.run_in_executor(None, embeddings_generator.generate_embedding, query)
+            model_key = (config.embedding.provider, config.embedding.model)
+            query_embedding = query_cache.get_embedding(model_key, query)
+            if query_embedding is None:
+                batcher = await asyncio.to_thread(batchers.get, config.embedding)
+                query_embedding = await batcher.embed(query)
+                query_cache.put_embedding(model_key, query, query_embedding)
 
             # Search
-            results = vector_store.search(
+            results = await asyncio.to_thread(
+                vector_store.search,
                 query_embedding=query_embedding,
                 n_results=n_results,
+                filter_dict=VectorStore.build_filter(language=language, chunk_type=chunk_type),
             )
 
             if not results:
                 return f"No results found for query: {query}"
 
-            # Format results
-            result_text = f'Found {len(results)} result(s) for: "{query}"\n\n'
+            # Format results; parts are joined once instead of growing one string
+            parts = [f'Found {len(results)} result(s) for: "{query}"\n\n']
 
             for i, result in enumerate(results, 1):
                 metadata = result["metadata"]
                 content = result["content"]
-                distance = result["distance"]
-                similarity = max(0, 1 - distance)
-
-                file_path = Path(metadata["file_path"])
-
-                result_text += f"## Result {i} (Similarity: {similarity:.1%})\n\n"
-                result_text += f"**File:** {file_path}\n"
-                result_text += f"**Lines:** {metadata['start_line']}-{metadata['end_line']}\n"
-                result_text += f"**Type:** {metadata['chunk_type']} ({metadata['language']})\n\n"
-                result_text += "**Code:**\n```" + metadata.get("language", "text") + "\n"
+                similarity = max(0, 1 - result["distance"])
 
                 # Limit content length
                 if len(content) > 500:
-                    result_text += content[:500] + "\n... (truncated)\n"
-                else:
-                    result_text += content + "\n"
+                    content = content[:500] + "\n... (truncated)"
 
-                result_text += "```\n\n"
+                parts.append(
+                    f"## Result {i} (Similarity: {similarity:.1%})\n\n"
+                    f"**File:** {metadata['file_path']}\n"
+                    f"**Lines:** {metadata['start_line']}-{metadata['end_line']}\n"
+                    f"**Type:** {metadata['chunk_type']} ({metadata['language']})\n\n"
+                    f"**Code:**\n```{metadata.get('language', 'text')}\n{content}\n```\n\n"
+                )
 
             logger.info(f"Query returned {len(results)} results")
-            return result_text
+            return "".join(parts)
 
         except Exception as e:
             error_msg = f"Error querying codebase: {e}"
@@ -262,14 +306,16 @@ def create_server(project_path: Path | None = None) -> "FastMCP":
             if not index_path.exists():
                 return f"Error: Index '{index_name}' not found."
 
-            vector_store = VectorStore(storage_path=index_path, collection_name=index_name)
-            stats = vector_store.get_stats()
+            def read_stats() -> tuple[int, int]:
+                return stores.get(index_path).count(), dir_size(index_path)
+
+            total_chunks, size = await asyncio.to_thread(read_stats)
 
             # Get additional info
-            size_mb = sum(f.stat().st_size for f in index_path.rglob("*") if f.is_file()) / (1024 * 1024)
+            size_mb = size / (1024 * 1024)
 
             result = f"## Index: {index_name}\n\n"
-            result += f"- **Total chunks:** {stats['total_chunks']:,}\n"
+            result += f"- **Total chunks:** {total_chunks:,}\n"
             result += f"- **Storage size:** {size_mb:.2f} MB\n"
             result += f"- **Location:** {index_path}\n"
 
@@ -312,3 +358,34 @@ def start_mcp_server(project_path: Path | None = None):
         error_msg = f"Failed to start MCP server: {e}"
         logger.error(error_msg, exc_info=True)
         console.print(f"[red]✗ {error_msg}[/red]\n")
+
+
+def start_embed_daemon(project_path: Path | None = None):
+    """
+    Start the embedding daemon.
+
+    Keeps the configured embedding model loaded and serves embeddings over a
+    Unix socket in the .ctxai directory. `ctxai query` uses it when running.
+
+    Args:
+        project_path: Optional project path for configuration
+    """
+    if not UNIX_SOCKETS_AVAILABLE:
+        console.print("[red]✗ The embedding daemon requires Unix domain socket support[/red]\n")
+        return
+
+    config = ConfigManager(project_path).load()
+    socket_path = get_embed_socket_path(project_path)
+
+    console.print("[bold blue]🚀 Starting embedding daemon...[/bold blue]\n")
+    console.print(f"[dim]Provider: {config.embedding.provider} ({config.embedding.model or 'default model'})[/dim]")
+    console.print(f"[dim]Socket: {socket_path}[/dim]\n")
+
+    try:
+        serve_embeddings(config.embedding, socket_path)
+    except KeyboardInterrupt:
+        console.print("\n[dim]Embedding daemon stopped[/dim]")
+    except Exception as e:
+        error_msg = f"Failed to start embedding daemon: {e}"
+        logger.error(error_msg, exc_info=True)
+        console.print(f"[red]✗ {error_msg}[/red]\n")
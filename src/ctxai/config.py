@@ -5,14 +5,33 @@ Respects CTXAI_HOME environment variable for custom .ctxai location.
 """
 
 import json
-from dataclasses import asdict, dataclass
+import os
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
 from .utils import get_config_path, get_ctxai_home
 
+try:
+    import orjson
 
-@dataclass
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Encodings supported for cached embedding vectors (see quantization.py)
+STORAGE_DTYPES = ("float32", "float16", "int8")
+
+# Search backends for the vector store (see vector_store.py)
+INDEX_TYPES = ("hnsw", "flat", "ivfpq", "hnsw_pq")
+
+# Precisions for the memory-mapped embedding matrix used by flat, ivfpq and hnsw_pq search
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+
+@dataclass(slots=True)
 class EmbeddingConfig:
     """Configuration for embedding generation."""
 
@@ -20,10 +39,14 @@ class EmbeddingConfig:
     model: str | None = None  # Model name, provider-specific default if None
     api_key: str | None = None  # API key for cloud providers
     batch_size: int = 100
+    max_batch_chars: int = 150_000  # Character budget per embedding batch (long chunks get smaller batches)
+    max_concurrent_requests: int = 8  # Embedding requests in flight at once for API providers
     max_tokens: int | None = None
+    cache: bool = True  # Reuse embeddings of unchanged chunks across runs
+    storage_dtype: str = "float16"  # Cache vector encoding: "float32", "float16", "int8"
 
 
-@dataclass
+@dataclass(slots=True)
 class IndexConfig:
     """Configuration for indexing behavior."""
 
@@ -32,9 +55,22 @@ class IndexConfig:
     max_file_size_mb: int = 5  # Maximum individual file size in MB
     chunk_size: int = 1000  # Maximum characters per chunk
     chunk_overlap: int = 100  # Overlap between chunks
+    chunk_workers: int = 0  # Processes used for parsing files (0 = one per CPU)
+    chunk_cache: bool = True  # Reuse chunks of unchanged files across runs
+    hnsw_m: int = 16  # HNSW graph connectivity (neighbors per node)
+    hnsw_ef_construction: int = 100  # HNSW candidate list size while building
+    hnsw_ef_search: int = 100  # HNSW candidate list size while querying (recall vs latency)
+    index_type: str = "hnsw"  # Search backend: "hnsw", "flat" (exact scan), "ivfpq" or "hnsw_pq" (need faiss)
+    ivf_nprobe: int = 16  # IVF-PQ inverted lists visited per query (recall vs latency)
+    vector_dtype: str = "float32"  # Embedding matrix precision for faiss/flat search: "float32", "float16", "int8"
+
 
+# Field names of the config sections, in declaration order, for Config.to_dict
+_EMBEDDING_FIELDS = tuple(field.name for field in fields(EmbeddingConfig))
+_INDEX_FIELDS = tuple(field.name for field in fields(IndexConfig))
 
-@dataclass
+
+@dataclass(slots=True)
 class Config:
     """Main configuration for ctxai."""
 
@@ -60,10 +96,11 @@ class Config:
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
+        # Both sections hold only primitives, so a shallow copy replaces asdict's deep copy
         return {
             "version": self.version,
-            "embedding": asdict(self.embedding),
-            "indexing": asdict(self.indexing),
+            "embedding": {name: getattr(self.embedding, name) for name in _EMBEDDING_FIELDS},
+            "indexing": {name: getattr(self.indexing, name) for name in _INDEX_FIELDS},
             "index_name": self.index_name,
             "index_status": self.index_status,
             "index_files_count": self.index_files_count,
@@ -88,6 +125,24 @@ class Config:
         )
 
 
+@lru_cache(maxsize=16)
+def _read_config_file(path: Path, mtime_ns: int, size: int) -> dict[str, Any]:
+    """
+    Parse a config file, memoized on its modification time and size.
+
+    Callers must not mutate the returned dictionary; Config.from_dict copies it.
+    """
+    data = path.read_bytes()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _dump_config(data: dict[str, Any]) -> bytes:
+    """Serialize a config dictionary as indented JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
 class ConfigManager:
     """Manages configuration loading and saving."""
 
@@ -116,10 +171,15 @@ class ConfigManager:
         if self._config is not None:
             return self._config
 
-        if self.config_path.exists():
+        try:
+            stat = self.config_path.stat()
+        except OSError:
+            stat = None
+
+        if stat is not None:
             try:
-                with open(self.config_path, encoding="utf-8") as f:
-                    data = json.load(f)
+                # Repeated loads of an unchanged file within a process skip parsing
+                data = _read_config_file(self.config_path, stat.st_mtime_ns, stat.st_size)
                 self._config = Config.from_dict(data)
             except Exception as e:
                 print(f"Warning: Could not load config from {self.config_path}: {e}")
@@ -148,8 +208,13 @@ class ConfigManager:
         self.ctxai_home.mkdir(parents=True, exist_ok=True)
 
         try:
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(self._config.to_dict(), f, indent=2)
+            # Write a sibling file and rename it over the config, so concurrent readers
+            # (e.g. an MCP server while indexing) never parse a half-written file
+            temp_path = self.config_path.with_name(f"{self.config_path.name}.{os.getpid()}.tmp")
+            temp_path.write_bytes(_dump_config(self._config.to_dict()))
+            os.replace(temp_path, self.config_path)
+            # The rewrite may land within the filesystem's mtime resolution
+            _read_config_file.cache_clear()
         except Exception as e:
             print(f"Warning: Could not save config to {self.config_path}: {e}")
 
@@ -205,8 +270,6 @@ class ConfigManager:
             size_mb: Total size of indexed files in MB
             chunks_count: Total number of chunks created
         """
-        from datetime import datetime
-
         config = self.load()
         config.index_name = index_name
         config.index_status = status
@@ -218,7 +281,7 @@ class ConfigManager:
         if chunks_count is not None:
             config.index_chunks_count = chunks_count
 
-        config.index_last_updated = datetime.utcnow().isoformat() + "Z"
+        config.index_last_updated = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
         self.save(config)
 
@@ -0,0 +1,124 @@
+"""
+Embedding daemon module.
+Keeps an embedding model loaded and serves embeddings over a Unix domain socket,
+so repeated CLI queries skip model loading.
+"""
+
+import json
+import socket
+import socketserver
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .config import EmbeddingConfig
+from .embeddings import EmbeddingsFactory
+
+# Unix domain sockets are unavailable on some platforms (e.g. older Windows builds)
+UNIX_SOCKETS_AVAILABLE = hasattr(socket, "AF_UNIX") and hasattr(socketserver, "ThreadingUnixStreamServer")
+
+# Wire format of returned vectors: raw little-endian float32, row-major
+_WIRE_DTYPE = np.dtype("<f4")
+
+
+def _model_key(config: EmbeddingConfig) -> str:
+    """Identify the provider/model a daemon serves, so clients never get mismatched vectors."""
+    return f"{config.provider}:{config.model or 'default'}"
+
+
+class _EmbedRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles newline-delimited JSON embedding requests on one connection.
+
+    Each response is a JSON header line, {"shape": [n, dim]} or {"error": ...},
+    followed for successes by the n * dim vectors as raw _WIRE_DTYPE bytes.
+    Formatting floats as JSON text costs far more than the embedding lookup itself.
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            payload = b""
+            try:
+                request = json.loads(line)
+                if request.get("model") != self.server.model_key:
+                    header = {"error": f"daemon serves {self.server.model_key}"}
+                else:
+                    with self.server.lock:
+                        embeddings = self.server.provider.generate_embeddings_array(request["texts"])
+                    embeddings = np.ascontiguousarray(embeddings, dtype=_WIRE_DTYPE)
+                    header = {"shape": list(embeddings.shape)}
+                    payload = embeddings.tobytes()
+            except Exception as e:
+                header = {"error": str(e)}
+
+            self.wfile.write(json.dumps(header).encode() + b"\n" + payload)
+
+
+def serve_embeddings(config: EmbeddingConfig, socket_path: Path):
+    """
+    Load the embedding provider once and serve requests until interrupted.
+
+    Args:
+        config: Embedding configuration
+        socket_path: Path of the Unix socket to listen on
+    """
+    if not UNIX_SOCKETS_AVAILABLE:
+        raise OSError("Unix domain sockets are not supported on this platform")
+
+    provider = EmbeddingsFactory.create(config)
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+
+    with socketserver.ThreadingUnixStreamServer(str(socket_path), _EmbedRequestHandler) as server:
+        server.provider = provider
+        server.model_key = _model_key(config)
+        server.lock = threading.Lock()
+        socket_path.chmod(0o600)
+        try:
+            server.serve_forever()
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def request_embeddings(
+    config: EmbeddingConfig,
+    texts: list[str],
+    socket_path: Path,
+    timeout: float = 5.0,
+) -> np.ndarray | None:
+    """
+    Ask a running embedding daemon for embeddings.
+
+    Args:
+        config: Embedding configuration the caller would otherwise load
+        texts: Texts to embed
+        socket_path: Path of the daemon's Unix socket
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Float32 embedding matrix of shape (len(texts), dim), or None if no
+        compatible daemon is running
+    """
+    if not UNIX_SOCKETS_AVAILABLE or not socket_path.exists():
+        return None
+
+    request = {"model": _model_key(config), "texts": texts}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                header = json.loads(reader.readline())
+                if "shape" not in header:
+                    return None
+                rows, dim = header["shape"]
+                payload = reader.read(rows * dim * _WIRE_DTYPE.itemsize)
+    except (OSError, ValueError):
+        return None
+
+    if len(payload) != rows * dim * _WIRE_DTYPE.itemsize:
+        return None
+    return np.frombuffer(payload, dtype=_WIRE_DTYPE).reshape(rows, dim).astype(np.float32, copy=False)
@@ -0,0 +1,139 @@
+"""
+Query embedding micro-batching module.
+Coalesces concurrent single-text embedding requests into one provider call.
+"""
+
+import asyncio
+import threading
+from pathlib import Path
+
+from .config import EmbeddingConfig
+from .embedding_cache import CachedEmbeddingProvider, EmbeddingCache
+from .embeddings import BaseEmbeddingProvider, EmbeddingsFactory
+
+
+class EmbeddingBatcher:
+    """Collects texts from concurrent callers and embeds them in batches."""
+
+    def __init__(
+        self,
+        provider: BaseEmbeddingProvider,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        max_batch_chars: int | None = None,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            provider: Embedding provider used for each batch
+            max_batch_size: Maximum number of texts embedded in one call
+            max_wait_ms: How long the first text in a batch waits for others to join
+            max_batch_chars: Optional character budget per call, so a few long texts
+                are not padded into one oversized forward pass or API request
+        """
+        self.provider = provider
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_chars = max_batch_chars
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._overflow: tuple[str, asyncio.Future] | None = None
+
+    async def embed(self, text: str) -> list[float]:
+        """
+        Embed a single text, sharing a provider call with concurrent requests.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._overflow = None
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        """Worker loop: gather a batch, embed it off the event loop, scatter results."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._overflow is not None:
+                batch, self._overflow = [self._overflow], None
+            else:
+                batch = [await self._queue.get()]
+            chars = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                # A text that would exceed the budget starts the next batch
+                if self.max_batch_chars is not None and chars + len(item[0]) > self.max_batch_chars:
+                    self._overflow = item
+                    break
+                batch.append(item)
+                chars += len(item[0])
+
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = await loop.run_in_executor(None, self.provider.generate_embeddings, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
+class EmbeddingBatcherPool:
+    """Keeps one provider and batcher per embedding model for long-running servers."""
+
+    def __init__(self, cache_path: Path | None = None):
+        """
+        Initialize the pool.
+
+        Args:
+            cache_path: Optional embedding cache database; when given, providers with
+                caching enabled serve previously embedded queries from disk
+        """
+        self.cache_path = cache_path
+        self._batchers: dict[tuple, EmbeddingBatcher] = {}
+        # Servers may call get() from worker threads; load each provider only once
+        self._lock = threading.Lock()
+
+    def get(self, config: EmbeddingConfig) -> EmbeddingBatcher:
+        """
+        Get the batcher for an embedding configuration, loading the provider on first use.
+
+        Args:
+            config: Embedding configuration
+
+        Returns:
+            Shared EmbeddingBatcher for the configured provider and model
+        """
+        key = (config.provider, config.model, config.api_key)
+        with self._lock:
+            if key not in self._batchers:
+                provider = EmbeddingsFactory.create(config)
+                if self.cache_path is not None and config.cache:
+                    # Each batcher embeds from one worker thread, so it gets its own connection
+                    cache = EmbeddingCache(self.cache_path, storage_dtype=config.storage_dtype)
+                    provider = CachedEmbeddingProvider(provider, cache)
+                self._batchers[key] = EmbeddingBatcher(provider, max_batch_chars=config.max_batch_chars)
+            return self._batchers[key]
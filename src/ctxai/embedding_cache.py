@@ -0,0 +1,176 @@
+"""
+Persistent embedding cache module.
+Stores embeddings on disk keyed by content hash so unchanged chunks are not re-embedded.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .config import EmbeddingConfig
+from .embeddings import BaseEmbeddingProvider
+from .quantization import STORAGE_DTYPES, decode_vector, encode_vector
+from .utils import batched, content_hash
+
+# Stay well below SQLite's host parameter limit (999 on older builds)
+_SQLITE_MAX_PARAMS = 500
+
+
+class EmbeddingCache:
+    """Content-addressed embedding store backed by SQLite."""
+
+    def __init__(self, cache_path: Path, storage_dtype: str = "float16"):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            cache_path: Path to the SQLite database file
+            storage_dtype: Encoding for new vectors ("float32", "float16" or "int8")
+        """
+        if storage_dtype not in STORAGE_DTYPES:
+            raise ValueError(f"Unknown storage dtype: {storage_dtype}. Available: {', '.join(STORAGE_DTYPES)}")
+
+        self.cache_path = cache_path
+        self.storage_dtype = storage_dtype
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Indexing may embed several batches at once; the lock keeps their transactions apart
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(str(cache_path), check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, dtype TEXT NOT NULL DEFAULT 'float16')"
+        )
+        # Caches created before storage_dtype existed were always float16
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(embeddings)")}
+        if "dtype" not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE embeddings ADD COLUMN dtype TEXT NOT NULL DEFAULT 'float16'")
+
+    @staticmethod
+    def namespace_for(config: EmbeddingConfig) -> str:
+        """Provider/model identifier used to namespace cache keys."""
+        return f"{config.provider}:{config.model or 'default'}"
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        """
+        Build the cache key for a text.
+
+        See utils.content_hash; switching hash functions re-embeds each chunk once.
+
+        Args:
+            namespace: Provider/model identifier, so different models never share entries
+            text: Text that was embedded
+
+        Returns:
+            Hex digest identifying the (namespace, text) pair
+        """
+        return content_hash(f"{namespace}\0{text}".encode())
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """
+        Look up embeddings for the given keys.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Dictionary mapping found keys to embedding vectors
+        """
+        return {key: vector.tolist() for key, vector in self.get_many_arrays(keys).items()}
+
+    def get_many_arrays(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Look up embeddings for the given keys as float32 arrays (see get_many)."""
+        found = {}
+        for batch in batched(keys, _SQLITE_MAX_PARAMS):
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self.connection.execute(
+                    f"SELECT key, vector, dtype FROM embeddings WHERE key IN ({placeholders})",  # nosec B608
+                    batch,
+                ).fetchall()
+            for key, blob, dtype in rows:
+                found[key] = decode_vector(blob, dtype)
+        return found
+
+    def put_many(self, items: dict[str, list[float] | np.ndarray]) -> None:
+        """
+        Store embeddings in the cache.
+
+        Args:
+            items: Dictionary mapping cache keys to embedding vectors
+        """
+        rows = [(key, encode_vector(vector, self.storage_dtype), self.storage_dtype) for key, vector in items.items()]
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, dtype) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.connection.close()
+
+
+class CachedEmbeddingProvider(BaseEmbeddingProvider):
+    """Embedding provider wrapper that serves previously embedded texts from an EmbeddingCache."""
+
+    def __init__(self, provider: BaseEmbeddingProvider, cache: EmbeddingCache):
+        """
+        Initialize the cached provider.
+
+        Args:
+            provider: Provider used to embed texts missing from the cache
+            cache: Persistent embedding cache
+        """
+        super().__init__(provider.config)
+        self.provider = provider
+        self.cache = cache
+        self.namespace = EmbeddingCache.namespace_for(provider.config)
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings, embedding only texts that are not cached yet."""
+        return self.generate_embeddings_array(texts).tolist()
+
+    def generate_embeddings_array(self, texts: list[str]) -> np.ndarray:
+        """Generate a float32 embedding matrix, embedding only texts that are not cached yet."""
+        if not texts:
+            return np.empty((0, self.get_dimension()), dtype=np.float32)
+
+        keys = [EmbeddingCache.make_key(self.namespace, text) for text in texts]
+        cached = self.cache.get_many_arrays(list(set(keys)))
+
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        with self._stats_lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            # Repeated texts (license headers, boilerplate) are embedded once
+            first_missing = {}
+            for i in missing:
+                first_missing.setdefault(keys[i], i)
+            new_embeddings = self.provider.generate_embeddings_array([texts[i] for i in first_missing.values()])
+            fresh = {}
+            for key, embedding in zip(first_missing, new_embeddings):
+                cached[key] = embedding
+                # Providers return zero vectors for failed batches; never persist those
+                if embedding.any():
+                    fresh[key] = embedding
+            if fresh:
+                self.cache.put_many(fresh)
+
+        return np.stack([cached[key] for key in keys])
+
+    def get_dimension(self) -> int:
+        """Get embedding dimension."""
+        return self.provider.get_dimension()
@@ -9,10 +9,15 @@ Supported providers:
 - azure: Azure OpenAI
 """
 
+import math
 import os
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Optional
 
+import numpy as np
+
 from .config import EmbeddingConfig
 
 
@@ -55,6 +60,23 @@ class BaseEmbeddingProvider(ABC):
         embeddings = self.generate_embeddings([text])
         return embeddings[0] if embeddings else []
 
+    def generate_embeddings_array(self, texts: list[str]) -> np.ndarray:
+        """
+        Generate embeddings as a float32 matrix.
+
+        Packed rows take a quarter of the memory of nested float lists and
+        are passed to the vector store without another conversion.
+
+        Args:
+            texts: List of text strings to embed
+
+        Returns:
+            float32 array of shape (len(texts), dimension)
+        """
+        if not texts:
+            return np.empty((0, self.get_dimension()), dtype=np.float32)
+        return np.asarray(self.generate_embeddings(texts), dtype=np.float32)
+
     @abstractmethod
     def get_dimension(self) -> int:
         """Get the dimension of embeddings produced by this provider."""
@@ -64,6 +86,10 @@ class BaseEmbeddingProvider(ABC):
 class LocalEmbeddingProvider(BaseEmbeddingProvider):
     """Local embeddings using sentence-transformers (default)."""
 
+    # Multi-process pool and its number of devices while multi_gpu() is active
+    _pool: dict | None = None
+    _pool_size = 0
+
     def __init__(self, config: EmbeddingConfig):
         """Initialize local embedding provider."""
         super().__init__(config)
@@ -84,25 +110,71 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
 
     def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings using local model."""
+        return self.generate_embeddings_array(texts).tolist()
+
+    def generate_embeddings_array(self, texts: list[str]) -> np.ndarray:
+        """Generate embeddings using local model, keeping the model's float32 output."""
         if not texts:
-            return []
+            return np.empty((0, self._dimension), dtype=np.float32)
 
         try:
-            embeddings = self.model.encode(
-                texts,
-                batch_size=self.batch_size,
-                show_progress_bar=False,
-                convert_to_numpy=True,
-            )
-            return embeddings.tolist()
+            if self._pool is not None:
+                # One slice of the batch per GPU
+                embeddings = self.model.encode_multi_process(
+                    texts,
+                    self._pool,
+                    batch_size=self.batch_size,
+                    chunk_size=math.ceil(len(texts) / self._pool_size),
+                    normalize_embeddings=True,
+                )
+            else:
+                embeddings = self.model.encode(
+                    texts,
+                    batch_size=self.batch_size,
+                    show_progress_bar=False,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                )
+            return np.asarray(embeddings, dtype=np.float32)
         except Exception as e:
+            # Halve batches that don't fit in (GPU) memory instead of giving up on them
+            if len(texts) > 1 and _is_out_of_memory(e):
+                middle = len(texts) // 2
+                return np.concatenate(
+                    [self.generate_embeddings_array(texts[:middle]), self.generate_embeddings_array(texts[middle:])]
+                )
             print(f"Error generating local embeddings: {e}")
-            return [[0.0] * self._dimension] * len(texts)
+            return np.zeros((len(texts), self._dimension), dtype=np.float32)
 
     def get_dimension(self) -> int:
         """Get embedding dimension."""
         return self._dimension
 
+    @contextmanager
+    def multi_gpu(self) -> Iterator[None]:
+        """
+        Spread encoding over every CUDA device while the context is active.
+
+        Uses sentence-transformers' multi-process pool with one worker process
+        per GPU. With fewer than two GPUs this does nothing, since a pool only
+        adds inter-process overhead there.
+        """
+        import torch
+
+        device_count = torch.cuda.device_count() if torch.cuda.is_available() else 0
+        if device_count < 2 or self._pool is not None:
+            yield
+            return
+
+        print(f"Encoding on {device_count} GPUs")
+        self._pool = self.model.start_multi_process_pool([f"cuda:{i}" for i in range(device_count)])
+        self._pool_size = device_count
+        try:
+            yield
+        finally:
+            pool, self._pool = self._pool, None
+            self.model.stop_multi_process_pool(pool)
+
 
 class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
     """OpenAI embeddings provider."""
@@ -112,7 +184,7 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
         super().__init__(config)
 
         try:
-            from openai import OpenAI
+            from openai import BadRequestError, OpenAI
         except ImportError:
             raise ImportError("openai is required for OpenAI embeddings. Install it with: pip install openai")
 
@@ -126,6 +198,7 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
 
         self.model = config.model or "text-embedding-3-small"
         self.client = OpenAI(api_key=api_key)
+        self._bad_request_error = BadRequestError
 
         # Determine dimension based on model
         if "3-small" in self.model:
@@ -149,18 +222,27 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
             batch = texts[i : i + self.batch_size]
 
             try:
-                response = self.client.embeddings.create(
-                    input=batch,
-                    model=self.model,
-                )
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
+                all_embeddings.extend(self._embed_batch(batch))
             except Exception as e:
                 print(f"Error generating OpenAI embeddings for batch {i // self.batch_size}: {e}")
                 all_embeddings.extend([[0.0] * self._dimension] * len(batch))
 
         return all_embeddings
 
+    def _embed_batch(self, batch: list[str]) -> list[list[float]]:
+        """Embed one request's worth of texts, halving it while it exceeds the request token limit."""
+        try:
+            response = self.client.embeddings.create(
+                input=batch,
+                model=self.model,
+            )
+        except self._bad_request_error:
+            if len(batch) == 1:
+                raise
+            middle = len(batch) // 2
+            return self._embed_batch(batch[:middle]) + self._embed_batch(batch[middle:])
+        return [item.embedding for item in response.data]
+
     def get_dimension(self) -> int:
         """Get embedding dimension."""
         return self._dimension
@@ -215,6 +297,11 @@ class HuggingFaceEmbeddingProvider(BaseEmbeddingProvider):
         return self._dimension
 
 
+def _is_out_of_memory(error: Exception) -> bool:
+    """Whether an embedding error means the batch didn't fit in memory (e.g. torch's CUDA/MPS OOM errors)."""
+    return isinstance(error, MemoryError) or "out of memory" in str(error).lower()
+
+
 class EmbeddingsFactory:
     """Factory for creating embedding providers."""
 
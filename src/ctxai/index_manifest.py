@@ -0,0 +1,103 @@
+"""
+Index manifest module.
+Records the size and modification time of every indexed file so re-indexing only processes changed files.
+"""
+
+import json
+import os
+from pathlib import Path
+
+# Bump when the manifest layout changes; older manifests trigger a full rebuild
+_MANIFEST_VERSION = 1
+
+
+class IndexManifest:
+    """Files covered by an index, with the settings the index was built with."""
+
+    FILE_NAME = "manifest.json"
+    # Recorded for files whose chunks may be partly stored; it never matches a real stat,
+    # so the next run re-indexes such a file, or drops its chunks if the file is gone
+    UNFINISHED = [-1, -1]
+
+    def __init__(
+        self,
+        settings: dict | None = None,
+        files: dict[str, list[int]] | None = None,
+        next_chunk_index: int = 0,
+    ):
+        """
+        Initialize the manifest.
+
+        Args:
+            settings: Chunking and embedding settings that affect stored chunks
+            files: Dictionary mapping file paths to [mtime_ns, size]
+            next_chunk_index: First chunk index not used by stored chunk IDs
+        """
+        self.settings = settings or {}
+        self.files = files or {}
+        self.next_chunk_index = next_chunk_index
+
+    @classmethod
+    def load(cls, storage_path: Path) -> "IndexManifest | None":
+        """
+        Read the manifest of an index.
+
+        Args:
+            storage_path: Index directory
+
+        Returns:
+            The manifest, or None if it is missing, unreadable or from another version
+        """
+        try:
+            data = json.loads((storage_path / cls.FILE_NAME).read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != _MANIFEST_VERSION:
+            return None
+        return cls(data.get("settings"), data.get("files"), data.get("next_chunk_index", 0))
+
+    def save(self, storage_path: Path) -> None:
+        """Write the manifest into an index directory, replacing the previous one atomically."""
+        data = {
+            "version": _MANIFEST_VERSION,
+            "settings": self.settings,
+            "next_chunk_index": self.next_chunk_index,
+            "files": self.files,
+        }
+        temp_path = storage_path / f"{self.FILE_NAME}.tmp"
+        temp_path.write_text(json.dumps(data))
+        os.replace(temp_path, storage_path / self.FILE_NAME)
+
+    @staticmethod
+    def stat_files(file_paths: list[Path]) -> dict[str, list[int]]:
+        """
+        Record the modification time and size of files.
+
+        Args:
+            file_paths: Files to stat; files that vanished are left out
+
+        Returns:
+            Dictionary mapping file paths to [mtime_ns, size]
+        """
+        files = {}
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            files[str(file_path)] = [stat.st_mtime_ns, stat.st_size]
+        return files
+
+    def diff(self, files: dict[str, list[int]]) -> tuple[list[str], list[str]]:
+        """
+        Compare the recorded files with the current ones.
+
+        Args:
+            files: Current files from stat_files
+
+        Returns:
+            Tuple of (new or modified file paths, file paths that are no longer indexed)
+        """
+        changed = [path for path, stat in files.items() if self.files.get(path) != stat]
+        removed = [path for path in self.files if path not in files]
+        return changed, removed
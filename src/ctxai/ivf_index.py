@@ -0,0 +1,201 @@
+"""
+Approximate nearest neighbor search with FAISS IVF-PQ and HNSW-PQ indexes.
+Both compress normalized embeddings with product quantization; IVF-PQ partitions
+them into inverted lists and HNSW-PQ links them in a navigable graph, so large
+indexes are searched without a full scan.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from .similarity import normalize_rows
+
+try:
+    import faiss
+
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Below this many vectors an exact scan is fast and IVF-PQ training is unreliable
+MIN_IVFPQ_VECTORS = 10_000
+
+# Candidates fetched per requested result, re-ranked with exact cosine distances
+_RERANK_FACTOR = 20
+
+
+def _pq_subquantizers(dim: int) -> int:
+    """Number of product quantizer sub-vectors; it must divide the dimension."""
+    for m in (32, 16, 8, 4, 2):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def build_ivfpq_index(
+    matrix: np.ndarray,
+    scales: np.ndarray | None = None,
+    train_size: int = 200_000,
+    add_batch_size: int = 16_384,
+    seed: int = 0,
+):
+    """
+    Train and fill an IVF-PQ index over normalized embeddings.
+
+    Args:
+        matrix: Normalized embeddings of shape (n, dim); may be memory-mapped
+        scales: Per-row scales if matrix holds int8 codes
+        train_size: Maximum number of vectors sampled for training
+        add_batch_size: Number of vectors added to the index at a time
+        seed: Seed for the training sample
+
+    Returns:
+        Trained faiss index using inner product (cosine similarity) scores
+    """
+    n, dim = matrix.shape
+    nlist = min(4096, max(1, int(4 * np.sqrt(n))))
+    # "np" skips polysemous training, which only helps Hamming-distance filtering and dominates training time
+    index = faiss.index_factory(dim, f"IVF{nlist},PQ{_pq_subquantizers(dim)}np", faiss.METRIC_INNER_PRODUCT)
+    return _train_and_fill(index, matrix, scales, train_size, add_batch_size, seed)
+
+
+def build_hnswpq_index(
+    matrix: np.ndarray,
+    scales: np.ndarray | None = None,
+    m: int = 32,
+    ef_construction: int = 100,
+    train_size: int = 200_000,
+    add_batch_size: int = 16_384,
+    seed: int = 0,
+):
+    """
+    Train and fill an HNSW graph over product-quantized normalized embeddings.
+
+    Args:
+        matrix: Normalized embeddings of shape (n, dim); may be memory-mapped
+        scales: Per-row scales if matrix holds int8 codes
+        m: Graph connectivity (neighbors per node)
+        ef_construction: Candidate list size while building the graph
+        train_size: Maximum number of vectors sampled for training the quantizer
+        add_batch_size: Number of vectors added to the index at a time
+        seed: Seed for the training sample
+
+    Returns:
+        Trained faiss index using inner product (cosine similarity) scores
+    """
+    dim = matrix.shape[1]
+    index = faiss.index_factory(dim, f"HNSW{m}_PQ{_pq_subquantizers(dim)}np", faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = ef_construction
+    return _train_and_fill(index, matrix, scales, train_size, add_batch_size, seed)
+
+
+def _train_and_fill(
+    index, matrix: np.ndarray, scales: np.ndarray | None, train_size: int, add_batch_size: int, seed: int
+):
+    """Train an index on a sample of the matrix, then add every row."""
+    n = matrix.shape[0]
+    if n > train_size:
+        rows = np.sort(np.random.default_rng(seed).choice(n, train_size, replace=False))
+    else:
+        rows = slice(None)
+    index.train(_float_rows(matrix, scales, rows))
+
+    # Add in slices so a memory-mapped matrix is never copied whole
+    for start in range(0, n, add_batch_size):
+        index.add(_float_rows(matrix, scales, slice(start, start + add_batch_size)))
+    return index
+
+
+def ivfpq_top_k(
+    index, matrix: np.ndarray, query: np.ndarray, k: int, nprobe: int, scales: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k most similar rows with an IVF-PQ index.
+
+    Candidates from the compressed index are re-ranked against the full vectors,
+    so the returned distances are exact.
+
+    Args:
+        index: Index from build_ivfpq_index
+        matrix: The normalized embeddings the index was built from (float32, float16 or int8 codes)
+        query: Query vector of shape (dim,)
+        k: Number of results to return
+        nprobe: Number of inverted lists visited per query (recall vs latency)
+        scales: Per-row scales if matrix holds int8 codes
+
+    Returns:
+        Tuple of (row indices, cosine distances), ordered by increasing distance
+    """
+    faiss.extract_index_ivf(index).nprobe = nprobe
+    return _rerank(index, matrix, query, k, scales)
+
+
+def hnswpq_top_k(
+    index, matrix: np.ndarray, query: np.ndarray, k: int, ef_search: int, scales: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k most similar rows with an HNSW-PQ index.
+
+    Candidates are re-ranked against the full vectors as in ivfpq_top_k.
+
+    Args:
+        index: Index from build_hnswpq_index
+        matrix: The normalized embeddings the index was built from (float32, float16 or int8 codes)
+        query: Query vector of shape (dim,)
+        k: Number of results to return
+        ef_search: Candidate list size while querying (recall vs latency)
+        scales: Per-row scales if matrix holds int8 codes
+
+    Returns:
+        Tuple of (row indices, cosine distances), ordered by increasing distance
+    """
+    # The graph search must keep at least as many candidates as are re-ranked
+    index.hnsw.efSearch = max(ef_search, k * _RERANK_FACTOR)
+    return _rerank(index, matrix, query, k, scales)
+
+
+def _rerank(
+    index, matrix: np.ndarray, query: np.ndarray, k: int, scales: np.ndarray | None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fetch candidates from a compressed index and order them by exact cosine distance."""
+    query = normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))
+
+    _, candidates = index.search(query, k * _RERANK_FACTOR)
+    candidates = np.sort(candidates[0][candidates[0] >= 0])
+    if candidates.size == 0:
+        return candidates, np.empty(0, dtype=np.float32)
+
+    distances = 1.0 - _float_rows(matrix, scales, candidates) @ query[0]
+    order = np.argsort(distances, kind="stable")[:k]
+    return candidates[order], distances[order]
+
+
+def _float_rows(matrix: np.ndarray, scales: np.ndarray | None, rows) -> np.ndarray:
+    """Selected rows of the matrix as contiguous float32, dequantizing int8 codes."""
+    selected = np.ascontiguousarray(matrix[rows], dtype=np.float32)
+    if scales is not None:
+        selected *= scales[rows][:, None]
+    return selected
+
+
+def load_ivfpq_index(path: Path, expected_size: int):
+    """
+    Read a saved IVF-PQ or HNSW-PQ index if it still covers the expected number of vectors.
+
+    Args:
+        path: Index file written by save_ivfpq_index
+        expected_size: Number of vectors the index should contain
+
+    Returns:
+        The index, or None if it is missing or stale
+    """
+    if not path.exists():
+        return None
+    index = faiss.read_index(str(path))
+    return index if index.ntotal == expected_size else None
+
+
+def save_ivfpq_index(index, path: Path):
+    """Write an index to disk."""
+    faiss.write_index(index, str(path))
@@ -0,0 +1,79 @@
+"""
+Embedding quantization module.
+Compact encodings for storing embedding vectors: float32, float16, or int8 with a per-vector scale.
+"""
+
+import numpy as np
+
+from .config import STORAGE_DTYPES
+
+# int8 codes use the symmetric range [-127, 127] so that zero maps to zero
+_INT8_MAX = 127.0
+
+
+def quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize vectors to int8 with one scale per vector.
+
+    Args:
+        vectors: Array of shape (n, dim)
+
+    Returns:
+        Tuple of (int8 codes of shape (n, dim), float32 scales of shape (n,))
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    max_abs = np.abs(vectors).max(axis=1)
+    scales = np.where(max_abs > 0, max_abs / _INT8_MAX, 1.0).astype(np.float32)
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """
+    Reconstruct float32 vectors from int8 codes and their scales.
+
+    Args:
+        codes: int8 array of shape (n, dim)
+        scales: float32 array of shape (n,)
+
+    Returns:
+        float32 array of shape (n, dim)
+    """
+    return codes.astype(np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+
+
+def encode_vector(vector: list[float] | np.ndarray, storage_dtype: str) -> bytes:
+    """
+    Encode a single vector to bytes.
+
+    Args:
+        vector: Embedding vector
+        storage_dtype: One of STORAGE_DTYPES
+
+    Returns:
+        Encoded bytes. int8 vectors are prefixed with their float32 scale.
+    """
+    if storage_dtype == "int8":
+        codes, scales = quantize_int8(np.asarray(vector, dtype=np.float32)[None, :])
+        return scales.tobytes() + codes.tobytes()
+    if storage_dtype not in STORAGE_DTYPES:
+        raise ValueError(f"Unknown storage dtype: {storage_dtype}. Available: {', '.join(STORAGE_DTYPES)}")
+    return np.asarray(vector, dtype=storage_dtype).tobytes()
+
+
+def decode_vector(blob: bytes, storage_dtype: str) -> np.ndarray:
+    """
+    Decode bytes produced by encode_vector back to a float32 vector.
+
+    Args:
+        blob: Encoded bytes
+        storage_dtype: dtype the vector was encoded with
+
+    Returns:
+        float32 array of shape (dim,)
+    """
+    if storage_dtype == "int8":
+        scale = np.frombuffer(blob, dtype=np.float32, count=1)
+        codes = np.frombuffer(blob, dtype=np.int8, offset=4)
+        return dequantize_int8(codes[None, :], scale)[0]
+    return np.frombuffer(blob, dtype=storage_dtype).astype(np.float32)
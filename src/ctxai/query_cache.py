@@ -0,0 +1,155 @@
+"""
+Query caching module for long-running servers.
+Reuses query embeddings for repeated texts and search results for near-duplicate queries.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+import numpy as np
+
+from .quantization import quantize_int8
+from .similarity import normalize_rows
+
+# Encodings for the cached query vectors of the semantic result cache
+RESULT_VECTOR_DTYPES = ("float32", "int8")
+
+
+@dataclass(slots=True)
+class _IndexResults:
+    """Cached searches of one index in a fixed-size ring buffer; each new entry overwrites the oldest."""
+
+    vectors: np.ndarray  # Normalized query embeddings (float32 or int8 codes), one preallocated row per slot
+    scales: np.ndarray  # Per-row scale of the int8 codes; ones for float32 rows
+    expiries: np.ndarray  # Per-row expiry time; -inf for slots not written yet
+    entries: list[tuple[int, list[dict]] | None]  # (n_results, results)
+    next_row: int = 0
+
+    @classmethod
+    def allocate(cls, capacity: int, dim: int, dtype: str) -> "_IndexResults":
+        return cls(
+            np.zeros((capacity, dim), dtype=dtype),
+            np.ones(capacity, dtype=np.float32),
+            np.full(capacity, -np.inf),
+            [None] * capacity,
+        )
+
+    def put(self, vector: np.ndarray, scale: float, expiry: float, entry: tuple[int, list[dict]]) -> None:
+        # Every entry has the same TTL, so the next slot always holds the oldest (or an expired) entry
+        row = self.next_row
+        self.vectors[row] = vector
+        self.scales[row] = scale
+        self.expiries[row] = expiry
+        self.entries[row] = entry
+        self.next_row = (row + 1) % len(self.entries)
+
+
+class QueryCache:
+    """Exact-match embedding cache plus a per-index semantic result cache."""
+
+    def __init__(
+        self,
+        max_embeddings: int = 512,
+        max_results_per_index: int = 256,
+        ttl_seconds: float = 300.0,
+        similarity_threshold: float = 0.97,
+        vector_dtype: str = "float32",
+    ):
+        """
+        Initialize the query cache.
+
+        Args:
+            max_embeddings: Maximum number of query embeddings kept (least recently used are evicted)
+            max_results_per_index: Maximum number of cached result lists per index
+            ttl_seconds: How long cached results stay valid
+            similarity_threshold: Minimum cosine similarity between a new query and a cached one
+                for the cached results to be reused
+            vector_dtype: Encoding of cached query vectors: "float32" for the fastest lookups,
+                or "int8" for a quarter of the memory with slightly less precise similarities
+        """
+        if vector_dtype not in RESULT_VECTOR_DTYPES:
+            raise ValueError(f"Unknown vector dtype: {vector_dtype}. Available: {', '.join(RESULT_VECTOR_DTYPES)}")
+
+        self.max_embeddings = max_embeddings
+        self.max_results_per_index = max_results_per_index
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.vector_dtype = vector_dtype
+        self._embeddings: OrderedDict[tuple[Hashable, str], list[float]] = OrderedDict()
+        self._results: dict[str, _IndexResults] = {}
+
+    def get_embedding(self, model_key: Hashable, query: str) -> list[float] | None:
+        """
+        Look up the embedding of a query text.
+
+        Args:
+            model_key: Identifies the embedding model that produced the vector
+            query: Query text
+
+        Returns:
+            Cached embedding, or None on a miss
+        """
+        key = (model_key, query)
+        embedding = self._embeddings.get(key)
+        if embedding is not None:
+            self._embeddings.move_to_end(key)
+        return embedding
+
+    def put_embedding(self, model_key: Hashable, query: str, embedding: list[float]) -> None:
+        """Store the embedding of a query text."""
+        self._embeddings[(model_key, query)] = embedding
+        self._embeddings.move_to_end((model_key, query))
+        while len(self._embeddings) > self.max_embeddings:
+            self._embeddings.popitem(last=False)
+
+    def get_results(self, index: str, embedding: list[float], n_results: int) -> list[dict] | None:
+        """
+        Find cached results of a query similar enough to this one.
+
+        Args:
+            index: Index the query runs against
+            embedding: Query embedding
+            n_results: Number of results requested
+
+        Returns:
+            Up to n_results cached results, or None on a miss
+        """
+        cached = self._results.get(index)
+        query = normalize_rows(np.asarray(embedding, dtype=np.float32))
+        # Entries from another embedding model (e.g. after a config change) are not comparable
+        if cached is None or cached.vectors.shape[1:] != query.shape:
+            return None
+
+        # The vectors are kept stacked so each lookup is a single matrix-vector product
+        scores = (cached.vectors.astype(np.float32, copy=False) @ query) * cached.scales
+        scores[cached.expiries <= time.monotonic()] = -np.inf
+        for position in np.argsort(-scores):
+            if scores[position] < self.similarity_threshold:
+                break
+            cached_n, results = cached.entries[position]
+            # A smaller cached top-k cannot answer a larger request unless it was exhaustive
+            if cached_n >= n_results or len(results) < cached_n:
+                return results[:n_results]
+        return None
+
+    def put_results(self, index: str, embedding: list[float], n_results: int, results: list[dict]) -> None:
+        """Store the results of a query."""
+        vector = normalize_rows(np.asarray(embedding, dtype=np.float32)).reshape(1, -1)
+        cached = self._results.get(index)
+        if cached is None or cached.vectors.shape[1] != vector.shape[1]:
+            cached = self._results[index] = _IndexResults.allocate(
+                max(self.max_results_per_index, 1), vector.shape[1], self.vector_dtype
+            )
+
+        if self.vector_dtype == "int8":
+            vector, scale = quantize_int8(vector)
+        else:
+            scale = np.ones(1, dtype=np.float32)
+
+        cached.put(vector[0], scale[0], time.monotonic() + self.ttl_seconds, (n_results, results))
+
+    def invalidate(self, index: str) -> None:
+        """Drop the cached results of an index, e.g. after it was re-indexed."""
+        self._results.pop(index, None)
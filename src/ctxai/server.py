@@ -16,4 +16,17 @@ def read_root():
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+    # uvicorn's own default (info) applies unless LOG_LEVEL is set
+    log_level = os.environ.get("LOG_LEVEL")
+    # Workers need an import string; the "auto" loop/http settings pick uvloop and
+    # httptools when they are installed (e.g. via uvicorn[standard])
+    uvicorn.run(
+        "ctxai.server:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        log_level=log_level.lower() if log_level else None,
+    )
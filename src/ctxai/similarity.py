@@ -0,0 +1,66 @@
+"""
+Vector similarity module.
+Vectorized cosine similarity helpers for exact (brute-force) nearest neighbor search.
+"""
+
+import numpy as np
+
+# Rows converted to float32 at a time when scoring a float16 matrix
+_UPCAST_BLOCK_ROWS = 16_384
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize vectors so cosine similarity reduces to a dot product.
+
+    Args:
+        vectors: Array of shape (n, dim) or (dim,)
+
+    Returns:
+        Contiguous float32 array of the same shape; zero vectors are left as zeros
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def cosine_top_k(
+    matrix: np.ndarray, query: np.ndarray, k: int, scales: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k rows of a matrix most similar to a query.
+
+    The matrix should already be normalized with normalize_rows so the scan is
+    a single BLAS matrix-vector product.
+
+    Args:
+        matrix: Normalized float32 or float16 array of shape (n, dim), or the
+            int8 codes of one (see quantization.quantize_int8)
+        query: Query vector of shape (dim,)
+        k: Number of results to return
+        scales: Per-row scales of int8 codes; None for float matrices
+
+    Returns:
+        Tuple of (row indices, cosine distances), ordered from nearest to farthest
+    """
+    if len(matrix) == 0 or k <= 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+
+    query = normalize_rows(query)
+    if matrix.dtype == np.float32:
+        scores = matrix @ query
+    else:
+        # Upcast reduced-precision matrices a block at a time so BLAS can be used
+        # without materializing a float32 copy of the whole matrix
+        scores = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), _UPCAST_BLOCK_ROWS):
+            block = matrix[start : start + _UPCAST_BLOCK_ROWS]
+            scores[start : start + len(block)] = block.astype(np.float32) @ query
+    if scales is not None:
+        scores *= scales
+    k = min(k, len(scores))
+
+    # Partial selection is O(n); only the k winners are sorted
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return top, 1.0 - scores[top]
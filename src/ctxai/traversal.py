@@ -3,14 +3,66 @@ Code traversal module for recursively walking through codebase.
 Respects .gitignore patterns and handles file filtering.
 """
 
+import fnmatch
 import os
+import re
 from collections.abc import Generator
-from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path, PurePath
 from typing import Optional
 
 import pathspec
 
 
+def _compile_globs(patterns: list[str]) -> list[tuple[str, tuple]]:
+    """
+    Precompile glob patterns for _match_globs.
+
+    Args:
+        patterns: Glob patterns, e.g. ['*.py', 'tests/*']
+
+    Returns:
+        (anchor, part matchers) pairs, one per pattern
+    """
+    # Path.match is case-insensitive on Windows
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    compiled = []
+    for pattern in patterns:
+        pure = PurePath(pattern)
+        parts = pure.parts[1:] if pure.anchor else pure.parts
+        if not parts:
+            raise ValueError(f"Empty pattern: {pattern!r}")
+        compiled.append((pure.anchor, tuple(re.compile(fnmatch.translate(part), flags).match for part in parts)))
+    return compiled
+
+
+def _match_globs(path: Path, compiled: list[tuple[str, tuple]]) -> bool:
+    """
+    Check a path against precompiled globs with the semantics of Path.match.
+
+    Relative patterns match from the right, absolute ones must match the whole
+    path, and "**" behaves like "*". Unlike Path.match, patterns are not
+    re-parsed for every call.
+
+    Args:
+        path: Path to check
+        compiled: Patterns from _compile_globs
+
+    Returns:
+        True if any pattern matches
+    """
+    path_parts = path.parts[1:] if path.anchor else path.parts
+    for anchor, matchers in compiled:
+        if anchor:
+            if anchor != path.anchor or len(matchers) != len(path_parts):
+                continue
+        elif len(matchers) > len(path_parts):
+            continue
+        if all(match(part) for match, part in zip(reversed(matchers), reversed(path_parts))):
+            return True
+    return False
+
+
 class CodeTraversal:
     """Traverse a codebase recursively with gitignore support."""
 
@@ -35,6 +87,10 @@ class CodeTraversal:
         self.exclude_patterns = exclude_patterns or []
         self.follow_gitignore = follow_gitignore
 
+        # Compile user patterns once instead of re-parsing them for every path
+        self._include_globs = _compile_globs(self.include_patterns)
+        self._exclude_globs = _compile_globs(self.exclude_patterns)
+
         # Load gitignore patterns
         self.gitignore_spec = self._load_gitignore() if follow_gitignore else None
 
@@ -74,8 +130,17 @@ class CodeTraversal:
             print(f"Warning: Could not load .gitignore: {e}")
             return None
 
-    def _should_exclude_path(self, path: Path) -> bool:
-        """Check if a path should be excluded based on various rules."""
+    def _should_exclude_path(self, path: Path, is_dir: bool | None = None) -> bool:
+        """
+        Check if a path should be excluded based on various rules.
+
+        Args:
+            path: Path to check
+            is_dir: Whether the path is a directory, if already known (avoids a stat call)
+
+        Returns:
+            True if the path should be excluded
+        """
         relative_path = path.relative_to(self.root_path)
         relative_str = str(relative_path).replace("\\", "/")
 
@@ -88,14 +153,14 @@ class CodeTraversal:
         if self.gitignore_spec:
             if self.gitignore_spec.match_file(relative_str):
                 return True
-            if path.is_dir() and self.gitignore_spec.match_file(relative_str + "/"):
+            if is_dir is None:
+                is_dir = path.is_dir()
+            if is_dir and self.gitignore_spec.match_file(relative_str + "/"):
                 return True
 
         # Check user-defined exclude patterns
-        if self.exclude_patterns:
-            for pattern in self.exclude_patterns:
-                if path.match(pattern):
-                    return True
+        if self._exclude_globs and _match_globs(path, self._exclude_globs):
+            return True
 
         return False
 
@@ -106,11 +171,7 @@ class CodeTraversal:
             return True
 
         # Check if file matches any include pattern
-        for pattern in self.include_patterns:
-            if file_path.match(pattern):
-                return True
-
-        return False
+        return _match_globs(file_path, self._include_globs)
 
     def traverse(self) -> Generator[Path, None, None]:
         """
@@ -119,29 +180,91 @@ class CodeTraversal:
         Yields:
             Path objects for each file that should be processed
         """
-        for root, dirs, files in os.walk(self.root_path, topdown=True):
-            root_path = Path(root)
+        pending = [self.root_path]
 
-            # Filter directories in-place to prevent descending into excluded dirs
-            dirs[:] = [d for d in dirs if not self._should_exclude_path(root_path / d)]
+        while pending:
+            files, subdirs = self._scan_directory(pending.pop())
+            yield from files
 
-            # Process files
-            for file_name in files:
-                file_path = root_path / file_name
+            # Visit subdirectories in name order (stack is LIFO)
+            pending.extend(reversed(subdirs))
 
-                # Skip if excluded
-                if self._should_exclude_path(file_path):
-                    continue
+    def traverse_parallel(self, max_workers: int | None = None) -> Generator[Path, None, None]:
+        """
+        Traverse the codebase, listing and checking directories in a thread pool.
 
-                # Skip if doesn't match include patterns
-                if not self._should_include_file(file_path):
-                    continue
+        Directory listings and the binary-content check are blocking I/O, so on
+        cold caches and network filesystems many directories are scanned at once.
+        Files are yielded in the same order as traverse().
 
-                # Skip binary files (basic check)
-                if self._is_likely_binary(file_path):
-                    continue
+        Args:
+            max_workers: Number of threads (defaults to four per CPU, at most 32)
+
+        Yields:
+            Path objects for each file that should be processed
+        """
+        max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ctxai-traverse") as executor:
+
+            def scan(root_path: Path) -> tuple[list[Path], list[Future]]:
+                files, subdirs = self._scan_directory(root_path)
+                # Subdirectories are queued as soon as they are found, not when they are reached
+                return files, [executor.submit(scan, subdir) for subdir in subdirs]
+
+            pending = [executor.submit(scan, self.root_path)]
+            try:
+                while pending:
+                    files, children = pending.pop().result()
+                    yield from files
+                    pending.extend(reversed(children))
+            finally:
+                executor.shutdown(cancel_futures=True)
 
-                yield file_path
+    def _scan_directory(self, root_path: Path) -> tuple[list[Path], list[Path]]:
+        """
+        List one directory.
+
+        Args:
+            root_path: Directory to list
+
+        Returns:
+            Tuple of (files to process, subdirectories to descend into), both in name order
+        """
+        try:
+            with os.scandir(root_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"Warning: Could not read directory {root_path}: {e}")
+            return [], []
+
+        files = []
+        subdirs = []
+        for entry in entries:
+            file_path = root_path / entry.name
+
+            # DirEntry caches the file type from the directory listing, so no extra stat
+            if entry.is_dir():
+                # Prune excluded directories before descending; never follow symlinked dirs
+                if not entry.is_symlink() and not self._should_exclude_path(file_path, is_dir=True):
+                    subdirs.append(file_path)
+                continue
+
+            # Skip if excluded
+            if self._should_exclude_path(file_path, is_dir=False):
+                continue
+
+            # Skip if doesn't match include patterns
+            if not self._should_include_file(file_path):
+                continue
+
+            # Skip binary files (basic check)
+            if self._is_likely_binary(file_path):
+                continue
+
+            files.append(file_path)
+
+        return files, subdirs
 
     def _is_likely_binary(self, file_path: Path) -> bool:
         """
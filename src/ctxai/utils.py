@@ -3,9 +3,29 @@ Utility functions for ctxai.
 Handles environment variables, path resolution, and common helpers.
 """
 
+import hashlib
 import os
+import queue
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TypeVar
+
+try:
+    import blake3
+
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# blake3 only benefits from multithreading on large inputs
+_BLAKE3_PARALLEL_MIN_BYTES = 128 * 1024
 
 
 def get_ctxai_home(project_path: Path | None = None) -> Path:
@@ -61,6 +81,32 @@ def get_indexes_dir(project_path: Path | None = None) -> Path:
     return get_ctxai_home(project_path) / "indexes"
 
 
+def get_cache_dir(project_path: Path | None = None) -> Path:
+    """
+    Get the cache directory.
+
+    Args:
+        project_path: Optional project root path
+
+    Returns:
+        Path to cache directory
+    """
+    return get_ctxai_home(project_path) / "cache"
+
+
+def get_embed_socket_path(project_path: Path | None = None) -> Path:
+    """
+    Get the Unix socket path of the embedding daemon.
+
+    Args:
+        project_path: Optional project root path
+
+    Returns:
+        Path to the embedding daemon socket
+    """
+    return get_ctxai_home(project_path) / "embed.sock"
+
+
 def get_config_path(project_path: Path | None = None) -> Path:
     """
     Get the config file path.
@@ -114,3 +160,226 @@ def get_ctxai_home_info() -> dict:
         "resolved_path": str(get_ctxai_home()),
         "is_global": is_using_global_home(),
     }
+
+
+def batched(iterable: Iterable[T], batch_size: int) -> Iterator[list[T]]:
+    """
+    Group items from an iterable into lists of at most batch_size items.
+
+    Consumes the iterable lazily, so only one batch is held in memory at a time.
+
+    Args:
+        iterable: Items to group
+        batch_size: Maximum number of items per batch
+
+    Yields:
+        Lists of up to batch_size items
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def budget_batches(
+    iterable: Iterable[T], batch_size: int, max_weight: int, weight: Callable[[T], int]
+) -> Iterator[list[T]]:
+    """
+    Group items into batches limited by item count and by total weight.
+
+    An item heavier than max_weight on its own still gets a batch of its own.
+
+    Args:
+        iterable: Items to group
+        batch_size: Maximum number of items per batch
+        max_weight: Maximum summed weight of a batch
+        weight: Weight of an item (e.g. its length in characters)
+
+    Yields:
+        Non-empty lists of up to batch_size items
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    batch: list[T] = []
+    total = 0
+    for item in iterable:
+        item_weight = weight(item)
+        if batch and (len(batch) >= batch_size or total + item_weight > max_weight):
+            yield batch
+            batch, total = [], 0
+        batch.append(item)
+        total += item_weight
+    if batch:
+        yield batch
+
+
+def length_sorted_batches(
+    iterable: Iterable[T],
+    batch_size: int,
+    key: Callable[[T], int],
+    window_batches: int = 4,
+    max_length: int | None = None,
+) -> Iterator[list[T]]:
+    """
+    Group items into batches of similar length.
+
+    Local embedding models pad every text in a batch to its longest one, so
+    each window of window_batches * batch_size items is sorted by length
+    before it is split into batches. Only one window is held in memory.
+
+    Args:
+        iterable: Items to group
+        batch_size: Maximum number of items per batch
+        key: Length of an item
+        window_batches: Number of batches sorted together
+        max_length: Optional limit on the summed length of a batch (see budget_batches)
+
+    Yields:
+        Lists of up to batch_size items; items keep no particular order
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    for window in batched(iterable, batch_size * max(1, window_batches)):
+        window.sort(key=key)
+        if max_length is None:
+            yield from batched(window, batch_size)
+        else:
+            yield from budget_batches(window, batch_size, max_length, key)
+
+
+def submit_ahead(
+    executor: Executor, fn: Callable[[T], R], iterable: Iterable[T], max_pending: int
+) -> Iterator[tuple[T, Future[R]]]:
+    """
+    Run fn over a stream in an executor, keeping up to max_pending calls in flight.
+
+    Unlike Executor.map, which submits every item up front, items are only
+    taken from the iterable as results are consumed.
+
+    Args:
+        executor: Executor that runs the calls
+        fn: Function applied to each item
+        iterable: Items to process
+        max_pending: Maximum number of submitted calls not yet handed out
+
+    Yields:
+        (item, future) pairs in input order; errors surface from future.result()
+    """
+    if max_pending < 1:
+        raise ValueError("max_pending must be at least 1")
+
+    pending: deque[tuple[T, Future[R]]] = deque()
+    try:
+        for item in iterable:
+            if len(pending) >= max_pending:
+                yield pending.popleft()
+            pending.append((item, executor.submit(fn, item)))
+        while pending:
+            yield pending.popleft()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def prefetch(iterable: Iterable[T], max_items: int) -> Iterator[T]:
+    """
+    Iterate over an iterable in a background thread, keeping items ready ahead of the consumer.
+
+    The producer keeps working while the consumer is busy, e.g. chunking files
+    while a batch is being embedded. At most max_items are buffered. Exceptions
+    raised by the iterable are re-raised to the consumer. If the consumer stops
+    early, the producer stops after its current item and the iterable is closed.
+
+    Args:
+        iterable: Items to produce
+        max_items: Maximum number of items buffered ahead of the consumer
+
+    Yields:
+        The items of iterable, in order
+    """
+    if max_items < 1:
+        raise ValueError("max_items must be at least 1")
+
+    items: queue.Queue = queue.Queue(maxsize=max_items)
+    done = object()
+    stop = threading.Event()
+    error: list[BaseException] = []
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if stop.is_set():
+                    break
+                items.put(item)
+        except BaseException as e:
+            error.append(e)
+        finally:
+            # Close generators here so their cleanup runs in the thread that drove them
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            items.put(done)
+
+    producer = threading.Thread(target=produce, name="ctxai-prefetch", daemon=True)
+    producer.start()
+    try:
+        while (item := items.get()) is not done:
+            yield item
+        if error:
+            raise error[0]
+    finally:
+        stop.set()
+        # Unblock a producer waiting on a full queue
+        while producer.is_alive():
+            try:
+                items.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Hash content for cache keys.
+
+    Uses SIMD-accelerated blake3 when installed (pip install ctxai[fast-hash]),
+    otherwise blake2b. Both produce 64-character hex digests.
+
+    Args:
+        data: Bytes to hash
+
+    Returns:
+        Hex digest
+    """
+    if BLAKE3_AVAILABLE:
+        max_threads = blake3.blake3.AUTO if len(data) >= _BLAKE3_PARALLEL_MIN_BYTES else 1
+        return blake3.blake3(data, max_threads=max_threads).hexdigest()
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+def dir_size(path: str | os.PathLike) -> int:
+    """
+    Total size in bytes of the files under a directory.
+
+    Walks with os.scandir so file types and sizes come from the directory
+    entries (cached from readdir where the platform allows) and no Path
+    objects are created. Symlinks are not followed.
+
+    Args:
+        path: Directory to measure
+
+    Returns:
+        Sum of the sizes of all regular files below path
+    """
+    total = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                total += dir_size(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                total += entry.stat(follow_symlinks=False).st_size
+    return total
@@ -3,28 +3,61 @@ Vector database storage module using ChromaDB.
 Stores and retrieves code embeddings for semantic search.
 """
 
+import json
+import os
+import threading
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
 from .chunking import CodeChunk
+from .config import IndexConfig
+from .ivf_index import (
+    FAISS_AVAILABLE,
+    MIN_IVFPQ_VECTORS,
+    build_hnswpq_index,
+    build_ivfpq_index,
+    hnswpq_top_k,
+    ivfpq_top_k,
+    load_ivfpq_index,
+    save_ivfpq_index,
+)
+from .quantization import quantize_int8
+from .similarity import cosine_top_k, normalize_rows
+from .utils import batched
+
+# Chunk IDs or file paths removed per delete call
+_DELETE_BATCH_SIZE = 1000
+
+# Metadata stored as integers; indexes built before that hold them as strings
+_INT_METADATA_KEYS = ("start_line", "end_line", "char_count")
 
 
 class VectorStore:
     """Vector database for storing and querying code embeddings."""
 
-    def __init__(self, storage_path: Path, collection_name: str):
+    def __init__(
+        self,
+        storage_path: Path,
+        collection_name: str,
+        index_config: IndexConfig | None = None,
+    ):
         """
         Initialize the vector store.
 
         Args:
             storage_path: Path to store the ChromaDB database
             collection_name: Name of the collection (index name)
+            index_config: Optional indexing configuration with HNSW parameters
         """
         self.storage_path = storage_path
         self.collection_name = collection_name
+        self.index_config = index_config or IndexConfig()
 
         # Create storage directory if it doesn't exist
         storage_path.mkdir(parents=True, exist_ok=True)
@@ -38,36 +71,76 @@ class VectorStore:
             ),
         )
 
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name=collection_name,
-            metadata={"description": f"Code embeddings for {collection_name}"},
+        self.collection = self._open_collection()
+        self._apply_search_ef(self.index_config.hnsw_ef_search)
+
+        # Servers share a store between threads; the exact-search matrix is rebuilt by one at a time
+        self._matrix_lock = threading.Lock()
+
+    def _open_collection(self):
+        """Get or create the collection, backed by an HNSW index using cosine distance."""
+        return self.client.get_or_create_collection(
+            name=self.collection_name,
+            metadata={
+                "description": f"Code embeddings for {self.collection_name}",
+                "hnsw:space": "cosine",
+                "hnsw:M": self.index_config.hnsw_m,
+                "hnsw:construction_ef": self.index_config.hnsw_ef_construction,
+                "hnsw:search_ef": self.index_config.hnsw_ef_search,
+            },
         )
 
+    def _apply_search_ef(self, ef_search: int):
+        """
+        Apply the configured HNSW ef_search to an existing collection.
+
+        Creation-time metadata is ignored for collections that already exist,
+        so the query-time recall/latency trade-off is updated explicitly.
+
+        Args:
+            ef_search: Size of the HNSW candidate list used while querying
+        """
+        try:
+            hnsw = (self.collection.configuration or {}).get("hnsw") or {}
+            if hnsw.get("ef_search") != ef_search:
+                self.collection.modify(configuration={"hnsw": {"ef_search": ef_search}})
+        except Exception:
+            # Older ChromaDB releases only honour the creation-time metadata
+            pass
+
     def add_chunks(
         self,
         chunks: list[CodeChunk],
-        embeddings: list[list[float]],
+        embeddings: list[list[float]] | np.ndarray,
         batch_size: int = 100,
-    ):
+        start_index: int = 0,
+    ) -> list[CodeChunk]:
         """
         Add code chunks with their embeddings to the vector store.
 
         Args:
             chunks: List of CodeChunk objects
-            embeddings: List of embedding vectors
+            embeddings: Embedding vectors; a float32 matrix is handed to ChromaDB without conversion
             batch_size: Number of chunks to add in a single batch
+            start_index: Global index of the first chunk, so IDs stay unique
+                when chunks are added over several calls
+
+        Returns:
+            Chunks of batches that could not be stored
         """
         if len(chunks) != len(embeddings):
             raise ValueError("Number of chunks must match number of embeddings")
 
+        self._invalidate_matrix()
+
+        failed = []
         # Process in batches
         for i in range(0, len(chunks), batch_size):
             batch_chunks = chunks[i : i + batch_size]
             batch_embeddings = embeddings[i : i + batch_size]
 
             # Prepare data for ChromaDB
-            ids = [self._generate_chunk_id(chunk, i + j) for j, chunk in enumerate(batch_chunks)]
+            ids = [self._generate_chunk_id(chunk, start_index + i + j) for j, chunk in enumerate(batch_chunks)]
             documents = [chunk.content for chunk in batch_chunks]
             metadatas = [self._chunk_to_metadata(chunk) for chunk in batch_chunks]
 
@@ -80,6 +153,9 @@ class VectorStore:
                 )
             except Exception as e:
                 print(f"Error adding batch {i // batch_size}: {e}")
+                failed.extend(batch_chunks)
+
+        return failed
 
     def search(
         self,
@@ -93,11 +169,21 @@ class VectorStore:
         Args:
             query_embedding: Query embedding vector
             n_results: Number of results to return
-            filter_dict: Optional metadata filters
+            filter_dict: Optional metadata filter (see build_filter). It is applied
+                inside the index search, so filtered-out chunks never take up one
+                of the n_results slots.
 
         Returns:
             List of dictionaries containing chunk information and similarity scores
         """
+        # Alternative backends configured with indexing.index_type
+        if self.index_config.index_type == "flat":
+            return self.exact_search(query_embedding, n_results, filter_dict)
+        if self.index_config.index_type == "ivfpq":
+            return self.ivfpq_search(query_embedding, n_results, filter_dict)
+        if self.index_config.index_type == "hnsw_pq":
+            return self.hnswpq_search(query_embedding, n_results, filter_dict)
+
         try:
             results = self.collection.query(
                 query_embeddings=[query_embedding],
@@ -114,7 +200,7 @@ class VectorStore:
                         {
                             "id": results["ids"][0][i],
                             "content": results["documents"][0][i],
-                            "metadata": results["metadatas"][0][i],
+                            "metadata": _typed_metadata(results["metadatas"][0][i]),
                             "distance": results["distances"][0][i],
                         }
                     )
@@ -125,6 +211,271 @@ class VectorStore:
             print(f"Error searching vector store: {e}")
             return []
 
+    def exact_search(
+        self,
+        query_embedding: list[float],
+        n_results: int = 10,
+        filter_dict: dict | None = None,
+    ) -> list[dict]:
+        """
+        Search by scanning every stored embedding instead of the HNSW graph.
+
+        Returns exact nearest neighbors, which is useful on small indexes and for
+        measuring the recall of search() at a given hnsw_ef_search.
+
+        Args:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+            filter_dict: Optional metadata filter (see build_filter)
+
+        Returns:
+            List of dictionaries in the same format as search()
+        """
+        try:
+            matrix, scales, ids = self._load_matrix()
+            if filter_dict is not None:
+                allowed = set(self.collection.get(where=filter_dict, include=[])["ids"])
+                rows = [i for i, chunk_id in enumerate(ids) if chunk_id in allowed]
+                matrix = matrix[rows]
+                scales = scales[rows] if scales is not None else None
+                ids = [ids[i] for i in rows]
+            if not ids:
+                return []
+
+            indices, distances = cosine_top_k(
+                matrix, np.asarray(query_embedding, dtype=np.float32), n_results, scales=scales
+            )
+            return self._fetch_results([ids[i] for i in indices], distances)
+
+        except Exception as e:
+            print(f"Error searching vector store: {e}")
+            return []
+
+    def ivfpq_search(
+        self,
+        query_embedding: list[float],
+        n_results: int = 10,
+        filter_dict: dict | None = None,
+    ) -> list[dict]:
+        """
+        Search with a FAISS IVF-PQ index built from the stored embeddings.
+
+        The index is trained on first use and saved next to the collection.
+        Filtered searches, indexes smaller than MIN_IVFPQ_VECTORS and installs
+        without faiss use exact_search instead.
+
+        Args:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+            filter_dict: Optional metadata filter (see build_filter)
+
+        Returns:
+            List of dictionaries in the same format as search()
+        """
+        return self._compressed_search(
+            query_embedding,
+            n_results,
+            filter_dict,
+            self._ivfpq_path(),
+            build_ivfpq_index,
+            partial(ivfpq_top_k, nprobe=self.index_config.ivf_nprobe),
+        )
+
+    def hnswpq_search(
+        self,
+        query_embedding: list[float],
+        n_results: int = 10,
+        filter_dict: dict | None = None,
+    ) -> list[dict]:
+        """
+        Search with a FAISS HNSW graph over product-quantized embeddings.
+
+        The graph holds at most 32 bytes of codes per vector instead of the
+        4 * dim bytes of ChromaDB's float32 HNSW index; candidates are re-ranked
+        against the memory-mapped embedding matrix. The graph uses hnsw_m,
+        hnsw_ef_construction and hnsw_ef_search, and falls back to exact_search
+        in the same cases as ivfpq_search.
+
+        Args:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+            filter_dict: Optional metadata filter (see build_filter)
+
+        Returns:
+            List of dictionaries in the same format as search()
+        """
+        return self._compressed_search(
+            query_embedding,
+            n_results,
+            filter_dict,
+            self._hnswpq_path(),
+            partial(
+                build_hnswpq_index, m=self.index_config.hnsw_m, ef_construction=self.index_config.hnsw_ef_construction
+            ),
+            partial(hnswpq_top_k, ef_search=self.index_config.hnsw_ef_search),
+        )
+
+    def _compressed_search(
+        self,
+        query_embedding: list[float],
+        n_results: int,
+        filter_dict: dict | None,
+        index_path: Path,
+        build_index: Callable,
+        top_k: Callable,
+    ) -> list[dict]:
+        """Search with a FAISS index that is built on first use and saved at index_path."""
+        if not FAISS_AVAILABLE:
+            print("Warning: faiss is not installed (pip install ctxai[faiss]), using exact search")
+            return self.exact_search(query_embedding, n_results, filter_dict)
+        if filter_dict is not None:
+            return self.exact_search(query_embedding, n_results, filter_dict)
+
+        try:
+            matrix, scales, ids = self._load_matrix()
+            if len(ids) < MIN_IVFPQ_VECTORS:
+                return self.exact_search(query_embedding, n_results)
+
+            index = load_ivfpq_index(index_path, len(ids))
+            if index is None:
+                index = build_index(matrix, scales)
+                save_ivfpq_index(index, index_path)
+
+            indices, distances = top_k(
+                index, matrix, np.asarray(query_embedding, dtype=np.float32), n_results, scales=scales
+            )
+            return self._fetch_results([ids[i] for i in indices], distances)
+
+        except Exception as e:
+            print(f"Error searching vector store: {e}")
+            return []
+
+    def _fetch_results(self, top_ids: list[str], distances) -> list[dict]:
+        """Fetch documents and metadata for ranked chunk IDs, in the format of search()."""
+        results = self.collection.get(ids=top_ids, include=["documents", "metadatas"])
+        records = {
+            chunk_id: (document, metadata)
+            for chunk_id, document, metadata in zip(results["ids"], results["documents"], results["metadatas"])
+        }
+
+        return [
+            {
+                "id": chunk_id,
+                "content": records[chunk_id][0],
+                "metadata": _typed_metadata(records[chunk_id][1]),
+                "distance": float(distance),
+            }
+            for chunk_id, distance in zip(top_ids, distances)
+            if chunk_id in records
+        ]
+
+    def _load_matrix(self) -> tuple[np.ndarray, np.ndarray | None, list[str]]:
+        """
+        Load the normalized embedding matrix used by exact_search.
+
+        The matrix is kept as a .npy file next to the index and memory-mapped, so
+        repeated loads are served from the OS page cache instead of being
+        deserialized from the database. It is stored with the configured
+        vector_dtype and rebuilt after chunks are added. int8 matrices hold
+        quantized codes with one float32 scale per row, a quarter of the size
+        of float32.
+
+        Returns:
+            Tuple of (read-only matrix of shape (n, dim), per-row scales for int8
+            codes or None, chunk IDs in row order)
+        """
+        dtype = np.dtype(self.index_config.vector_dtype)
+        quantized = dtype == np.int8
+        matrix_path, scales_path, ids_path = self._matrix_paths()
+        with self._matrix_lock:
+            try:
+                matrix = np.load(matrix_path, mmap_mode="r")
+                scales = np.load(scales_path) if quantized else None
+                ids = json.loads(ids_path.read_text())
+            except (OSError, ValueError):
+                # Missing, or removed by another process that is updating the index
+                ids = None
+            # The files are replaced one at a time, so a reader may pair a new file with an old one
+            if (
+                ids is not None
+                and matrix.dtype == dtype
+                and len(ids) == matrix.shape[0] == self.collection.count()
+                and (scales is None or len(scales) == len(ids))
+            ):
+                return matrix, scales, ids
+
+            results = self.collection.get(include=["embeddings"])
+            if not results["ids"]:
+                return np.empty((0, 0), dtype=np.float32), None, []
+
+            # Normalize in float32, then store at the configured precision
+            matrix = normalize_rows(np.asarray(results["embeddings"], dtype=np.float32))
+            scales = None
+            if quantized:
+                matrix, scales = quantize_int8(matrix)
+                _save_array(scales_path, scales)
+            matrix = _save_array(matrix_path, matrix.astype(dtype, copy=False))
+            # The IDs go last: they are what marks the matrix as up to date
+            _replace_file(ids_path, lambda path: path.write_text(json.dumps(results["ids"])))
+            return matrix, scales, results["ids"]
+
+    def _invalidate_matrix(self):
+        """Remove the exact-search matrix and the FAISS indexes so they are rebuilt on next use."""
+        with self._matrix_lock:
+            for path in (*self._matrix_paths(), self._ivfpq_path(), self._hnswpq_path()):
+                path.unlink(missing_ok=True)
+
+    def _matrix_paths(self) -> tuple[Path, Path, Path]:
+        """Paths of the exact-search matrix, its int8 row scales and its row-order chunk IDs."""
+        return (
+            self.storage_path / "embeddings.npy",
+            self.storage_path / "embedding_scales.npy",
+            self.storage_path / "embedding_ids.json",
+        )
+
+    def _ivfpq_path(self) -> Path:
+        """Path of the saved IVF-PQ index."""
+        return self.storage_path / "ivfpq.index"
+
+    def _hnswpq_path(self) -> Path:
+        """Path of the saved HNSW-PQ index."""
+        return self.storage_path / "hnswpq.index"
+
+    @staticmethod
+    def build_filter(language: str | None = None, chunk_type: str | None = None) -> dict | None:
+        """
+        Build a metadata filter for search.
+
+        Args:
+            language: Only match chunks in this language (e.g., "python")
+            chunk_type: Only match chunks of this type (e.g., "function_definition")
+
+        Returns:
+            Filter dictionary for search(), or None if no conditions were given
+        """
+        conditions = []
+        if language:
+            conditions.append({"language": language})
+        if chunk_type:
+            conditions.append({"chunk_type": chunk_type})
+
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
+
+    def count(self) -> int:
+        """
+        Get the number of stored chunks.
+
+        Unlike get_stats, this does not read any chunk metadata.
+
+        Returns:
+            Total number of chunks in the collection
+        """
+        return self.collection.count()
+
     def get_stats(self) -> dict:
         """
         Get statistics about the vector store.
@@ -161,10 +512,63 @@ class VectorStore:
             print(f"Error getting stats: {e}")
             return {}
 
+    def list_chunks(self, limit: int = 50, offset: int = 0) -> list[dict]:
+        """
+        List one page of stored chunks without their contents.
+
+        Args:
+            limit: Maximum number of chunks to return
+            offset: Number of chunks to skip
+
+        Returns:
+            List of dictionaries with the chunk id and metadata; metadata always
+            includes char_count
+        """
+        results = self.collection.get(limit=limit, offset=offset, include=["metadatas"])
+        chunks = [
+            {"id": chunk_id, "metadata": _typed_metadata(metadata)}
+            for chunk_id, metadata in zip(results["ids"], results["metadatas"])
+        ]
+
+        # Indexes built before char_count was stored need the documents for this page
+        legacy = [chunk for chunk in chunks if "char_count" not in chunk["metadata"]]
+        if legacy:
+            documents = self.collection.get(ids=[chunk["id"] for chunk in legacy], include=["documents"])
+            lengths = {chunk_id: len(document) for chunk_id, document in zip(documents["ids"], documents["documents"])}
+            for chunk in legacy:
+                chunk["metadata"] = {**chunk["metadata"], "char_count": lengths.get(chunk["id"], 0)}
+        return chunks
+
+    def delete_files(self, file_paths: list[str]):
+        """
+        Remove every chunk of the given files.
+
+        Args:
+            file_paths: File paths as stored in chunk metadata
+        """
+        if not file_paths:
+            return
+        self._invalidate_matrix()
+        for batch in batched(file_paths, _DELETE_BATCH_SIZE):
+            self.collection.delete(where={"file_path": {"$in": batch}})
+
+    def clear(self):
+        """
+        Remove every chunk and recreate the collection.
+
+        ChromaDB fixes the distance metric and HNSW build parameters when a
+        collection is created, so the new collection picks up the current
+        index_config (and cosine distance for indexes created before it was used).
+        """
+        self._invalidate_matrix()
+        self.client.delete_collection(self.collection_name)
+        self.collection = self._open_collection()
+
     def delete_collection(self):
         """Delete the entire collection."""
         try:
             self.client.delete_collection(self.collection_name)
+            self._invalidate_matrix()
         except Exception as e:
             print(f"Error deleting collection: {e}")
 
@@ -183,7 +587,7 @@ class VectorStore:
         file_name = chunk.file_path.name
         return f"{file_name}_{chunk.start_line}_{chunk.end_line}_{index}"
 
-    def _chunk_to_metadata(self, chunk: CodeChunk) -> dict[str, str]:
+    def _chunk_to_metadata(self, chunk: CodeChunk) -> dict[str, str | int]:
         """
         Convert CodeChunk to metadata dictionary.
 
@@ -195,10 +599,12 @@ class VectorStore:
         """
         metadata = {
             "file_path": str(chunk.file_path),
-            "start_line": str(chunk.start_line),
-            "end_line": str(chunk.end_line),
+            "start_line": chunk.start_line,
+            "end_line": chunk.end_line,
             "chunk_type": chunk.chunk_type,
             "language": chunk.language,
+            # Lets listings show chunk sizes without loading documents
+            "char_count": len(chunk.content),
         }
 
         # Add additional metadata from chunk
@@ -206,3 +612,96 @@ class VectorStore:
             metadata[f"meta_{key}"] = str(value)
 
         return metadata
+
+
+def _typed_metadata(metadata: dict) -> dict:
+    """Chunk metadata with line numbers and sizes as integers, also for indexes that stored strings."""
+    if any(isinstance(metadata.get(key), str) for key in _INT_METADATA_KEYS):
+        metadata = {**metadata}
+        for key in _INT_METADATA_KEYS:
+            if isinstance(metadata.get(key), str):
+                metadata[key] = int(metadata[key])
+    return metadata
+
+
+def _replace_file(path: Path, write: Callable[[Path], None]) -> None:
+    """
+    Write a file through a temporary file that then replaces it.
+
+    Readers see either the old or the new file, never a partly written one, and
+    memory maps of the old file stay valid instead of being truncated under them.
+
+    Args:
+        path: File to write
+        write: Writes the new contents to the path it is given
+    """
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def _save_array(path: Path, array: np.ndarray) -> np.ndarray:
+    """Save an array as an .npy file with _replace_file and return a read-only memory map of it."""
+    saved = None
+
+    def write(temp_path: Path):
+        nonlocal saved
+        with open(temp_path, "wb") as f:
+            np.save(f, array)
+        # Mapped before the rename, so the result matches this array even if another writer replaces the file
+        saved = np.load(temp_path, mmap_mode="r")
+
+    _replace_file(path, write)
+    return saved
+
+
+def index_signature(index_path: Path) -> tuple[int, int]:
+    """
+    Cheap change marker for an index directory.
+
+    ChromaDB rewrites chroma.sqlite3 whenever chunks are added, while the
+    directory mtime covers files being created or removed.
+    """
+    database = index_path / "chroma.sqlite3"
+    return index_path.stat().st_mtime_ns, database.stat().st_mtime_ns if database.exists() else 0
+
+
+class VectorStorePool:
+    """Keeps indexes open between requests for long-running servers."""
+
+    def __init__(self):
+        """Initialize an empty pool."""
+        self._stores: dict[Path, tuple[tuple[int, int], VectorStore]] = {}
+        # Servers call get() from worker threads; open each index only once
+        self._lock = threading.Lock()
+
+    def get(self, index_path: Path, index_config: IndexConfig | None = None) -> VectorStore:
+        """
+        Get the open store of an index, reopening it after the index was rebuilt.
+
+        Args:
+            index_path: Index directory; its name is the collection name
+            index_config: Indexing configuration for searches, or None when any
+                open store will do (e.g. for counting chunks)
+
+        Returns:
+            Shared VectorStore for the index
+        """
+        with self._lock:
+            signature = index_signature(index_path)
+            cached = self._stores.get(index_path)
+            if (
+                cached is not None
+                and cached[0] == signature
+                and (index_config is None or cached[1].index_config == index_config)
+            ):
+                return cached[1]
+
+            vector_store = VectorStore(
+                storage_path=index_path, collection_name=index_path.name, index_config=index_config
+            )
+            self._stores[index_path] = (index_signature(index_path), vector_store)
+            return vector_store
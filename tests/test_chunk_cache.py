@@ -0,0 +1,55 @@
+"""
+Tests for the persistent chunk cache.
+"""
+
+from pathlib import Path
+
+from ctxai.chunk_cache import ChunkCache
+from ctxai.chunking import CodeChunk, CodeChunker
+
+
+def _chunk(file_path: Path, content: str) -> CodeChunk:
+    return CodeChunk(
+        content=content,
+        file_path=file_path,
+        start_line=1,
+        end_line=2,
+        chunk_type="function_definition",
+        language="python",
+        metadata={"name": "alpha"},
+    )
+
+
+def test_round_trip_and_invalidation(tmp_path):
+    """Test that entries are returned only while the file contents match."""
+    file_path = tmp_path / "alpha.py"
+    cache = ChunkCache(tmp_path / "chunks.db")
+
+    old_key = ChunkCache.make_key(b"def alpha(): pass", 1000, 100)
+    cache.put(file_path, old_key, [_chunk(file_path, "def alpha(): pass")])
+    cache.flush()
+
+    reopened = ChunkCache(tmp_path / "chunks.db")
+    assert reopened.get_many({file_path: old_key}) == {file_path: [_chunk(file_path, "def alpha(): pass")]}
+
+    new_key = ChunkCache.make_key(b"def alpha(): return 1", 1000, 100)
+    assert reopened.get_many({file_path: new_key}) == {}
+
+
+def test_chunk_files_skips_cached_files(tmp_path, monkeypatch):
+    """Test that chunk_files serves unchanged files from the cache without chunking them."""
+    file_path = tmp_path / "alpha.py"
+    file_path.write_text("def alpha():\n    pass\n")
+    chunker = CodeChunker()
+    cache = ChunkCache(tmp_path / "chunks.db")
+    key = ChunkCache.make_key(file_path.read_bytes(), chunker.max_chunk_size, chunker.overlap)
+    cache.put(file_path, key, [_chunk(file_path, "cached")])
+
+    monkeypatch.setattr(chunker, "chunk_file", lambda path: [_chunk(path, "parsed")])
+
+    results = list(chunker.chunk_files([file_path], max_workers=1, cache=cache))
+    assert [chunk.content for chunk in results[0][1]] == ["cached"]
+
+    file_path.write_text("def alpha():\n    return 1\n")
+    results = list(chunker.chunk_files([file_path], max_workers=1, cache=cache))
+    assert [chunk.content for chunk in results[0][1]] == ["parsed"]
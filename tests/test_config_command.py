@@ -0,0 +1,63 @@
+"""
+Tests for config command functionality.
+"""
+
+import json
+from dataclasses import fields
+
+from ctxai.commands.config_command import _COERCERS, list_config, set_config
+from ctxai.config import ConfigManager, EmbeddingConfig, IndexConfig
+
+
+def test_list_config_prints_key_value_lines_when_piped(tmp_path, monkeypatch, capsys):
+    """Test that piped output is plain key=value lines with empty unset values."""
+    monkeypatch.delenv("CTXAI_HOME", raising=False)
+    set_config("indexing.chunk_size", "1500", project_path=tmp_path)
+    capsys.readouterr()
+
+    list_config(project_path=tmp_path)
+
+    lines = capsys.readouterr().out.splitlines()
+    values = dict(line.split("=", 1) for line in lines)
+    assert len(values) == len(lines)
+    assert values["indexing.chunk_size"] == "1500"
+    assert values["embedding.api_key"] == ""
+    assert values["index.name"] == ""
+    assert "version" in values
+
+
+def test_config_load_sees_changes_written_by_other_managers(tmp_path, monkeypatch):
+    """Test that memoized config parsing is invalidated when the file changes."""
+    monkeypatch.delenv("CTXAI_HOME", raising=False)
+    set_config("indexing.chunk_size", "1500", project_path=tmp_path)
+    assert ConfigManager(tmp_path).load().indexing.chunk_size == 1500
+
+    set_config("indexing.chunk_size", "2500", project_path=tmp_path)
+    config = ConfigManager(tmp_path).load()
+
+    assert config.indexing.chunk_size == 2500
+    assert json.loads(ConfigManager(tmp_path).config_path.read_text())["indexing"]["chunk_size"] == 2500
+    # Saves go through a temporary file that is renamed into place
+    assert [path.name for path in ConfigManager(tmp_path).ctxai_home.iterdir() if path.suffix == ".tmp"] == []
+
+
+def test_every_config_field_is_settable():
+    """Test that the set_config coercion table covers every embedding and indexing field."""
+    expected = {f"embedding.{field.name}" for field in fields(EmbeddingConfig)}
+    expected |= {f"indexing.{field.name}" for field in fields(IndexConfig)}
+
+    assert expected | {"index.name"} == set(_COERCERS)
+
+
+def test_set_config_coerces_and_validates_values(tmp_path, monkeypatch):
+    """Test that values are converted per setting and invalid choices are rejected."""
+    monkeypatch.delenv("CTXAI_HOME", raising=False)
+    set_config("embedding.max_tokens", "none", project_path=tmp_path)
+    set_config("indexing.chunk_cache", "off", project_path=tmp_path)
+    set_config("indexing.index_type", "flat", project_path=tmp_path)
+    set_config("indexing.index_type", "annoy", project_path=tmp_path)
+
+    config = ConfigManager(tmp_path).load()
+    assert config.embedding.max_tokens is None
+    assert config.indexing.chunk_cache is False
+    assert config.indexing.index_type == "flat"
@@ -0,0 +1,130 @@
+"""
+Tests for the dashboard web app.
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("fasthtml", reason="FastHTML not installed")
+
+from starlette.testclient import TestClient
+
+from ctxai.chunking import CodeChunk
+from ctxai.commands import dashboard_command
+from ctxai.embedding_batcher import EmbeddingBatcher
+from ctxai.vector_store import VectorStore
+
+QUERY_VECTORS = {"auth": [1.0, 0.0, 0.0], "sessions": [0.0, 1.0, 0.0]}
+
+
+class _RecordingProvider:
+    """Embedding provider that records each batch it is asked to embed."""
+
+    def __init__(self):
+        self.batches = []
+
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(texts)
+        return [QUERY_VECTORS[text] for text in texts]
+
+
+def _make_chunk(name: str) -> CodeChunk:
+    return CodeChunk(
+        content=f"def {name}():\n    pass",
+        file_path=Path(f"/project/{name}.py"),
+        start_line=1,
+        end_line=2,
+        chunk_type="function_definition",
+        language="python",
+        metadata={"name": name},
+    )
+
+
+@pytest.fixture
+def ctxai_home(tmp_path, monkeypatch):
+    home = tmp_path / ".ctxai"
+    (home / "indexes").mkdir(parents=True)
+    monkeypatch.setenv("CTXAI_HOME", str(home))
+    # FastHTML writes its session key to .sesskey in the working directory
+    monkeypatch.chdir(tmp_path)
+    return home
+
+
+@pytest.fixture
+def provider():
+    return _RecordingProvider()
+
+
+@pytest.fixture
+def client(ctxai_home, provider):
+    """Test client for the dashboard app, without the warm-up thread or a real server."""
+    batcher = EmbeddingBatcher(provider, max_wait_ms=50)
+    with (
+        patch.object(dashboard_command, "serve") as serve,
+        patch.object(dashboard_command, "threading"),
+        patch.object(dashboard_command.EmbeddingBatcherPool, "get", return_value=batcher),
+    ):
+        dashboard_command.start_dashboard()
+        with TestClient(serve.call_args.kwargs["app"]) as test_client:
+            yield test_client
+
+
+def _open_index(ctxai_home: Path, name: str = "demo") -> VectorStore:
+    return VectorStore(ctxai_home / "indexes" / name, name)
+
+
+def test_index_page_shows_the_requested_page_of_chunks(ctxai_home, client):
+    """Test that page and size select the chunk rows and the pager links."""
+    names = [f"func_{i}" for i in range(5)]
+    _open_index(ctxai_home).add_chunks([_make_chunk(name) for name in names], [[1.0, 0.0, 0.0]] * len(names))
+
+    response = client.get("/index/demo?page=1&size=2")
+
+    assert response.status_code == 200
+    assert "<td>3</td>" in response.text and "<td>4</td>" in response.text
+    assert "<td>2</td>" not in response.text and "<td>5</td>" not in response.text
+    assert "func_2.py" in response.text and "func_3.py" in response.text
+    assert "func_1.py" not in response.text and "func_4.py" not in response.text
+    assert 'href="/index/demo?page=0&amp;size=2"' in response.text
+    assert 'href="/index/demo?page=2&amp;size=2"' in response.text
+
+
+def test_multi_query_dedupes_and_embeds_in_one_batch(ctxai_home, client, provider):
+    """Test that repeated lines run once and the distinct queries share one embedding call."""
+    _open_index(ctxai_home).add_chunks([_make_chunk("login"), _make_chunk("store")], list(QUERY_VECTORS.values()))
+
+    response = client.post(
+        "/query/multi", data={"index": "demo", "queries": "auth\nsessions\n auth \n", "n_results": 1}
+    )
+
+    assert response.status_code == 200
+    assert "Ran 2 queries" in response.text
+    assert provider.batches == [["auth", "sessions"]]
+    assert "login.py" in response.text and "store.py" in response.text
+
+
+def test_reindexing_invalidates_cached_results(ctxai_home, client, provider):
+    """Test that results cached for an index are dropped once the index changes."""
+    _open_index(ctxai_home).add_chunks([_make_chunk("old_auth")], [[0.8, 0.6, 0.0]])
+    first = client.post("/query/search", data={"index": "demo", "query": "auth", "n_results": 1})
+    assert "old_auth.py" in first.text
+
+    _open_index(ctxai_home).add_chunks([_make_chunk("new_auth")], [[1.0, 0.0, 0.0]], start_index=1)
+    second = client.post("/query/search", data={"index": "demo", "query": "auth", "n_results": 1})
+
+    assert "new_auth.py" in second.text
+    # The query embedding itself is still reused
+    assert provider.batches == [["auth"]]
+
+
+def test_home_and_settings_pages_render(ctxai_home, client):
+    """Test that the pages showing CTXAI home details render."""
+    _open_index(ctxai_home)
+
+    home = client.get("/")
+    settings = client.get("/settings")
+
+    assert home.status_code == 200 and 'href="/index/demo"' in home.text
+    assert settings.status_code == 200 and "Global (CTXAI_HOME)" in settings.text
@@ -0,0 +1,51 @@
+"""
+Tests for the embedding daemon.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ctxai import embed_daemon
+from ctxai.config import EmbeddingConfig
+from ctxai.embeddings import BaseEmbeddingProvider
+
+pytestmark = pytest.mark.skipif(not embed_daemon.UNIX_SOCKETS_AVAILABLE, reason="requires Unix sockets")
+
+
+class LengthProvider(BaseEmbeddingProvider):
+    """Fake provider embedding each text as its length."""
+
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        return [[float(len(text))] for text in texts]
+
+    def get_dimension(self) -> int:
+        return 1
+
+
+def test_request_without_daemon_returns_none(tmp_path):
+    """Test that clients fall back when no daemon is listening."""
+    config = EmbeddingConfig(provider="local")
+    assert embed_daemon.request_embeddings(config, ["alpha"], tmp_path / "embed.sock") is None
+
+
+def test_daemon_serves_matching_model_only(tmp_path, monkeypatch):
+    """Test a round trip through the daemon and rejection of a different model."""
+    monkeypatch.setattr(embed_daemon.EmbeddingsFactory, "create", staticmethod(lambda config: LengthProvider(config)))
+    # Keep the socket path short; Unix socket paths are limited to ~100 characters
+    socket_path = tmp_path / "e.sock"
+    config = EmbeddingConfig(provider="local")
+
+    threading.Thread(target=embed_daemon.serve_embeddings, args=(config, socket_path), daemon=True).start()
+    for _ in range(100):
+        if socket_path.exists():
+            break
+        time.sleep(0.01)
+
+    embeddings = embed_daemon.request_embeddings(config, ["ab", "abcd"], socket_path)
+    assert embeddings.dtype == np.float32
+    assert embeddings.tolist() == [[2.0], [4.0]]
+    other = EmbeddingConfig(provider="openai", model="text-embedding-3-small")
+    assert embed_daemon.request_embeddings(other, ["ab"], socket_path) is None
@@ -0,0 +1,81 @@
+"""
+Tests for query embedding micro-batching.
+"""
+
+import asyncio
+
+import pytest
+
+from ctxai.config import EmbeddingConfig
+from ctxai.embedding_batcher import EmbeddingBatcher, EmbeddingBatcherPool
+from ctxai.embeddings import BaseEmbeddingProvider
+
+
+class RecordingProvider(BaseEmbeddingProvider):
+    """Fake provider that records the batches it receives."""
+
+    def __init__(self, config: EmbeddingConfig):
+        super().__init__(config)
+        self.calls: list[list[str]] = []
+
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    def get_dimension(self) -> int:
+        return 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_share_one_batch():
+    """Test that concurrent embed() calls are coalesced and results are routed back."""
+    provider = RecordingProvider(EmbeddingConfig(provider="local"))
+    batcher = EmbeddingBatcher(provider, max_batch_size=8, max_wait_ms=50)
+
+    results = await asyncio.gather(*(batcher.embed(text) for text in ["a", "bb", "ccc"]))
+
+    assert results == [[1.0], [2.0], [3.0]]
+    assert provider.calls == [["a", "bb", "ccc"]]
+
+
+@pytest.mark.asyncio
+async def test_batches_respect_max_batch_size():
+    """Test that a burst larger than max_batch_size is split across calls."""
+    provider = RecordingProvider(EmbeddingConfig(provider="local"))
+    batcher = EmbeddingBatcher(provider, max_batch_size=2, max_wait_ms=50)
+
+    results = await asyncio.gather(*(batcher.embed(text) for text in ["a", "bb", "ccc"]))
+
+    assert results == [[1.0], [2.0], [3.0]]
+    assert [len(call) for call in provider.calls] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_batches_respect_max_batch_chars():
+    """Test that a text exceeding the character budget is moved to the next call."""
+    provider = RecordingProvider(EmbeddingConfig(provider="local"))
+    batcher = EmbeddingBatcher(provider, max_batch_size=8, max_wait_ms=50, max_batch_chars=5)
+
+    results = await asyncio.gather(*(batcher.embed(text) for text in ["a", "bb", "ccc", "dddddd"]))
+
+    assert results == [[1.0], [2.0], [3.0], [6.0]]
+    assert provider.calls == [["a", "bb"], ["ccc"], ["dddddd"]]
+
+
+@pytest.mark.asyncio
+async def test_pool_serves_repeated_queries_from_disk_cache(tmp_path, monkeypatch):
+    """Test that a pool with a cache path reuses embeddings across pool instances."""
+    providers = []
+
+    def create(config):
+        providers.append(RecordingProvider(config))
+        return providers[-1]
+
+    monkeypatch.setattr("ctxai.embedding_batcher.EmbeddingsFactory.create", create)
+    config = EmbeddingConfig(provider="local", storage_dtype="float32")
+
+    first = await EmbeddingBatcherPool(tmp_path / "embeddings.db").get(config).embed("query")
+    second = await EmbeddingBatcherPool(tmp_path / "embeddings.db").get(config).embed("query")
+
+    assert first == second == [5.0]
+    assert [provider.calls for provider in providers] == [[["query"]], []]
@@ -0,0 +1,95 @@
+"""
+Tests for the persistent embedding cache.
+"""
+
+import numpy as np
+import pytest
+
+from ctxai.config import EmbeddingConfig
+from ctxai.embedding_cache import CachedEmbeddingProvider, EmbeddingCache
+from ctxai.embeddings import BaseEmbeddingProvider
+
+
+class CountingProvider(BaseEmbeddingProvider):
+    """Fake provider that records which texts it was asked to embed."""
+
+    def __init__(self, config: EmbeddingConfig):
+        super().__init__(config)
+        self.calls: list[list[str]] = []
+
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+    def get_dimension(self) -> int:
+        return 3
+
+
+def test_cached_provider_only_embeds_misses(tmp_path):
+    """Test that cached texts are not sent to the underlying provider again."""
+    provider = CountingProvider(EmbeddingConfig(provider="local"))
+    cached = CachedEmbeddingProvider(provider, EmbeddingCache(tmp_path / "embeddings.db"))
+
+    first = cached.generate_embeddings(["alpha", "beta"])
+    second = cached.generate_embeddings(["beta", "gamma", "alpha"])
+
+    assert provider.calls == [["alpha", "beta"], ["gamma"]]
+    assert second[0] == first[1]
+    assert second[2] == first[0]
+    assert cached.hits == 2
+    assert cached.misses == 3
+
+    matrix = cached.generate_embeddings_array(["gamma", "beta"])
+    assert matrix.dtype == np.float32
+    assert matrix.tolist() == [second[1], first[1]]
+
+    # Repeated uncached texts are sent to the provider once
+    repeated = cached.generate_embeddings(["delta", "delta", "gamma", "delta"])
+    assert provider.calls[-1] == ["delta"]
+    assert repeated[0] == repeated[1] == repeated[3]
+
+
+def test_cache_persists_across_instances(tmp_path):
+    """Test that embeddings survive reopening the cache."""
+    cache_path = tmp_path / "embeddings.db"
+    provider = CountingProvider(EmbeddingConfig(provider="local"))
+    CachedEmbeddingProvider(provider, EmbeddingCache(cache_path)).generate_embeddings(["alpha"])
+
+    reopened = CachedEmbeddingProvider(provider, EmbeddingCache(cache_path))
+    assert reopened.generate_embeddings(["alpha"]) == [[5.0, 1.0, 0.5]]
+    assert len(provider.calls) == 1
+
+
+def test_cache_is_namespaced_by_model(tmp_path):
+    """Test that different models never share cache entries."""
+    cache = EmbeddingCache(tmp_path / "embeddings.db")
+    small = CountingProvider(EmbeddingConfig(provider="openai", model="small"))
+    large = CountingProvider(EmbeddingConfig(provider="openai", model="large"))
+
+    CachedEmbeddingProvider(small, cache).generate_embeddings(["alpha"])
+    CachedEmbeddingProvider(large, cache).generate_embeddings(["alpha"])
+
+    assert small.calls == [["alpha"]]
+    assert large.calls == [["alpha"]]
+
+
+def test_int8_storage_round_trip(tmp_path):
+    """Test that int8-quantized cache entries decode close to the original vectors."""
+    cache = EmbeddingCache(tmp_path / "embeddings.db", storage_dtype="int8")
+    vector = [0.25, -0.5, 0.125, 1.0]
+    cache.put_many({"key": vector})
+
+    decoded = cache.get_many(["key"])["key"]
+
+    assert len(decoded) == len(vector)
+    assert all(abs(a - b) < 0.01 for a, b in zip(decoded, vector))
+
+
+def test_mixed_storage_dtypes_stay_readable(tmp_path):
+    """Test that entries written with another storage dtype still decode correctly."""
+    cache_path = tmp_path / "embeddings.db"
+    EmbeddingCache(cache_path, storage_dtype="float32").put_many({"key": [0.1, 0.2, 0.3]})
+
+    decoded = EmbeddingCache(cache_path, storage_dtype="int8").get_many(["key"])["key"]
+
+    assert decoded == pytest.approx([0.1, 0.2, 0.3])
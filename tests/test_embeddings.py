@@ -0,0 +1,60 @@
+"""
+Tests for the embedding providers.
+"""
+
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+from ctxai.embeddings import LocalEmbeddingProvider
+
+
+def test_local_provider_halves_batches_that_run_out_of_memory():
+    """Test that an out-of-memory batch is split and retried instead of returning zero vectors."""
+
+    class FakeModel:
+        def encode(self, texts, **kwargs):
+            if len(texts) > 2:
+                raise RuntimeError("CUDA out of memory. Tried to allocate 2.00 GiB")
+            return np.array([[float(len(text)), 1.0] for text in texts])
+
+    provider = object.__new__(LocalEmbeddingProvider)
+    provider.batch_size = 8
+    provider.model = FakeModel()
+    provider._dimension = 2
+
+    embeddings = provider.generate_embeddings(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    assert [embedding[0] for embedding in embeddings] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_local_provider_uses_a_process_pool_across_gpus(monkeypatch):
+    """Test that multi_gpu() encodes through one pool worker per GPU and stops the pool afterwards."""
+    cuda = SimpleNamespace(is_available=lambda: True, device_count=lambda: 2)
+    monkeypatch.setitem(sys.modules, "torch", SimpleNamespace(cuda=cuda))
+
+    class FakeModel:
+        stopped = False
+
+        def start_multi_process_pool(self, devices):
+            return {"devices": devices}
+
+        def stop_multi_process_pool(self, pool):
+            self.stopped = True
+
+        def encode_multi_process(self, texts, pool, chunk_size, **kwargs):
+            assert pool == {"devices": ["cuda:0", "cuda:1"]}
+            assert chunk_size == 2
+            return np.ones((len(texts), 2))
+
+    provider = object.__new__(LocalEmbeddingProvider)
+    provider.batch_size = 8
+    provider.model = FakeModel()
+    provider._dimension = 2
+
+    with provider.multi_gpu():
+        assert provider.generate_embeddings(["a", "b", "c"]) == [[1.0, 1.0]] * 3
+
+    assert provider.model.stopped
+    assert provider._pool is None
@@ -0,0 +1,34 @@
+"""
+Tests for package import behavior.
+"""
+
+import subprocess
+import sys
+
+
+def test_package_import_is_lazy():
+    """Test that importing ctxai and the config command doesn't load heavy dependencies."""
+    code = (
+        "import sys, ctxai, ctxai.commands.config_command; "
+        "print(','.join(m for m in ('chromadb', 'tree_sitter', 'numpy', 'torch') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_attributes_resolve():
+    """Test that public names are still importable from the package."""
+    import ctxai
+
+    assert ctxai.VectorStore.__name__ == "VectorStore"
+    assert "CodeChunker" in dir(ctxai)
+
+
+def test_command_exports_resolve():
+    """Test that every exported command name is mapped to and found in its module."""
+    import ctxai.commands as commands
+
+    assert sorted(commands.__all__) == sorted(commands._LAZY_IMPORTS)
+    for name in commands.__all__:
+        assert callable(getattr(commands, name))
@@ -0,0 +1,31 @@
+"""
+Tests for the index manifest.
+"""
+
+import pytest
+
+from ctxai.index_manifest import IndexManifest
+
+
+def test_manifest_round_trip_and_diff(tmp_path):
+    """Test that a saved manifest loads back and reports changed and removed files."""
+    kept, edited = tmp_path / "kept.py", tmp_path / "edited.py"
+    kept.write_text("a")
+    edited.write_text("b")
+    manifest = IndexManifest({"chunk_size": 1000}, IndexManifest.stat_files([kept, edited]), next_chunk_index=2)
+    manifest.files["gone.py"] = [0, 1]
+    manifest.save(tmp_path)
+
+    loaded = IndexManifest.load(tmp_path)
+    edited.write_text("changed")
+
+    assert loaded.settings == {"chunk_size": 1000}
+    assert loaded.next_chunk_index == 2
+    assert loaded.diff(IndexManifest.stat_files([kept, edited])) == ([str(edited)], ["gone.py"])
+
+
+@pytest.mark.parametrize("content", ["", "{not json", "[]", "null", '{"version": 0}'])
+def test_unusable_manifests_load_as_none(tmp_path, content):
+    """Test that unreadable, non-object and outdated manifests are treated as missing."""
+    (tmp_path / IndexManifest.FILE_NAME).write_text(content)
+    assert IndexManifest.load(tmp_path) is None
@@ -3,11 +3,23 @@ Test the indexing functionality.
 """
 
 import shutil
+import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
 
 from ctxai.chunking import CodeChunk, CodeChunker
+from ctxai.commands.index_command import index_codebase
+from ctxai.config import ConfigManager
+from ctxai.embeddings import BaseEmbeddingProvider, EmbeddingsFactory
+from ctxai.index_manifest import IndexManifest
 from ctxai.traversal import CodeTraversal
+from ctxai.utils import get_indexes_dir
+from ctxai.vector_store import VectorStore
 
 
 def test_code_traversal():
@@ -110,6 +122,36 @@ def test_include_patterns():
         assert files[0].name == "test.py"
 
 
+def test_nested_directories_and_excludes():
+    """Test that traversal descends into subdirectories but skips excluded ones."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+
+        (tmpdir_path / "src" / "pkg").mkdir(parents=True)
+        (tmpdir_path / "src" / "pkg" / "module.py").write_text("# Module")
+        (tmpdir_path / "node_modules" / "lib").mkdir(parents=True)
+        (tmpdir_path / "node_modules" / "lib" / "index.js").write_text("// Dependency")
+
+        traversal = CodeTraversal(tmpdir_path)
+        files = list(traversal.traverse())
+
+        assert [f.relative_to(tmpdir_path).as_posix() for f in files] == ["src/pkg/module.py"]
+
+
+def test_parallel_traversal_matches_serial_order(tmp_path):
+    """Test that the threaded traversal finds the same files in the same order as traverse()."""
+    for directory in ("b/c", "b/a", "a", "d/e/f", "node_modules/x"):
+        (tmp_path / directory).mkdir(parents=True)
+        for name in ("z.py", "m.py"):
+            (tmp_path / directory / name).write_text("x = 1")
+    (tmp_path / "top.py").write_text("x = 1")
+
+    traversal = CodeTraversal(tmp_path)
+
+    assert list(traversal.traverse_parallel(max_workers=4)) == list(traversal.traverse())
+    assert len(list(traversal.traverse())) == 9
+
+
 if __name__ == "__main__":
     test_code_traversal()
     print("✓ Code traversal test passed")
@@ -124,3 +166,434 @@ if __name__ == "__main__":
     print("✓ Include patterns test passed")
 
     print("\n✅ All tests passed!")
+
+
+def test_chunk_files_parallel_matches_serial(tmp_path, monkeypatch):
+    """Test that process-pool chunking returns the same chunks, in order, as serial chunking."""
+    from ctxai import chunking
+
+    monkeypatch.setattr(chunking, "_MIN_FILES_FOR_PROCESS_POOL", 1)
+    file_paths = []
+    for i in range(6):
+        # Mix parsed and plain-text files to check that results stay in input order
+        file_path = tmp_path / (f"module_{i}.py" if i % 2 else f"notes_{i}.txt")
+        file_path.write_text("\n".join(f"value_{n} = {i}" for n in range(50)))
+        file_paths.append(file_path)
+
+    chunker = CodeChunker(max_chunk_size=200, overlap=20)
+    serial = list(chunker.chunk_files(file_paths, max_workers=1))
+    parallel = list(chunker.chunk_files(file_paths, max_workers=2, chunksize=2))
+
+    assert [path for path, _, _ in parallel] == file_paths
+    assert parallel == serial
+    assert all(error is None for _, _, error in parallel)
+
+
+def test_chunk_files_bounds_queued_tasks(tmp_path, monkeypatch):
+    """Test that the process pool is fed a few tasks at a time instead of every file up front."""
+    from ctxai import chunking
+
+    submitted = []
+    real_submit_ahead = chunking.submit_ahead
+
+    def counting_submit_ahead(executor, fn, iterable, max_pending):
+        def counted():
+            for item in iterable:
+                submitted.append(item)
+                yield item
+
+        return real_submit_ahead(executor, fn, counted(), max_pending)
+
+    monkeypatch.setattr(chunking, "_MIN_FILES_FOR_PROCESS_POOL", 1)
+    monkeypatch.setattr(chunking, "submit_ahead", counting_submit_ahead)
+    file_paths = []
+    for i in range(40):
+        file_path = tmp_path / f"module_{i}.py"
+        file_path.write_text(f"value = {i}\n")
+        file_paths.append(file_path)
+
+    results = CodeChunker().chunk_files(file_paths, max_workers=2, chunksize=1)
+    first_path, _, error = next(results)
+    results.close()
+
+    assert first_path == file_paths[0] and error is None
+    assert len(submitted) <= 2 * chunking._TASKS_PER_WORKER + 1
+
+
+def test_split_large_chunk_advances_line_numbers():
+    """Test that sub-chunks of a large node report their own line ranges."""
+    chunker = CodeChunker(max_chunk_size=40, overlap=0)
+    content = "\n".join(f"line_{n:02d} = {n}" for n in range(12))
+
+    chunks = chunker._split_large_chunk(content, Path("big.py"), 9, "function_definition", "python", {})
+
+    assert chunks[0].start_line == 10
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start_line == previous.end_line + 1
+        assert chunk.content.split("\n")[0] == content.split("\n")[chunk.start_line - 10]
+
+
+def test_parsers_are_loaded_once_per_thread(monkeypatch):
+    """Test that warmup loads each parser once and threads do not share parsers."""
+    import threading
+
+    from ctxai import chunking
+
+    loaded = []
+    monkeypatch.setattr(chunking, "get_parser", lambda language: loaded.append(language) or object())
+
+    chunker = CodeChunker()
+    chunker.warmup(["python", "python", "markdown", None])
+    parser = chunker._get_parser("python")
+    assert loaded == ["python"]
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(chunker._get_parser("python")))
+    thread.start()
+    thread.join()
+    assert other[0] is not parser
+    assert loaded == ["python", "python"]
+
+
+class _FakeNode:
+    """Minimal stand-in for a tree-sitter node spanning whole lines of the source."""
+
+    def __init__(self, type, line, end_line, children=(), source=b""):
+        self.type = type
+        self.start_point = (line, 0)
+        self.end_point = (end_line, 0)
+        self.children = list(children)
+        lines = source.split(b"\n")
+        self.start_byte = sum(len(text) + 1 for text in lines[:line])
+        self.end_byte = self.start_byte + len(b"\n".join(lines[line : end_line + 1]))
+
+    def walk(self):
+        return _FakeCursor(self)
+
+
+class _FakeCursor:
+    """TreeCursor over _FakeNode trees, confined to the subtree it started from."""
+
+    def __init__(self, root):
+        self._path = [(root, None, 0)]
+
+    @property
+    def node(self):
+        return self._path[-1][0]
+
+    def goto_first_child(self):
+        if not self.node.children:
+            return False
+        self._path.append((self.node.children[0], self.node, 0))
+        return True
+
+    def goto_next_sibling(self):
+        _, parent, index = self._path[-1]
+        if parent is None or index + 1 >= len(parent.children):
+            return False
+        self._path[-1] = (parent.children[index + 1], parent, index + 1)
+        return True
+
+    def goto_parent(self):
+        if len(self._path) == 1:
+            return False
+        self._path.pop()
+        return True
+
+
+def test_extract_chunks_from_tree_walks_in_order_without_descending_into_chunks():
+    """Test that chunk nodes are emitted in document order and their children are not revisited."""
+    source = b"import os\nclass A:\n    def f(self):\n        pass\nif True:\n    def g():\n        pass"
+
+    def node(type, line, end_line, *children):
+        return _FakeNode(type, line, end_line, children, source)
+
+    tree = node(
+        "module",
+        0,
+        6,
+        node("import_statement", 0, 0),
+        node("class_definition", 1, 3, node("identifier", 1, 1), node("function_definition", 2, 3)),
+        node("if_statement", 4, 6, node("block", 5, 6, node("function_definition", 5, 6))),
+    )
+
+    chunker = CodeChunker()
+    chunks = chunker._extract_chunks_from_tree(
+        tree, source, Path("m.py"), "python", CodeChunker.CHUNK_NODE_TYPES["python"]
+    )
+
+    assert [(chunk.chunk_type, chunk.start_line, chunk.end_line) for chunk in chunks] == [
+        ("import_statement", 1, 1),
+        ("class_definition", 2, 4),
+        ("function_definition", 6, 7),
+    ]
+    assert chunks[2].content == "    def g():\n        pass"
+
+
+def test_batch_iter_chunks_fills_batches_across_files(tmp_path):
+    """Test that batches span file boundaries and keep every chunk in order."""
+    file_paths = []
+    for i in range(3):
+        file_path = tmp_path / f"notes_{i}.txt"
+        file_path.write_text("\n".join(f"line {n} of file {i}" for n in range(30)))
+        file_paths.append(file_path)
+
+    chunker = CodeChunker(max_chunk_size=100, overlap=0)
+    batches = list(chunker.batch_iter_chunks(file_paths, batch_size=4))
+
+    assert all(len(batch) == 4 for batch in batches[:-1])
+    assert [chunk for batch in batches for chunk in batch] == list(chunker.iter_chunks(file_paths))
+    assert any(len({chunk.file_path for chunk in batch}) > 1 for batch in batches)
+
+
+class _SlowParser:
+    """Parser stand-in that reads its input through the callback and reports slow progress."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.sources = []
+
+    def parse(self, read, progress_callback=None):
+        import time
+
+        source = b""
+        while data := read(len(source), (0, 0)):
+            source += data
+        self.sources.append(source)
+        time.sleep(self.seconds)
+        if progress_callback is not None and progress_callback(None):
+            return None
+        return _FakeNode("module", 0, 0, (), source)
+
+
+def test_slow_or_oversized_files_fall_back_to_text_chunks(tmp_path, monkeypatch, capsys):
+    """Test that parses over the time budget, and files over the size cap, are text-chunked."""
+    from ctxai import chunking
+
+    parser = _SlowParser(seconds=0.05)
+    monkeypatch.setattr(chunking, "get_parser", lambda language: parser)
+    file_path = tmp_path / "generated.py"
+    file_path.write_text("x = 1\n" * 20000)
+
+    chunks = CodeChunker(parse_timeout_ms=10).chunk_file(file_path)
+    assert parser.sources == [file_path.read_bytes()]
+    assert chunks and all(chunk.chunk_type == "text" for chunk in chunks)
+    assert "took over 10 ms" in capsys.readouterr().out
+
+    parser.sources.clear()
+    chunks = CodeChunker(max_parse_bytes=1024).chunk_file(file_path)
+    assert parser.sources == []
+    assert chunks and all(chunk.chunk_type == "text" for chunk in chunks)
+
+
+def test_large_sources_are_memory_mapped_and_read_in_slices(tmp_path, monkeypatch):
+    """Test that memory-mapped sources reach the parser intact, slice by slice."""
+    import mmap
+
+    from ctxai import chunking
+
+    parser = _SlowParser(seconds=0)
+    monkeypatch.setattr(chunking, "get_parser", lambda language: parser)
+    file_path = tmp_path / "big.py"
+    file_path.write_text("y = 2\n" * 50000)
+
+    with chunking._read_source(file_path) as source_code:
+        assert isinstance(source_code, mmap.mmap)
+
+    CodeChunker(parse_timeout_ms=0).chunk_file(file_path)
+    assert parser.sources == [file_path.read_bytes()]
+
+
+def test_compiled_globs_match_like_path_match():
+    """Test that precompiled include/exclude globs agree with Path.match."""
+    from ctxai.traversal import _compile_globs, _match_globs
+
+    patterns = ["*.py", "tests/*", "docs/*.md", "/repo/*.cfg", "build", "*.min.*", "data/**/x.json", "[!_]*.txt"]
+    paths = [
+        Path("/repo/src/app.py"),
+        Path("/repo/tests/test_app.py"),
+        Path("/repo/src/tests/helper.js"),
+        Path("/repo/docs/guide/intro.md"),
+        Path("/repo/docs/intro.md"),
+        Path("/repo/setup.cfg"),
+        Path("/repo/src/setup.cfg"),
+        Path("/repo/build"),
+        Path("/repo/static/app.min.js"),
+        Path("/repo/data/raw/x.json"),
+        Path("/repo/notes.txt"),
+        Path("/repo/_private.txt"),
+        Path("relative/file.py"),
+    ]
+
+    for pattern in patterns:
+        compiled = _compile_globs([pattern])
+        for path in paths:
+            assert _match_globs(path, compiled) == path.match(pattern), (pattern, path)
+
+
+class _RecordingProvider(BaseEmbeddingProvider):
+    """Fake provider that records the texts it embeds."""
+
+    texts: list[str] = []
+
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        _RecordingProvider.texts.extend(texts)
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+    def get_dimension(self) -> int:
+        return 3
+
+
+def test_reindexing_only_processes_changed_files(tmp_path, monkeypatch):
+    """Test that a second run re-embeds only modified files and drops chunks of removed ones."""
+    monkeypatch.delenv("CTXAI_HOME", raising=False)
+    monkeypatch.setitem(EmbeddingsFactory._providers, "recording", _RecordingProvider)
+    monkeypatch.setattr(_RecordingProvider, "texts", [])
+    project = tmp_path / "project"
+    project.mkdir()
+    for name in ("a", "b", "c"):
+        (project / f"{name}.txt").write_text(f"contents of {name}")
+
+    config_manager = ConfigManager(project)
+    config = config_manager.load()
+    config.embedding.provider = "recording"
+    config.embedding.cache = False
+    config.indexing.chunk_cache = False
+    config_manager.save(config)
+
+    index_codebase(project, "test-index")
+    assert len(_RecordingProvider.texts) == 3
+
+    _RecordingProvider.texts.clear()
+    (project / "a.txt").write_text("new contents of a")
+    (project / "c.txt").unlink()
+    index_codebase(project, "test-index")
+
+    assert _RecordingProvider.texts == ["new contents of a"]
+    stored = VectorStore(get_indexes_dir(project) / "test-index", "test-index").collection.get()
+    assert sorted(stored["documents"]) == ["contents of b", "new contents of a"]
+    assert len(set(stored["ids"])) == 2
+
+
+def test_files_that_failed_to_chunk_are_retried(tmp_path, monkeypatch):
+    """Test that a file whose chunking failed is left out of the manifest and indexed on the next run."""
+    monkeypatch.delenv("CTXAI_HOME", raising=False)
+    monkeypatch.setitem(EmbeddingsFactory._providers, "recording", _RecordingProvider)
+    monkeypatch.setattr(_RecordingProvider, "texts", [])
+    project = tmp_path / "project"
+    project.mkdir()
+    for name in ("good", "bad"):
+        (project / f"{name}.txt").write_text(f"contents of {name}")
+
+    config_manager = ConfigManager(project)
+    config = config_manager.load()
+    config.embedding.provider = "recording"
+    config.embedding.cache = False
+    config.indexing.chunk_cache = False
+    config_manager.save(config)
+
+    chunk_file = CodeChunker.chunk_file
+
+    def failing_chunk_file(self, file_path):
+        if file_path.name == "bad.txt":
+            raise OSError("temporarily unreadable")
+        return chunk_file(self, file_path)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(CodeChunker, "chunk_file", failing_chunk_file)
+        index_codebase(project, "test-index")
+    assert _RecordingProvider.texts == ["contents of good"]
+
+    _RecordingProvider.texts.clear()
+    index_codebase(project, "test-index")
+
+    assert _RecordingProvider.texts == ["contents of bad"]
+    stored = VectorStore(get_indexes_dir(project) / "test-index", "test-index").collection.get()
+    assert sorted(stored["documents"]) == ["contents of bad", "contents of good"]
+
+
+class _FailingProvider(_RecordingProvider):
+    """Fake provider whose requests fail."""
+
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        raise RuntimeError("embedding service unavailable")
+
+
+def test_embedding_errors_fail_the_run_and_are_retried(tmp_path, monkeypatch):
+    """Test that an embedding error marks the run failed and the changed file is embedded on the next run."""
+    monkeypatch.delenv("CTXAI_HOME", raising=False)
+    monkeypatch.setitem(EmbeddingsFactory._providers, "recording", _RecordingProvider)
+    monkeypatch.setitem(EmbeddingsFactory._providers, "failing", _FailingProvider)
+    monkeypatch.setattr(_RecordingProvider, "texts", [])
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.txt").write_text("contents of a")
+
+    config_manager = ConfigManager(project)
+    config = config_manager.load()
+    config.embedding.provider = "recording"
+    config.embedding.cache = False
+    config.indexing.chunk_cache = False
+    config_manager.save(config)
+    # The provider is part of the index settings; keep them fixed so runs only re-index changed files
+    monkeypatch.setattr("ctxai.commands.index_command._index_settings", lambda *args: {"fixed": True})
+    index_codebase(project, "test-index")
+
+    (project / "a.txt").write_text("new contents of a")
+    config.embedding.provider = "failing"
+    ConfigManager(project).save(config)
+    with pytest.raises(RuntimeError, match="unavailable"):
+        index_codebase(project, "test-index")
+    assert ConfigManager(project).load().index_status == "failed"
+
+    _RecordingProvider.texts.clear()
+    config.embedding.provider = "recording"
+    ConfigManager(project).save(config)
+    index_codebase(project, "test-index")
+
+    assert _RecordingProvider.texts == ["new contents of a"]
+    assert ConfigManager(project).load().index_status == "completed"
+
+
+def test_chunks_of_a_failed_run_are_dropped_when_the_file_is_deleted(tmp_path, monkeypatch):
+    """Test that files a failed run partly stored are cleaned up next run and their chunk IDs stay reserved."""
+    monkeypatch.delenv("CTXAI_HOME", raising=False)
+    monkeypatch.setitem(EmbeddingsFactory._providers, "recording", _RecordingProvider)
+    monkeypatch.setattr(_RecordingProvider, "texts", [])
+    project = tmp_path / "project"
+    project.mkdir()
+    for name in ("a", "b"):
+        (project / f"{name}.txt").write_text(f"contents of {name}")
+
+    config_manager = ConfigManager(project)
+    config = config_manager.load()
+    config.embedding.provider = "recording"
+    config.embedding.cache = False
+    config.indexing.chunk_cache = False
+    config_manager.save(config)
+    index_codebase(project, "test-index")
+
+    for name in ("a", "b"):
+        (project / f"{name}.txt").write_text(f"new contents of {name}")
+    add_chunks = VectorStore.add_chunks
+
+    def add_then_fail(self, *args, **kwargs):
+        add_chunks(self, *args, **kwargs)
+        raise RuntimeError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(VectorStore, "add_chunks", add_then_fail)
+        with pytest.raises(RuntimeError, match="disk full"):
+            index_codebase(project, "test-index")
+
+    index_path = get_indexes_dir(project) / "test-index"
+    manifest = IndexManifest.load(index_path)
+    assert manifest.next_chunk_index == 4
+    assert manifest.files[str(project / "a.txt")] == IndexManifest.UNFINISHED
+
+    (project / "a.txt").unlink()
+    index_codebase(project, "test-index")
+
+    stored = VectorStore(index_path, "test-index").collection.get()
+    assert stored["documents"] == ["new contents of b"]
+    assert stored["ids"][0].endswith("_4")
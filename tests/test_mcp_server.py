@@ -56,3 +56,80 @@ async def test_server_with_project_path(tmp_path):
     server = create_server(project_path=project_path)
     assert server is not None
     assert server.name == "ctxai"
+
+
+@pytest.mark.asyncio
+async def test_repeated_queries_reuse_the_query_embedding(tmp_path, monkeypatch):
+    """Test that query_codebase embeds a repeated query only once."""
+    monkeypatch.delenv("CTXAI_HOME", raising=False)
+    project_path = tmp_path / "project"
+    project_path.mkdir()
+    (project_path / ".ctxai" / "indexes" / "demo").mkdir(parents=True)
+
+    batcher = Mock()
+    batcher.embed = AsyncMock(return_value=[1.0, 0.0])
+    vector_store = Mock()
+    vector_store.search.return_value = []
+
+    with (
+        patch("ctxai.commands.server_command.EmbeddingBatcherPool.get", return_value=batcher),
+        patch("ctxai.commands.server_command.VectorStorePool.get", return_value=vector_store),
+    ):
+        server = create_server(project_path=project_path)
+        query_codebase = server._tool_manager._tools["query_codebase"].fn
+        await query_codebase("demo", "where is auth handled?")
+        await query_codebase("demo", "where is auth handled?")
+
+    assert batcher.embed.await_count == 1
+    assert vector_store.search.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_list_indexes_reports_every_index(tmp_path):
+    """Test that list_indexes opens each index and reports its chunk count."""
+    from ctxai.vector_store import VectorStore
+
+    indexes_dir = tmp_path / "indexes"
+    for name in ("beta", "alpha"):
+        VectorStore(indexes_dir / name, name)
+
+    with patch("ctxai.commands.server_command.get_indexes_dir", return_value=indexes_dir):
+        server = create_server()
+        result = await server._tool_manager._tools["list_indexes"].fn()
+
+    assert result.index("**alpha**: 0 chunks") < result.index("**beta**: 0 chunks")
+
+
+@pytest.mark.asyncio
+async def test_query_codebase_formats_results(tmp_path, monkeypatch):
+    """Test the markdown returned by query_codebase, including truncation of long chunks."""
+    monkeypatch.delenv("CTXAI_HOME", raising=False)
+    project_path = tmp_path / "project"
+    (project_path / ".ctxai" / "indexes" / "demo").mkdir(parents=True)
+
+    batcher = Mock()
+    batcher.embed = AsyncMock(return_value=[1.0, 0.0])
+    vector_store = Mock()
+    metadata = {
+        "file_path": "/src/app.py",
+        "start_line": "3",
+        "end_line": "9",
+        "chunk_type": "function_definition",
+        "language": "python",
+    }
+    vector_store.search.return_value = [
+        {"id": "a", "content": "def run():\n    pass", "metadata": metadata, "distance": 0.25},
+        {"id": "b", "content": "x" * 600, "metadata": metadata, "distance": 0.5},
+    ]
+
+    with (
+        patch("ctxai.commands.server_command.EmbeddingBatcherPool.get", return_value=batcher),
+        patch("ctxai.commands.server_command.VectorStorePool.get", return_value=vector_store),
+    ):
+        server = create_server(project_path=project_path)
+        text = await server._tool_manager._tools["query_codebase"].fn("demo", "run")
+
+    assert text.startswith('Found 2 result(s) for: "run"\n\n## Result 1 (Similarity: 75.0%)\n\n')
+    assert "**File:** /src/app.py\n**Lines:** 3-9\n**Type:** function_definition (python)\n\n" in text
+    assert "**Code:**\n```python\ndef run():\n    pass\n```\n\n## Result 2" in text
+    assert text.endswith("x" * 500 + "\n... (truncated)\n```\n\n")
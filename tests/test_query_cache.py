@@ -0,0 +1,81 @@
+"""
+Tests for query embedding and result caching.
+"""
+
+import numpy as np
+
+from ctxai.query_cache import QueryCache
+
+
+def test_embeddings_are_cached_per_model_with_lru_eviction():
+    """Test that embeddings are keyed by model and query, evicting the least recently used."""
+    cache = QueryCache(max_embeddings=2)
+    cache.put_embedding("model-a", "first", [1.0])
+    cache.put_embedding("model-a", "second", [2.0])
+    assert cache.get_embedding("model-a", "first") == [1.0]
+    cache.put_embedding("model-a", "third", [3.0])
+
+    assert cache.get_embedding("model-a", "second") is None
+    assert cache.get_embedding("model-a", "first") == [1.0]
+    assert cache.get_embedding("model-b", "first") is None
+
+
+def test_near_duplicate_queries_reuse_results():
+    """Test that a query close enough to a cached one gets its results."""
+    cache = QueryCache(similarity_threshold=0.97)
+    results = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    cache.put_results("index", [1.0, 0.0], n_results=3, results=results)
+
+    assert cache.get_results("index", [1.0, 0.1], n_results=2) == results[:2]
+    assert cache.get_results("index", [0.5, 0.5], n_results=2) is None
+    assert cache.get_results("other-index", [1.0, 0.0], n_results=2) is None
+    # A top-3 answer can't serve a top-5 request when more results may exist
+    assert cache.get_results("index", [1.0, 0.0], n_results=5) is None
+
+
+def test_results_expire_and_can_be_invalidated():
+    """Test that cached results honour the TTL and explicit invalidation."""
+    cache = QueryCache(ttl_seconds=0)
+    cache.put_results("index", [1.0, 0.0], n_results=1, results=[{"id": "a"}])
+    assert cache.get_results("index", [1.0, 0.0], n_results=1) is None
+
+    cache = QueryCache()
+    cache.put_results("index", [1.0, 0.0], n_results=1, results=[{"id": "a"}])
+    cache.invalidate("index")
+    assert cache.get_results("index", [1.0, 0.0], n_results=1) is None
+
+
+def test_result_cache_keeps_newest_entries_per_index():
+    """Test that the per-index result cache evicts its oldest searches."""
+    cache = QueryCache(max_results_per_index=2)
+    for i, vector in enumerate(([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])):
+        cache.put_results("index", vector, n_results=1, results=[{"id": str(i)}])
+
+    assert cache.get_results("index", [1.0, 0.0, 0.0], n_results=1) is None
+    assert cache.get_results("index", [0.0, 0.0, 1.0], n_results=1) == [{"id": "2"}]
+    assert cache.get_results("index", [1.0, 0.0], n_results=1) is None
+
+
+def test_result_cache_writes_into_a_preallocated_ring_buffer():
+    """Test that storing results reuses the index's buffer and wraps around to the oldest slot."""
+    cache = QueryCache(max_results_per_index=2)
+    cache.put_results("index", [1.0, 0.0, 0.0], n_results=1, results=[{"id": "0"}])
+    buffer = cache._results["index"].vectors
+    for i, vector in enumerate(([0.0, 1.0, 0.0], [0.0, 0.0, 1.0], [1.0, 1.0, 0.0]), start=1):
+        cache.put_results("index", vector, n_results=1, results=[{"id": str(i)}])
+
+    assert cache._results["index"].vectors is buffer
+    assert buffer.shape == (2, 3)
+    assert cache.get_results("index", [0.0, 1.0, 0.0], n_results=1) is None
+    assert cache.get_results("index", [0.0, 0.0, 1.0], n_results=1) == [{"id": "2"}]
+    assert cache.get_results("index", [1.0, 1.0, 0.0], n_results=1) == [{"id": "3"}]
+
+
+def test_int8_result_vectors_match_like_float32():
+    """Test that int8-encoded cached query vectors give the same hits and misses."""
+    cache = QueryCache(vector_dtype="int8")
+    cache.put_results("index", [0.3, -1.2, 0.5, 2.0], n_results=1, results=[{"id": "a"}])
+
+    assert cache._results["index"].vectors.dtype == np.int8
+    assert cache.get_results("index", [0.31, -1.2, 0.5, 2.0], n_results=1) == [{"id": "a"}]
+    assert cache.get_results("index", [2.0, 0.5, -1.2, 0.3], n_results=1) is None
@@ -33,6 +33,7 @@ def test_query_command_basic(tmp_path):
         patch("ctxai.commands.query_command.EmbeddingsFactory") as mock_embeddings_factory,
         patch("ctxai.commands.query_command.VectorStore") as mock_vector_store,
         patch("ctxai.commands.query_command.get_indexes_dir") as mock_get_indexes_dir,
+        patch("ctxai.commands.query_command.get_cache_dir", return_value=tmp_path / "cache"),
     ):
         # Setup mocks
         mock_config = Config(embedding=EmbeddingConfig(provider="local"), indexing=IndexConfig())
@@ -71,6 +72,7 @@ def test_query_command_no_results(tmp_path):
         patch("ctxai.commands.query_command.EmbeddingsFactory") as mock_embeddings_factory,
         patch("ctxai.commands.query_command.VectorStore") as mock_vector_store,
         patch("ctxai.commands.query_command.get_indexes_dir") as mock_get_indexes_dir,
+        patch("ctxai.commands.query_command.get_cache_dir", return_value=tmp_path / "cache"),
     ):
         # Setup mocks
         mock_config = Config(embedding=EmbeddingConfig(provider="local"), indexing=IndexConfig())
@@ -104,6 +106,7 @@ def test_query_command_index_not_found(tmp_path):
         patch("ctxai.commands.query_command.ConfigManager") as mock_config_manager,
         patch("ctxai.commands.query_command.EmbeddingsFactory") as mock_embeddings_factory,
         patch("ctxai.commands.query_command.get_indexes_dir") as mock_get_indexes_dir,
+        patch("ctxai.commands.query_command.get_cache_dir", return_value=tmp_path / "cache"),
     ):
         # Setup mocks
         mock_config = Config(embedding=EmbeddingConfig(provider="local"), indexing=IndexConfig())
@@ -147,6 +150,7 @@ def test_query_command_no_content(tmp_path):
         patch("ctxai.commands.query_command.EmbeddingsFactory") as mock_embeddings_factory,
         patch("ctxai.commands.query_command.VectorStore") as mock_vector_store,
         patch("ctxai.commands.query_command.get_indexes_dir") as mock_get_indexes_dir,
+        patch("ctxai.commands.query_command.get_cache_dir", return_value=tmp_path / "cache"),
     ):
         # Setup mocks
         mock_config = Config(embedding=EmbeddingConfig(provider="local"), indexing=IndexConfig())
@@ -176,3 +180,30 @@ def test_query_command_no_content(tmp_path):
         # Verify embedding was generated and search was performed
         mock_embeddings.generate_embedding.assert_called_once()
         mock_store.search.assert_called_once()
+
+
+def test_query_command_reuses_cached_query_embedding(tmp_path):
+    """Test that repeating a query is served from the persistent embedding cache."""
+    with (
+        patch("ctxai.commands.query_command.ConfigManager") as mock_config_manager,
+        patch("ctxai.commands.query_command.EmbeddingsFactory") as mock_embeddings_factory,
+        patch("ctxai.commands.query_command.VectorStore") as mock_vector_store,
+        patch("ctxai.commands.query_command.get_indexes_dir", return_value=tmp_path / "indexes"),
+        patch("ctxai.commands.query_command.get_cache_dir", return_value=tmp_path / "cache"),
+        patch("ctxai.commands.query_command.request_embeddings", return_value=None),
+    ):
+        mock_config = Config(embedding=EmbeddingConfig(provider="local"), indexing=IndexConfig())
+        mock_config_manager.return_value.load.return_value = mock_config
+
+        mock_embeddings = MagicMock()
+        mock_embeddings.generate_embedding.return_value = [0.5] * 8
+        mock_embeddings_factory.create.return_value = mock_embeddings
+        mock_vector_store.return_value.search.return_value = []
+        (tmp_path / "indexes" / "test-index").mkdir(parents=True)
+
+        query_codebase(index_name="test-index", query="test query")
+        query_codebase(index_name="test-index", query="test query")
+
+        mock_embeddings.generate_embedding.assert_called_once_with("test query")
+        second_embedding = mock_vector_store.return_value.search.call_args.kwargs["query_embedding"]
+        assert second_embedding == [0.5] * 8
@@ -1,11 +1,17 @@
+import pytest
 from fastapi.testclient import TestClient
 
 from ctxai.server import app
 
-client = TestClient(app)
 
+@pytest.fixture(scope="module")
+def client():
+    # Run the app lifespan once and reuse the transport for every test in this module
+    with TestClient(app) as test_client:
+        yield test_client
 
-def test_read_root():
+
+def test_read_root(client):
     response = client.get("/")
     assert response.status_code == 200
     assert response.json() == {"server": "OK"}
@@ -0,0 +1,97 @@
+"""
+Tests for the shared iteration and batching helpers.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ctxai.utils import batched, budget_batches, length_sorted_batches, prefetch, submit_ahead
+
+
+def test_prefetch_produces_ahead_in_a_background_thread():
+    """Test that prefetch keeps order, runs the producer in another thread, and buffers ahead."""
+    produced = []
+
+    def numbers():
+        for i in range(10):
+            produced.append((i, threading.current_thread()))
+            yield i
+
+    stream = prefetch(numbers(), max_items=3)
+    assert next(stream) == 0
+    # The producer fills the buffer while the consumer holds the first item
+    for _ in range(100):
+        if len(produced) >= 4:
+            break
+        time.sleep(0.01)
+    assert len(produced) >= 4
+    assert all(thread is not threading.current_thread() for _, thread in produced)
+    assert list(batched(stream, 4)) == [[1, 2, 3, 4], [5, 6, 7, 8], [9]]
+
+
+def test_prefetch_reraises_errors_and_stops_when_closed():
+    """Test that producer errors reach the consumer and closing the stream stops the producer."""
+
+    def failing():
+        yield 1
+        raise RuntimeError("boom")
+
+    stream = prefetch(failing(), max_items=2)
+    assert next(stream) == 1
+    with pytest.raises(RuntimeError, match="boom"):
+        next(stream)
+
+    closed = threading.Event()
+
+    def endless():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    stream = prefetch(endless(), max_items=2)
+    assert next(stream) == 0
+    stream.close()
+    assert closed.is_set()
+
+
+def test_length_sorted_batches_group_similar_lengths_within_a_window():
+    """Test that batches are sorted by length per window and keep every item."""
+    texts = ["a" * n for n in (9, 1, 8, 2, 7, 3, 6, 4, 5)]
+
+    batches = list(length_sorted_batches(texts, 2, key=len, window_batches=2))
+
+    assert [[len(t) for t in batch] for batch in batches] == [[1, 2], [8, 9], [3, 4], [6, 7], [5]]
+    assert sorted(t for batch in batches for t in batch) == sorted(texts)
+
+
+def test_budget_batches_cap_items_and_total_length():
+    """Test that batches close at the item limit or the length budget, and oversized items stand alone."""
+    lengths = [3, 3, 3, 3, 3, 9, 12, 1]
+
+    batches = list(budget_batches(lengths, 3, max_weight=10, weight=lambda n: n))
+
+    assert batches == [[3, 3, 3], [3, 3], [9], [12], [1]]
+
+
+def test_submit_ahead_keeps_order_and_bounds_work_in_flight():
+    """Test that results come back in input order with at most max_pending calls submitted ahead."""
+    taken = []
+
+    def items():
+        for i in range(6):
+            taken.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        stream = submit_ahead(executor, lambda i: i * i, items(), max_pending=3)
+        item, future = next(stream)
+        assert (item, future.result()) == (0, 0)
+        assert taken == [0, 1, 2, 3]
+        assert [future.result() for _, future in stream] == [1, 4, 9, 16, 25]
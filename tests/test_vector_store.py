@@ -0,0 +1,315 @@
+"""
+Tests for the vector store.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ctxai.chunking import CodeChunk
+from ctxai.config import IndexConfig
+from ctxai.vector_store import VectorStore, VectorStorePool
+
+
+def _make_chunk(name: str, start_line: int = 1, language: str = "python") -> CodeChunk:
+    return CodeChunk(
+        content=f"def {name}():\n    pass",
+        file_path=Path(f"/project/{name}.py"),
+        start_line=start_line,
+        end_line=start_line + 1,
+        chunk_type="function_definition",
+        language=language,
+        metadata={"name": name},
+    )
+
+
+def test_collection_uses_cosine_hnsw(tmp_path):
+    """Test that collections are created with cosine HNSW settings from config."""
+    index_config = IndexConfig(hnsw_m=8, hnsw_ef_construction=64, hnsw_ef_search=32)
+    vector_store = VectorStore(tmp_path / "store", "test-index", index_config=index_config)
+
+    metadata = vector_store.collection.metadata
+    assert metadata["hnsw:space"] == "cosine"
+    assert metadata["hnsw:M"] == 8
+    assert metadata["hnsw:construction_ef"] == 64
+
+
+def test_search_returns_nearest_chunk(tmp_path):
+    """Test adding chunks and searching by embedding."""
+    vector_store = VectorStore(tmp_path / "store", "test-index")
+
+    chunks = [_make_chunk("alpha"), _make_chunk("beta"), _make_chunk("gamma")]
+    embeddings = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+    vector_store.add_chunks(chunks, embeddings)
+
+    results = vector_store.search([0.0, 0.9, 0.1], n_results=1)
+
+    assert len(results) == 1
+    assert results[0]["metadata"]["meta_name"] == "beta"
+    assert results[0]["distance"] < 0.1
+
+
+def test_search_filter_is_applied_before_top_k(tmp_path):
+    """Test that metadata filters restrict candidates rather than trimming results."""
+    vector_store = VectorStore(tmp_path / "store", "test-index")
+
+    chunks = [_make_chunk("alpha"), _make_chunk("beta", language="javascript")]
+    embeddings = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+    vector_store.add_chunks(chunks, embeddings)
+
+    results = vector_store.search(
+        [1.0, 0.0, 0.0],
+        n_results=1,
+        filter_dict=VectorStore.build_filter(language="javascript"),
+    )
+
+    assert [r["metadata"]["meta_name"] for r in results] == ["beta"]
+
+
+def test_add_chunks_across_calls_keeps_ids_unique(tmp_path):
+    """Test that streaming chunks over several add_chunks calls doesn't overwrite earlier ones."""
+    vector_store = VectorStore(tmp_path / "store", "test-index")
+
+    vector_store.add_chunks([_make_chunk("alpha")], [[1.0, 0.0, 0.0]], start_index=0)
+    # Indexing hands over float32 matrices
+    vector_store.add_chunks([_make_chunk("alpha")], np.array([[0.0, 1.0, 0.0]], dtype=np.float32), start_index=1)
+
+    assert vector_store.collection.count() == 2
+
+
+def test_exact_search_matches_hnsw_search(tmp_path):
+    """Test that the brute-force scan ranks results like the HNSW index."""
+    vector_store = VectorStore(tmp_path / "store", "test-index")
+
+    chunks = [_make_chunk(name) for name in ("alpha", "beta", "gamma", "delta")]
+    embeddings = [[1.0, 0.0, 0.0], [0.7, 0.7, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 2.0]]
+    vector_store.add_chunks(chunks, embeddings)
+
+    query = [0.9, 0.4, 0.0]
+    exact = vector_store.exact_search(query, n_results=3)
+    approximate = vector_store.search(query, n_results=3)
+
+    assert [r["id"] for r in exact] == [r["id"] for r in approximate]
+    assert exact[0]["distance"] == pytest.approx(approximate[0]["distance"], abs=1e-5)
+
+
+def test_exact_search_matrix_is_memory_mapped_and_refreshed(tmp_path):
+    """Test that exact search reuses an on-disk matrix and rebuilds it after adds."""
+    vector_store = VectorStore(tmp_path / "store", "test-index")
+    vector_store.add_chunks([_make_chunk("alpha")], [[1.0, 0.0, 0.0]])
+    vector_store.exact_search([1.0, 0.0, 0.0], n_results=1)
+
+    matrix, _, ids = vector_store._load_matrix()
+    assert isinstance(matrix, np.memmap)
+    assert len(ids) == 1
+
+    vector_store.add_chunks([_make_chunk("beta")], [[0.0, 1.0, 0.0]], start_index=1)
+    results = vector_store.exact_search([0.0, 1.0, 0.0], n_results=1, filter_dict={"meta_name": "beta"})
+
+    assert [r["metadata"]["meta_name"] for r in results] == ["beta"]
+
+
+def test_matrix_is_rebuilt_when_its_rows_do_not_match_the_ids(tmp_path):
+    """Test that a matrix left by another writer with a different row count is not paired with the IDs."""
+    vector_store = VectorStore(tmp_path / "store", "test-index")
+    vector_store.add_chunks([_make_chunk("alpha"), _make_chunk("beta")], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    matrix, _, _ = vector_store._load_matrix()
+    matrix_path = vector_store._matrix_paths()[0]
+    np.save(matrix_path, np.asarray(matrix[:1]))
+
+    rebuilt, _, ids = vector_store._load_matrix()
+
+    assert rebuilt.shape[0] == len(ids) == 2
+
+
+def test_matrix_rebuild_replaces_files_and_keeps_old_maps_readable(tmp_path):
+    """Test that rebuilding writes through temporary files, leaving earlier memory maps intact."""
+    vector_store = VectorStore(tmp_path / "store", "test-index")
+    vector_store.add_chunks([_make_chunk("alpha")], [[1.0, 0.0, 0.0]])
+    old_matrix, _, _ = vector_store._load_matrix()
+
+    vector_store.add_chunks([_make_chunk("beta")], [[0.0, 1.0, 0.0]], start_index=1)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        loads = list(executor.map(lambda _: vector_store._load_matrix(), range(8)))
+
+    assert np.allclose(old_matrix, [[1.0, 0.0, 0.0]])
+    assert all(matrix.shape[0] == len(ids) == 2 for matrix, _, ids in loads)
+    assert not list((tmp_path / "store").glob("*.tmp"))
+
+
+def test_build_filter():
+    """Test metadata filter construction."""
+    assert VectorStore.build_filter() is None
+    assert VectorStore.build_filter(language="python") == {"language": "python"}
+    assert VectorStore.build_filter(language="python", chunk_type="class_definition") == {
+        "$and": [{"language": "python"}, {"chunk_type": "class_definition"}]
+    }
+
+
+def test_ivfpq_search_finds_nearest_chunk(tmp_path, monkeypatch):
+    """Test that the IVF-PQ backend returns the same nearest chunk as an exact scan."""
+    pytest.importorskip("faiss")
+    from ctxai import vector_store as vector_store_module
+
+    monkeypatch.setattr(vector_store_module, "MIN_IVFPQ_VECTORS", 500)
+    vector_store = VectorStore(tmp_path / "store", "test-index", index_config=IndexConfig(index_type="ivfpq"))
+
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(1000, 32)).astype(np.float32)
+    chunks = [_make_chunk(f"fn_{i}", start_line=i) for i in range(len(embeddings))]
+    vector_store.add_chunks(chunks, embeddings.tolist(), batch_size=500)
+
+    query = (embeddings[123] + rng.normal(scale=0.05, size=32)).tolist()
+    results = vector_store.search(query, n_results=3)
+    exact = vector_store.exact_search(query, n_results=3)
+
+    assert results[0]["metadata"]["meta_name"] == "fn_123"
+    assert results[0]["id"] == exact[0]["id"]
+    assert results[0]["distance"] == pytest.approx(exact[0]["distance"], abs=1e-5)
+    assert (tmp_path / "store" / "ivfpq.index").exists()
+
+    # Adding chunks invalidates the trained index
+    vector_store.add_chunks([_make_chunk("extra")], [embeddings[0].tolist()], start_index=len(chunks))
+    assert not (tmp_path / "store" / "ivfpq.index").exists()
+
+
+def test_hnswpq_search_finds_nearest_chunk(tmp_path, monkeypatch):
+    """Test that the HNSW-PQ backend returns the same nearest chunk as an exact scan."""
+    pytest.importorskip("faiss")
+    from ctxai import vector_store as vector_store_module
+
+    monkeypatch.setattr(vector_store_module, "MIN_IVFPQ_VECTORS", 500)
+    vector_store = VectorStore(tmp_path / "store", "test-index", index_config=IndexConfig(index_type="hnsw_pq"))
+
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(1000, 32)).astype(np.float32)
+    chunks = [_make_chunk(f"fn_{i}", start_line=i) for i in range(len(embeddings))]
+    vector_store.add_chunks(chunks, embeddings, batch_size=500)
+
+    query = (embeddings[456] + rng.normal(scale=0.05, size=32)).tolist()
+    results = vector_store.search(query, n_results=3)
+    exact = vector_store.exact_search(query, n_results=3)
+
+    assert [result["id"] for result in results] == [result["id"] for result in exact]
+    assert results[0]["distance"] == pytest.approx(exact[0]["distance"], abs=1e-5)
+    assert (tmp_path / "store" / "hnswpq.index").exists()
+
+    vector_store.delete_files([str(chunks[0].file_path)])
+    assert not (tmp_path / "store" / "hnswpq.index").exists()
+
+
+def test_float16_matrix_ranks_like_float32(tmp_path, monkeypatch):
+    """Test that a float16 embedding matrix is scored in blocks with float32 accuracy."""
+    from ctxai import similarity
+
+    monkeypatch.setattr(similarity, "_UPCAST_BLOCK_ROWS", 7)
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(50, 16)).astype(np.float32)
+    query = rng.normal(size=16).astype(np.float32)
+    chunks = [_make_chunk(f"f{i}", start_line=i + 1) for i in range(len(embeddings))]
+
+    full = VectorStore(tmp_path / "full", "full-index")
+    full.add_chunks(chunks, embeddings.tolist())
+    half = VectorStore(tmp_path / "half", "half-index", index_config=IndexConfig(vector_dtype="float16"))
+    half.add_chunks(chunks, embeddings.tolist())
+
+    expected = full.exact_search(query, n_results=5)
+    results = half.exact_search(query, n_results=5)
+
+    assert half._load_matrix()[0].dtype == np.float16
+    assert [r["id"] for r in results] == [r["id"] for r in expected]
+    assert results[0]["distance"] == pytest.approx(expected[0]["distance"], abs=1e-3)
+
+
+def test_int8_matrix_ranks_like_float32(tmp_path):
+    """Test that an int8-quantized embedding matrix keeps exact search rankings, also when filtered."""
+    rng = np.random.default_rng(1)
+    embeddings = rng.normal(size=(40, 32)).astype(np.float32)
+    query = rng.normal(size=32).astype(np.float32)
+    chunks = [_make_chunk(f"f{i}", start_line=i + 1, language="go" if i % 2 else "python") for i in range(40)]
+
+    full = VectorStore(tmp_path / "full", "full-index")
+    full.add_chunks(chunks, embeddings)
+    quantized = VectorStore(tmp_path / "int8", "int8-index", index_config=IndexConfig(vector_dtype="int8"))
+    quantized.add_chunks(chunks, embeddings)
+
+    matrix, scales, _ = quantized._load_matrix()
+    assert matrix.dtype == np.int8
+    assert scales.shape == (40,)
+    for filter_dict in (None, {"language": "go"}):
+        expected = full.exact_search(query, n_results=3, filter_dict=filter_dict)
+        results = quantized.exact_search(query, n_results=3, filter_dict=filter_dict)
+        assert [r["id"] for r in results] == [r["id"] for r in expected]
+        assert results[0]["distance"] == pytest.approx(expected[0]["distance"], abs=1e-2)
+
+
+def test_list_chunks_pages_metadata_with_char_counts(tmp_path):
+    """Test that chunk listings are paged and report sizes, also for indexes without char_count."""
+    vector_store = VectorStore(tmp_path / "store", "test-index")
+    chunks = [_make_chunk(name) for name in ("alpha", "beta", "gamma")]
+    vector_store.add_chunks(chunks, [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+
+    assert vector_store.count() == vector_store.get_stats()["total_chunks"] == 3
+
+    first_page = vector_store.list_chunks(limit=2)
+    second_page = vector_store.list_chunks(limit=2, offset=2)
+    assert len(first_page) == 2
+    assert len(second_page) == 1
+    assert {chunk["id"] for chunk in first_page + second_page} == set(vector_store.collection.get()["ids"])
+
+    # Simulate an index written before char_count was stored (None removes the key)
+    vector_store.collection.update(ids=[second_page[0]["id"]], metadatas=[{"char_count": None}])
+    assert "char_count" not in vector_store.collection.get(ids=[second_page[0]["id"]])["metadatas"][0]
+
+    (listed,) = vector_store.list_chunks(limit=2, offset=2)
+    assert listed["metadata"]["char_count"] == len(chunks[0].content)
+
+
+def test_vector_store_pool_reuses_stores_until_the_index_changes(tmp_path):
+    """Test that the pool returns the open store and reopens it after chunks are added elsewhere."""
+    index_path = tmp_path / "demo"
+    VectorStore(index_path, "demo")
+    pool = VectorStorePool()
+
+    store = pool.get(index_path)
+    assert pool.get(index_path) is store
+    assert pool.get(index_path, IndexConfig(index_type="flat")) is not store
+
+    VectorStore(index_path, "demo").add_chunks([_make_chunk("fn")], [[1.0, 0.0]])
+    reopened = pool.get(index_path)
+    assert reopened.count() == 1
+
+
+def test_line_metadata_is_returned_as_integers(tmp_path):
+    """Test that line numbers are stored as integers and legacy string values are converted on read."""
+    vector_store = VectorStore(tmp_path / "store", "test-index")
+    vector_store.add_chunks([_make_chunk("alpha", start_line=7), _make_chunk("beta")], [[1.0, 0.0], [0.0, 1.0]])
+    assert vector_store.collection.get(include=["metadatas"])["metadatas"][0]["start_line"] == 7
+
+    # Simulate a chunk written when metadata values were all strings
+    (beta_id,) = vector_store.collection.get(where={"meta_name": "beta"})["ids"]
+    vector_store.collection.update(ids=[beta_id], metadatas=[{"start_line": "1", "end_line": "2", "char_count": "19"}])
+
+    for result in vector_store.search([0.0, 1.0], n_results=2) + vector_store.exact_search([0.0, 1.0], n_results=2):
+        metadata = result["metadata"]
+        assert (metadata["start_line"], metadata["end_line"]) in {(7, 8), (1, 2)}
+        assert isinstance(metadata["char_count"], int)
+
+
+def test_clear_recreates_the_collection_with_current_settings(tmp_path):
+    """Test that clearing an index drops its chunks and rebuilds the collection from the current config."""
+    legacy = VectorStore(tmp_path / "store", "test-index")
+    legacy.client.delete_collection("test-index")
+    # A collection created before cosine distance and HNSW parameters were configured
+    legacy.collection = legacy.client.create_collection("test-index")
+    legacy.add_chunks([_make_chunk("alpha")], [[1.0, 0.0]])
+
+    vector_store = VectorStore(tmp_path / "store", "test-index", index_config=IndexConfig(hnsw_m=8))
+    assert vector_store.collection.metadata is None or "hnsw:space" not in vector_store.collection.metadata
+    vector_store.clear()
+
+    assert vector_store.count() == 0
+    assert vector_store.collection.metadata["hnsw:space"] == "cosine"
+    assert vector_store.collection.metadata["hnsw:M"] == 8